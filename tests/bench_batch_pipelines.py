@@ -0,0 +1,84 @@
+import asyncio
+import os
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+
+from dotenv import load_dotenv
+from pydantic import BaseModel
+
+sys.path.append("..")
+
+from tulsa.models import Blog
+from tulsa.pipelines.filter import DescriptionFilter
+
+# The items of a feed response
+BATCH = 50
+BATCHES = 200
+
+
+def make_blogs(batch: int) -> list[BaseModel]:
+    paragraph = "Attackers abused a known flaw in the login form.\n\n\n"
+    return [
+        Blog(
+            url=f"https://example.com/{batch}/{i}",
+            title=f"Post {i}",
+            description=paragraph * 10
+            + f"Continue reading on Example {i}\nThe post Post {i} appeared on Example.",
+            published=datetime.now(),
+        )
+        for i in range(BATCH)
+    ]
+
+
+async def per_item(
+    handle_item: Callable[[BaseModel], Awaitable[BaseModel | None]],
+    items: list[BaseModel],
+):
+    for item in items:
+        _ = await handle_item(item)
+
+
+async def measure(
+    name: str, handle: Callable[[list[BaseModel]], Awaitable[object]]
+) -> list[str]:
+    batches = [make_blogs(i) for i in range(BATCHES)]
+    start = time.perf_counter()
+    for items in batches:
+        _ = await handle(items)
+    elapsed = time.perf_counter() - start
+    print(f"  {name:<12} {BATCH * BATCHES / elapsed:10.0f} items/s")
+    return [item.__getattribute__("description") for items in batches for item in items]
+
+
+async def main():
+    print(f"{BATCHES} responses of {BATCH} items")
+
+    print("DescriptionFilter")
+    pipeline = DescriptionFilter()
+    old = await measure(
+        "handle_item", lambda items: per_item(pipeline.handle_item, items)
+    )
+    new = await measure("handle_items", pipeline.handle_items)
+    # The batch must clean the descriptions the same way
+    assert old == new
+
+    if not os.getenv("MONGODB_URL"):
+        print("Set MONGODB_URL to measure the Mongodb pipeline")
+        return
+
+    from tulsa.pipelines.mongo import Mongodb
+
+    print("Mongodb")
+    pipeline = Mongodb()
+    _ = await measure(
+        "handle_item", lambda items: per_item(pipeline.handle_item, items)
+    )
+    _ = await measure("handle_items", pipeline.handle_items)
+    await pipeline.close()
+
+
+if __name__ == "__main__":
+    _ = load_dotenv()
+    asyncio.run(main())
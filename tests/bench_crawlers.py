@@ -0,0 +1,100 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections.abc import AsyncIterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, override
+
+from pydantic import BaseModel
+
+sys.path.append("..")
+
+# Measure the crawlers, not the cache or the politeness delays
+os.environ["HTTP_CACHE"] = "0"
+os.environ["HOST_REQUESTS_PER_MINUTE"] = "0"
+_ = os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+
+from crawlee.crawlers import HttpCrawlingContext
+
+from tulsa import BaseSpider, HttpSpider, Spider
+from tulsa.pipelines import close_pipelines
+
+REQUESTS = 200
+ITEMS = 200
+
+
+def make_feed() -> bytes:
+    items = "".join(
+        f"<item><title>Post {i}</title><link>https://example.com/{i}</link>"
+        + f"<description>{'&lt;p&gt;text&lt;/p&gt;' * 50}</description></item>"
+        for i in range(ITEMS)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel>{items}</channel></rss>'.encode()
+
+
+FEED = make_feed()
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("Content-Length", str(len(FEED)))
+        self.end_headers()
+        _ = self.wfile.write(FEED)
+
+    @override
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+async def handler(context: HttpCrawlingContext) -> AsyncIterator[BaseModel]:
+    # The feed handlers only read the body, the items aren't measured
+    _ = await context.http_response.read()
+    items: list[BaseModel] = []
+    for item in items:
+        yield item
+
+
+async def measure(name: str, spider: BaseSpider[Any], port: int):
+    urls = [f"http://127.0.0.1:{port}/feed?{i}" for i in range(REQUESTS)]
+    tracemalloc.start()
+    cpu = time.process_time()
+    start = time.perf_counter()
+    _ = await spider.run(urls)
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"  {name:<10} {elapsed:6.2f}s, {cpu / REQUESTS * 1000:6.2f} ms CPU/request, "
+        + f"peak {peak / 1024 / 1024:6.1f} MiB"
+    )
+
+
+async def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FeedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    print(f"{REQUESTS} requests of a {len(FEED) / 1024:.0f} KiB feed")
+
+    await measure(
+        "Spider",
+        Spider(default_request_handler=handler, configure_logging=False),
+        port,
+    )
+    await measure(
+        "HttpSpider",
+        HttpSpider(default_request_handler=handler, configure_logging=False),
+        port,
+    )
+
+    server.shutdown()
+    await close_pipelines()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
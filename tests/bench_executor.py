@@ -0,0 +1,111 @@
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import UTC, datetime, timedelta
+
+sys.path.append("..")
+
+from tulsa.models import Category
+from tulsa.spiders.rss import RssProperties, parse_feed
+
+FEEDS = 32
+ENTRIES = 100
+
+
+def make_feed(index: int) -> bytes:
+    now = datetime.now(UTC)
+    paragraph = "&lt;p&gt;Attackers abused a &lt;b&gt;known flaw&lt;/b&gt;.&lt;/p&gt;"
+    items = "".join(
+        f"""<item>
+            <title>Post {i}</title>
+            <link>https://example{index}.com/{i}</link>
+            <pubDate>{(now - timedelta(minutes=i)).strftime("%a, %d %b %Y %H:%M:%S +0000")}</pubDate>
+            <description>{paragraph * 40}</description>
+        </item>"""
+        for i in range(ENTRIES)
+    )
+    return f"""<?xml version="1.0"?><rss version="2.0"><channel>
+        <title>Feed {index}</title>{items}</channel></rss>""".encode()
+
+
+USER_DATA: RssProperties = {
+    "only_tags": [],
+    "exclude_tags": [],
+    "in_urls": [],
+    "fix_link": [],
+    "category": Category.Generic,
+    "allow_empty": False,
+}
+
+
+async def measure_lag(stop: asyncio.Event) -> float:
+    """
+    The longest time the event loop couldn't run a task, e.g. a network callback.
+    """
+    lag = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lag = max(lag, time.perf_counter() - start - 0.001)
+    return lag
+
+
+async def parse_all(feeds: list[bytes], executor: Executor | None) -> int:
+    loop = asyncio.get_running_loop()
+    if executor is None:
+        items = 0
+        for i, body in enumerate(feeds):
+            items += len(parse_feed(f"https://example{i}.com/feed", body, USER_DATA)[0])
+            # Let the other tasks run between two feeds, like the crawler does
+            await asyncio.sleep(0.001)
+        return items
+
+    results = await asyncio.gather(
+        *[
+            loop.run_in_executor(
+                executor, parse_feed, f"https://example{i}.com/feed", body, USER_DATA
+            )
+            for i, body in enumerate(feeds)
+        ]
+    )
+    return sum(len(blogs) for blogs, _, _ in results)
+
+
+async def run(name: str, feeds: list[bytes], executor: Executor | None):
+    stop = asyncio.Event()
+    lag = asyncio.create_task(measure_lag(stop))
+    start = time.perf_counter()
+    items = await parse_all(feeds, executor)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    print(
+        f"  {name:<12} {items} items in {elapsed:6.2f}s, "
+        + f"{len(feeds) / elapsed:6.1f} feeds/s, max loop lag {await lag * 1000:8.1f} ms"
+    )
+
+
+async def main():
+    feeds = [make_feed(i) for i in range(FEEDS)]
+    print(f"{FEEDS} feeds of {ENTRIES} entries, {os.cpu_count()} CPUs")
+    await run("event loop", feeds, None)
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        with ProcessPoolExecutor(
+            workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            # Start the workers before measuring
+            _ = await asyncio.gather(
+                *[
+                    asyncio.get_running_loop().run_in_executor(executor, time.sleep, 0)
+                    for _ in range(workers)
+                ]
+            )
+            await run(f"{workers} processes", feeds, executor)
+        workers *= 2
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,112 @@
+import random
+import sys
+import time
+from typing import Any, cast
+
+import feedparser
+from bs4 import BeautifulSoup
+
+sys.path.append("..")
+
+from tulsa.helpers import html_to_text
+
+ENTRIES = 500
+ROUNDS = 3
+
+
+def make_entries() -> list[Any]:
+    """
+    Entries of a feed with full content, or of the feeds recorded in `sys.argv[1:]`.
+    """
+    if len(sys.argv) > 1:
+        entries: list[Any] = []
+        for path in sys.argv[1:]:
+            with open(path, "rb") as f:
+                entries += feedparser.parse(f.read()).entries
+        return entries
+    paragraph = (
+        "<p>Attackers abused a <a href='https://example.com'>known flaw</a> in "
+        + "<strong>the product</strong> to gain &amp; keep access.</p>\n\n\n"
+    )
+    items = "".join(
+        f"""<item>
+            <title>Post {i}</title>
+            <link>https://example.com/{i}</link>
+            <description><![CDATA[{paragraph * random.randint(1, 5)}]]></description>
+            <content:encoded><![CDATA[<style>p {{}}</style>{paragraph * random.randint(20, 200)}]]></content:encoded>
+        </item>"""
+        for i in range(ENTRIES)
+    )
+    feed = f"""<?xml version="1.0"?>
+        <rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+        <channel><title>Bench</title>{items}</channel></rss>"""
+    return feedparser.parse(feed).entries
+
+
+def old_summary(entry: Any) -> str | None:
+    # The previous implementation of `rss.__process_entry_summary`
+    summary = entry.get("description") or (
+        entry["content"][0].value if entry.get("content") else None
+    )
+    if not summary:
+        return None
+
+    summary = cast(str, BeautifulSoup(summary, "lxml").text).strip()
+    if entry.get("content"):
+        new_summary = cast(
+            str, BeautifulSoup(entry["content"][0].value, "lxml").text
+        ).strip()
+        if len(summary) < len(new_summary) and len(summary) < 20:
+            summary = new_summary
+
+    summary = summary.strip()
+    for _ in range(10):
+        summary = summary.replace("\r\n", "\n")
+        summary = summary.replace("\n\n\n", "\n\n")
+
+    return summary[:1000]
+
+
+def new_summary(entry: Any) -> str | None:
+    summary = entry.get("description") or (
+        entry["content"][0].value if entry.get("content") else None
+    )
+    if not summary:
+        return None
+
+    summary = html_to_text(summary, 1000)
+    if entry.get("content") and len(summary) < 20:
+        content = html_to_text(entry["content"][0].value, 1000)
+        if len(summary) < len(content):
+            summary = content
+    return summary
+
+
+def main():
+    random.seed(0)
+    entries = make_entries()
+    print(f"{len(entries)} entries")
+    # lxml drops some whitespace-only text between the tags
+    same = sum(
+        " ".join((old_summary(e) or "").split())
+        == " ".join((new_summary(e) or "").split())
+        for e in entries
+    )
+    print(f"  same text, ignoring whitespace, for {same}/{len(entries)} entries")
+    for name, summary in (
+        ("BeautifulSoup", old_summary),
+        ("html_to_text", new_summary),
+    ):
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            for entry in entries:
+                _ = summary(entry)
+        elapsed = (time.perf_counter() - start) / ROUNDS
+        print(
+            f"  {name:<14} {elapsed * 1000:8.2f} ms, "
+            + f"{elapsed / len(entries) * 1e6:8.2f} us/entry"
+        )
+
+
+if __name__ == "__main__":
+    main()
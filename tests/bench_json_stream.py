@@ -0,0 +1,92 @@
+import json
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from typing import Any
+
+sys.path.append("..")
+
+from tulsa.json_stream import JsonStream
+
+CVES = 2000
+
+
+def make_page() -> bytes:
+    """
+    A page of the NVD API with as many CVEs as it allows, or the page recorded in `sys.argv[1]`.
+    """
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "rb") as f:
+            return f.read()
+    # Most of a real page is the CPE configurations
+    cpe = {
+        "vulnerable": True,
+        "criteria": "cpe:2.3:a:vendor:product:1.2.3:*:*:*:*:*:*:*",
+        "matchCriteriaId": "A5D3D6C1-4B3E-4D0E-9B1C-2F5E8B1A7C3D",
+    }
+    vulnerabilities = [
+        {
+            "cve": {
+                "id": f"CVE-2025-{i:05}",
+                "sourceIdentifier": "cve@mitre.org",
+                "published": "2025-01-01T00:00:00.000",
+                "vulnStatus": "Analyzed",
+                "descriptions": [{"lang": "en", "value": "A vulnerability " * 20}],
+                "metrics": {"cvssMetricV31": [{"cvssData": {"baseScore": 7.5}}]},
+                "configurations": [
+                    {"nodes": [{"cpeMatch": [cpe] * random.randint(10, 200)}]}
+                ],
+            }
+        }
+        for i in range(CVES)
+    ]
+    return json.dumps(
+        {
+            "resultsPerPage": CVES,
+            "startIndex": 0,
+            "totalResults": CVES,
+            "vulnerabilities": vulnerabilities,
+        }
+    ).encode()
+
+
+def loads(body: bytes) -> Iterator[Any]:
+    yield from json.loads(body)["vulnerabilities"]
+
+
+def stream(body: bytes) -> Iterator[Any]:
+    yield from JsonStream(body).items("vulnerabilities")
+
+
+def measure(name: str, parse: Callable[[bytes], Iterator[Any]], body: bytes):
+    tracemalloc.start()
+    start = time.perf_counter()
+    first = None
+    count = 0
+    for vuln in parse(body):
+        if first is None:
+            first = time.perf_counter() - start
+        # What the handler keeps
+        _ = vuln["cve"]["id"], vuln["cve"]["descriptions"][0]["value"]
+        count += 1
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"  {name:<10} {count} items, first after {(first or 0) * 1000:8.2f} ms, "
+        + f"total {elapsed * 1000:8.2f} ms, peak {peak / 1024 / 1024:7.1f} MiB"
+    )
+
+
+def main():
+    random.seed(0)
+    body = make_page()
+    print(f"Page of {len(body) / 1024 / 1024:.1f} MiB")
+    measure("json.loads", loads, body)
+    measure("JsonStream", stream, body)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import sys
+import time
+from collections.abc import Callable
+from datetime import datetime
+
+from pydantic import BaseModel
+
+sys.path.append("..")
+
+from tulsa.models import Blog, Category, Cve, HacktivityBounty, Severity
+
+ITEMS = 20_000
+PUBLISHED = datetime(2025, 1, 1)
+
+
+def blog_assign(i: int) -> BaseModel:
+    # Every spider used to create the item and then set its fields one by one
+    item = Blog(url=f"https://example.com/{i}", title="Title")
+    item.author = "Author"
+    item.description = "Description"
+    item.published = PUBLISHED
+    item.thumbnail = f"https://example.com/{i}.png"
+    return item
+
+
+def blog_constructor(i: int) -> BaseModel:
+    return Blog(
+        url=f"https://example.com/{i}",
+        title="Title",
+        author="Author",
+        description="Description",
+        published=PUBLISHED,
+        thumbnail=f"https://example.com/{i}.png",
+    )
+
+
+def cve_assign(i: int) -> BaseModel:
+    item = Cve(id=f"CVE-2025-{i}", url=f"https://example.com/{i}", published=PUBLISHED)
+    item.score = 9.8
+    item.description = "Description"
+    item.cna = "CNA"
+    return item
+
+
+def cve_constructor(i: int) -> BaseModel:
+    return Cve(
+        id=f"CVE-2025-{i}",
+        url=f"https://example.com/{i}",
+        published=PUBLISHED,
+        score=9.8,
+        description="Description",
+        cna="CNA",
+    )
+
+
+def bounty_assign(i: int) -> BaseModel:
+    item = HacktivityBounty(url=f"https://example.com/{i}", title="Title")
+    item.reporter = "Reporter"
+    item.program = "Program"
+    item.awarded = 500.0
+    item.severity = Severity.High
+    item.published = PUBLISHED
+    return item
+
+
+def bounty_constructor(i: int) -> BaseModel:
+    return HacktivityBounty(
+        url=f"https://example.com/{i}",
+        title="Title",
+        category=Category.HacktivityBounty,
+        reporter="Reporter",
+        program="Program",
+        awarded=500.0,
+        severity=Severity.High,
+        published=PUBLISHED,
+    )
+
+
+def measure(build: Callable[[int], BaseModel]) -> tuple[float, BaseModel]:
+    start = time.perf_counter()
+    for i in range(ITEMS):
+        _ = build(i)
+    return ITEMS / (time.perf_counter() - start), build(0)
+
+
+def main():
+    print(f"Items per second, {ITEMS} items")
+    for name, old, new in [
+        ("Blog", blog_assign, blog_constructor),
+        ("Cve", cve_assign, cve_constructor),
+        ("HacktivityBounty", bounty_assign, bounty_constructor),
+    ]:
+        old_rate, old_item = measure(old)
+        new_rate, new_item = measure(new)
+        # The pipelines must see the same items
+        assert old_item == new_item
+        print(
+            f"  {name:<16} assignments: {old_rate:10.0f}/s, "
+            + f"constructor: {new_rate:10.0f}/s ({new_rate / old_rate:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
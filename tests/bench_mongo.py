@@ -0,0 +1,99 @@
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Any, override
+
+from dotenv import load_dotenv
+from pymongo import AsyncMongoClient, monitoring
+
+sys.path.append("..")
+
+from tulsa.models import Blog
+from tulsa.pipelines.mongo import blog_update, merge_blog
+
+ITEMS = 500
+
+
+class CommandCounter(monitoring.CommandListener):
+    commands: int = 0
+
+    @override
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if event.command_name not in ("hello", "isMaster", "endSessions"):
+            self.commands += 1
+
+    @override
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        pass
+
+    @override
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        pass
+
+
+def make_blogs(run: int) -> list[Blog]:
+    # Most items of a run are repeats of the previous run
+    return [
+        Blog(
+            url=f"https://example.com/{i}",
+            title=f"Post {i}",
+            description="x" * (i % 7 + run),
+            published=datetime.now(),
+        )
+        for i in range(ITEMS)
+    ]
+
+
+async def read_modify_write(collection: Any, blogs: list[Blog]):
+    # The previous implementation, without the transaction so it runs on a standalone server
+    for blog in blogs:
+        result = await collection.find_one({"url": blog.url})
+        if not result:
+            _ = await collection.insert_one(blog.model_dump())
+        else:
+            changes = merge_blog(result, blog.model_dump())
+            if changes:
+                _ = await collection.update_one({"url": blog.url}, {"$set": changes})
+
+
+async def atomic_upsert(collection: Any, blogs: list[Blog]):
+    for blog in blogs:
+        _ = await collection.update_one(
+            {"url": blog.url}, blog_update(blog.model_dump()), upsert=True
+        )
+
+
+async def main():
+    url = os.getenv("MONGODB_URL")
+    if not url:
+        raise ValueError("MONGODB_URL environment variable is not set")
+    counter = CommandCounter()
+    client: AsyncMongoClient[Any] = AsyncMongoClient(url, event_listeners=[counter])
+    db = client.get_database("tulsa_bench")
+
+    for name, write in (
+        ("read_modify_write", read_modify_write),
+        ("atomic_upsert", atomic_upsert),
+    ):
+        collection = db[name]
+        _ = await collection.drop()
+        _ = await collection.create_index("url")
+        for run in range(2):
+            counter.commands = 0
+            start = time.perf_counter()
+            await write(collection, make_blogs(run))
+            elapsed = time.perf_counter() - start
+            print(
+                f"{name:<18} run {run}: {counter.commands / ITEMS:.2f} round trips/item, "
+                + f"{ITEMS / elapsed:8.1f} items/s"
+            )
+        _ = await collection.drop()
+
+    await client.close()
+
+
+if __name__ == "__main__":
+    _ = load_dotenv()
+    asyncio.run(main())
@@ -0,0 +1,213 @@
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from typing import Any, cast, final, override
+
+sys.path.append("..")
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# The responses are recorded with
+# `HTTP_ARCHIVE_MODE=record python -m tulsa run <spider|group> --once`
+os.environ["HTTP_ARCHIVE_MODE"] = "replay"
+_ = os.environ.setdefault(
+    "HTTP_ARCHIVE_DIR", os.path.join(ROOT, ".tulsa", "http-archive")
+)
+# The state of the benchmark doesn't touch the state of the crawls
+os.environ["TULSA_DATA_DIR"] = tempfile.mkdtemp(prefix="tulsa-bench-")
+os.environ["CVE_FULL_SYNC"] = "1"
+_ = os.environ.pop("MONGODB_URL", None)
+# The credentials aren't part of the recorded requests, see `tulsa.http.archive`
+for name in (
+    "BLOGSPOT_API_TOKEN",
+    "YOUTUBE_API_TOKEN",
+    "HACKERONE_API_TOKEN",
+    "GITHUB_ADVISORY_API_TOKEN",
+):
+    _ = os.environ.setdefault(name, "token")
+_ = os.environ.setdefault("SPOTIFY_API_TOKEN", "id|secret")
+_ = os.environ.setdefault("BUGCROWD_AUTH", "username|password|JBSWY3DPEHPK3PXP")
+
+from crawlee import service_locator
+from pydantic import BaseModel
+
+from tulsa import BaseSpider, SpiderRouter
+from tulsa.feed_schedule import feed_schedule
+from tulsa.item_queue import ItemQueue
+from tulsa.spiders import SpiderEntry, load_spiders_from_feeds
+from tulsa.spiders.registry import spider_entries
+
+FEEDS = os.path.join(ROOT, "feeds.toml")
+# The timings depend on the machine, the baseline is kept beside the recorded responses
+BASELINE = os.path.join(ROOT, ".tulsa", "bench-parsers.json")
+# A slower p50 or more allocations than the baseline by this ratio is a regression
+TOLERANCE = 0.2
+
+
+@final
+class CountingQueue(ItemQueue):
+    """
+    Count the items, they don't go through the pipelines.
+    """
+
+    def __init__(self) -> None:
+        super().__init__([])
+
+    @override
+    async def put(self, items: list[BaseModel], url: str) -> None:
+        self.batches += 1
+        self.items += len(items)
+
+
+def all_entries() -> list[SpiderEntry]:
+    return (
+        load_spiders_from_feeds(FEEDS)
+        + spider_entries("blog")
+        + spider_entries("bounty_platform")
+        + spider_entries("cve")
+    )
+
+
+async def replay(entry: SpiderEntry, trace: bool) -> tuple[list[float], int, int]:
+    """
+    Replay the recorded responses of the spider through its handlers, one response at a time.
+    Return the latency of every response, the allocated bytes and the items.
+    """
+    spider: BaseSpider[Any] = entry.create()
+    queue = CountingQueue()
+    router = cast(SpiderRouter[Any], spider.router)
+    router.queue = queue
+    spider.item_queue = queue
+    lock = asyncio.Lock()
+    latencies: list[float] = []
+    allocated = 0
+
+    def timed(handler: Callable[[Any], Awaitable[None]]):
+        async def wrapper(context: Any) -> None:
+            nonlocal allocated
+            async with lock:
+                if trace:
+                    tracemalloc.reset_peak()
+                    current = tracemalloc.get_traced_memory()[0]
+                start = time.perf_counter()
+                try:
+                    await handler(context)
+                finally:
+                    latencies.append(time.perf_counter() - start)
+                    if trace:
+                        allocated += tracemalloc.get_traced_memory()[1] - current  # pyright: ignore [reportPossiblyUnboundVariable]
+
+        return wrapper
+
+    if router._default_handler:  # pyright: ignore [reportPrivateUsage]
+        router._default_handler = timed(router._default_handler)  # pyright: ignore [reportPrivateUsage]
+    for label, handler in router._handlers_by_label.items():  # pyright: ignore [reportPrivateUsage]
+        router._handlers_by_label[label] = timed(handler)  # pyright: ignore [reportPrivateUsage]
+
+    _ = await spider.run()
+    return latencies, allocated, queue.items
+
+
+async def measure(entry: SpiderEntry) -> dict[str, float] | None:
+    latencies, _, items = await replay(entry, trace=False)
+    if not latencies:
+        return None
+    tracemalloc.start()
+    try:
+        # The feed spiders share their requests with the entry, they're handled now
+        entry = next(e for e in all_entries() if e.name == entry.name)
+        _, allocated, _ = await replay(entry, trace=True)
+    finally:
+        tracemalloc.stop()
+    latencies.sort()
+    return {
+        "responses": len(latencies),
+        "items": items,
+        "items_per_second": items / sum(latencies),
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+        "kib_per_response": allocated / len(latencies) / 1024,
+    }
+
+
+def regressions(result: dict[str, float], baseline: dict[str, float]) -> list[str]:
+    found: list[str] = []
+    if result["items"] != baseline["items"]:
+        found.append(f"{baseline['items']:.0f} -> {result['items']:.0f} items")
+    for metric in ("p50_ms", "kib_per_response"):
+        if result[metric] > baseline[metric] * (1 + TOLERANCE):
+            found.append(f"{metric} {baseline[metric]:.2f} -> {result[metric]:.2f}")
+    return found
+
+
+async def run(
+    entries: list[SpiderEntry], baseline: dict[str, dict[str, float]]
+) -> tuple[dict[str, dict[str, float]], list[str]]:
+    """
+    Measure every spider of `entries`, return the results and the regressions.
+    """
+    results: dict[str, dict[str, float]] = {}
+    failed: list[str] = []
+    print(
+        f"{'spider':<32} {'responses':>9} {'items':>6} {'items/s':>9} "
+        + f"{'p50 ms':>7} {'p99 ms':>7} {'KiB/resp':>9}"
+    )
+    async with service_locator.get_event_manager():
+        for entry in entries:
+            result = await measure(entry)
+            if result is None:
+                print(f"{entry.name:<32} no recorded responses")
+                continue
+            results[entry.name] = result
+            print(
+                f"{entry.name:<32} {result['responses']:>9.0f} {result['items']:>6.0f} "
+                + f"{result['items_per_second']:>9.0f} {result['p50_ms']:>7.2f} "
+                + f"{result['p99_ms']:>7.2f} {result['kib_per_response']:>9.1f}"
+            )
+            if entry.name in baseline:
+                for regression in regressions(result, baseline[entry.name]):
+                    failed.append(f"{entry.name}: {regression}")
+    return results, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay the recorded responses of the spiders through their handlers."
+    )
+    _ = parser.add_argument("spiders", nargs="*", help="class names, all by default")
+    _ = parser.add_argument("--baseline", default=BASELINE)
+    _ = parser.add_argument(
+        "--save", action="store_true", help="save the results as the baseline"
+    )
+    args = parser.parse_args()
+
+    names = {name.lower() for name in args.spiders}
+    entries = [e for e in all_entries() if not names or e.name.lower() in names]
+    # Every recorded feed is replayed
+    feed_schedule.max_interval = 0
+    try:
+        with open(args.baseline) as f:
+            baseline: dict[str, dict[str, float]] = json.load(f)
+    except FileNotFoundError:
+        baseline = {}
+
+    results, failed = asyncio.run(run(entries, baseline))
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump(baseline | results, f, indent=2, sort_keys=True)
+        print(f"Saved the baseline of {len(results)} spiders to {args.baseline}")
+    if failed:
+        print("Regressions against the baseline:\n  " + "\n  ".join(failed))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
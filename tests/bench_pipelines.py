@@ -0,0 +1,69 @@
+import asyncio
+import os
+import sys
+import time
+
+from dotenv import load_dotenv
+
+sys.path.append("..")
+
+from tulsa.pipelines import (
+    Pipeline,
+    close_pipelines,
+    get_pipelines,
+    load_all_pipelines,
+)
+
+SPIDERS = 50
+
+
+def old_startup() -> list[list[Pipeline]]:
+    # Every spider used to discover and create its own pipelines
+    return [
+        sorted(
+            filter(lambda p: p.enabled, load_all_pipelines()),
+            key=lambda p: p.priority,
+        )
+        for _ in range(SPIDERS)
+    ]
+
+
+def new_startup() -> list[list[Pipeline]]:
+    return [get_pipelines() for _ in range(SPIDERS)]
+
+
+async def main():
+    # The client connects lazily, we don't need a running server to measure the startup
+    _ = os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+
+    # Import the pipeline modules first, so we only compare the setup
+    for pipeline in load_all_pipelines():
+        await pipeline.close()
+
+    start = time.perf_counter()
+    old = old_startup()
+    old_time = time.perf_counter() - start
+    old_instances = len({id(p) for pipelines in old for p in pipelines})
+
+    start = time.perf_counter()
+    new = new_startup()
+    new_time = time.perf_counter() - start
+    new_instances = len({id(p) for pipelines in new for p in pipelines})
+
+    print(f"Pipeline setup for {SPIDERS} spiders")
+    print(
+        f"  per spider: {old_time * 1000:8.2f} ms, {old_instances} pipeline instances"
+    )
+    print(
+        f"  shared:     {new_time * 1000:8.2f} ms, {new_instances} pipeline instances"
+    )
+
+    for pipelines in old:
+        for pipeline in pipelines:
+            await pipeline.close()
+    await close_pipelines()
+
+
+if __name__ == "__main__":
+    _ = load_dotenv()
+    asyncio.run(main())
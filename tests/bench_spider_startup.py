@@ -0,0 +1,105 @@
+import gc
+import importlib
+import inspect
+import os
+import pkgutil
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any
+
+sys.path.append("..")
+
+# Every spider of a blog run can be created
+for name in (
+    "BLOGSPOT_API_TOKEN",
+    "YOUTUBE_API_TOKEN",
+    "HACKERONE_API_TOKEN",
+    "GITHUB_ADVISORY_API_TOKEN",
+):
+    _ = os.environ.setdefault(name, "token")
+_ = os.environ.setdefault("SPOTIFY_API_TOKEN", "id|secret")
+_ = os.environ.setdefault("BUGCROWD_AUTH", "username|password|JBSWY3DPEHPK3PXP")
+_ = os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+
+FEEDS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "feeds.toml")
+
+
+def old_blog_spiders() -> list[Any]:
+    # What `get_spiders(["blog"])` did: import every module and create every spider up front
+    import tulsa.spiders
+    from tulsa import BaseSpider, HttpSpider, Spider
+
+    spiders: list[Any] = [
+        entry.create()
+        for entry in tulsa.spiders.load_spiders_from_feeds(
+            FEEDS, names=("youtube", "spotify")
+        )
+    ]
+    for folder in ("blog", "bounty_platform"):
+        for _, module_name, _ in pkgutil.iter_modules(
+            [os.path.join(tulsa.spiders.__path__[0], folder)],
+            f"tulsa.spiders.{folder}.",
+        ):
+            module = importlib.import_module(module_name)
+            for _, class_obj in inspect.getmembers(module, inspect.isclass):
+                if issubclass(class_obj, BaseSpider) and class_obj not in (
+                    BaseSpider,
+                    Spider,
+                    HttpSpider,
+                ):
+                    spiders.append(class_obj())  # pyright: ignore [reportCallIssue]
+    return spiders
+
+
+def measure(mode: str):
+    start = time.perf_counter()
+    if mode == "old":
+        spiders = old_blog_spiders()
+        startup = time.perf_counter() - start
+        # Every spider is kept until the end of the run
+        count = len(spiders)
+    else:
+        from tulsa.spiders import load_spiders_from_feeds
+        from tulsa.spiders.registry import spider_entries
+
+        entries = (
+            load_spiders_from_feeds(FEEDS, names=("youtube", "spotify"))
+            + spider_entries("blog")
+            + spider_entries("bounty_platform")
+        )
+        startup = time.perf_counter() - start
+        count = len(entries)
+        for entry in entries:
+            spider = entry.create()
+            # The spider would run here, and it's released afterwards
+            del spider
+            _ = gc.collect()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        f"  {mode:<5} {count} spiders, startup {startup * 1000:7.1f} ms, "
+        + f"peak RSS {peak:6.1f} MiB"
+    )
+
+
+def main():
+    if len(sys.argv) > 1:
+        measure(sys.argv[1])
+        return
+    print("Spiders of a blog run, in a new process each")
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = os.environ | {"TULSA_DATA_DIR": data_dir}
+        for mode in ("old", "lazy", "lazy"):
+            # The second lazy run reads the manifest
+            _ = subprocess.run(
+                [sys.executable, __file__, mode],
+                env=env,
+                check=True,
+                stderr=subprocess.DEVNULL,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+import argparse
+import asyncio
+import functools
+import json
+import os
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, override
+
+from dotenv import load_dotenv
+
+sys.path.append("..")
+
+# The feeds are on their own hosts, `*.localhost` resolves to the loopback address
+HOST = "feed{}.localhost"
+DATABASE = "tulsa_load_test"
+WORDS = (
+    "attackers abused a known flaw in the login form of the appliance to run code "
+    + "the patch fixes the heap overflow researchers found in the parser of the firmware"
+).split()
+
+
+@functools.lru_cache(maxsize=4096)
+def make_feed(index: int, error_rate: float) -> tuple[int, bytes]:
+    """
+    The status and the body of the feed `index`, the same for every request.
+
+    Most feeds have 10 to 20 entries with a short summary, some have 50 entries
+    or their whole articles. A few feeds are broken: a server error, a missing page
+    or XML which doesn't parse.
+    """
+    rng = random.Random(index)
+    if rng.random() < error_rate:
+        return rng.choice(
+            (
+                (500, b"Internal Server Error"),
+                (404, b"Not Found"),
+                (200, b"<rss><channel><item><title>"),
+            )
+        )
+    entries = rng.choice((10, 10, 15, 20, 20, 25, 50))
+    full_content = rng.random() < 0.2
+    atom = rng.random() < 0.3
+    now = datetime.now(UTC)
+    parts: list[str] = []
+    for i in range(entries):
+        # Newest first, the oldest entries of the long feeds are out of date
+        published = now - timedelta(hours=i * rng.uniform(2, 24))
+        words = int(rng.lognormvariate(4.5, 0.6)) * (20 if full_content else 1)
+        text = " ".join(rng.choice(WORDS) for _ in range(words))
+        link = f"https://blog{index}.example.com/{published:%Y/%m}/post-{i}"
+        if atom:
+            parts.append(
+                f"<entry><title>Post {i} of feed {index}</title><link href='{link}'/>"
+                + f"<id>{link}</id><updated>{published.isoformat()}</updated>"
+                + f"<summary>&lt;p&gt;{text}&lt;/p&gt;</summary></entry>"
+            )
+        else:
+            parts.append(
+                f"<item><title>Post {i} of feed {index}</title><link>{link}</link>"
+                + f"<pubDate>{published:%a, %d %b %Y %H:%M:%S +0000}</pubDate>"
+                + f"<description>&lt;p&gt;{text}&lt;/p&gt;</description></item>"
+            )
+    if atom:
+        body = (
+            '<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom">'
+            + f"<title>Feed {index}</title>{''.join(parts)}</feed>"
+        )
+    else:
+        body = (
+            '<?xml version="1.0"?><rss version="2.0"><channel>'
+            + f"<title>Feed {index}</title><link>https://blog{index}.example.com</link>"
+            + f"{''.join(parts)}</channel></rss>"
+        )
+    return 200, body.encode()
+
+
+def serve(latency: float, error_rate: float):
+    """
+    Serve the feeds with a log-normal latency around `latency` seconds, print the port.
+    """
+
+    class FeedHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(min(random.lognormvariate(0, 0.8) * latency, 5))
+            host = self.headers.get("Host", "")
+            index = int(host.removeprefix("feed").partition(".")[0] or 0)
+            status, body = make_feed(index, error_rate)
+            self.send_response(status)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            _ = self.wfile.write(body)
+
+        @override
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FeedHandler)
+    server.daemon_threads = True
+    server.request_queue_size = 1024
+    print(server.server_address[1], flush=True)
+    server.serve_forever()
+
+
+def rss_mib() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        # The peak is the best we have without /proc
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def measure(config: str) -> dict[str, Any]:
+    """
+    Run the `RssSpider` of `config` with the pipelines, in a new process.
+    """
+    from crawlee import service_locator
+    from pymongo import AsyncMongoClient
+
+    from tulsa.pipelines import close_pipelines, flush_pipelines
+    from tulsa.spiders import load_spiders_from_feeds
+
+    client: AsyncMongoClient[Any] | None = None
+    if os.getenv("MONGODB_URL"):
+        client = AsyncMongoClient(os.getenv("MONGODB_URL"))
+        await client.drop_database(DATABASE)
+
+    loop = asyncio.get_running_loop()
+    lags: list[float] = []
+
+    async def monitor_lag():
+        while True:
+            start = loop.time()
+            await asyncio.sleep(0.05)
+            lags.append(loop.time() - start - 0.05)
+
+    memory_before = rss_mib()
+    spider = load_spiders_from_feeds(config, names=("rss",))[0].create()
+    monitor = asyncio.create_task(monitor_lag())
+    start = time.perf_counter()
+    async with service_locator.get_event_manager():
+        result = await spider.run()
+    await flush_pipelines()
+    elapsed = time.perf_counter() - start
+    _ = monitor.cancel()
+    memory_after = rss_mib()
+    await close_pipelines()
+
+    stored = None
+    if client:
+        stored = await client.get_database(DATABASE)["blog"].count_documents({})
+        await client.drop_database(DATABASE)
+        await client.close()
+
+    lags.sort()
+    queue = spider.item_queue
+    return {
+        "feeds": result.requests_total,
+        "failed": result.requests_failed,
+        "seconds": elapsed,
+        "items": queue.items,
+        "stored": stored,
+        "memory_before": memory_before,
+        "memory_after": memory_after,
+        "memory_peak": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "lag_p50": statistics.median(lags) * 1000 if lags else 0.0,
+        "lag_p99": lags[int(len(lags) * 0.99)] * 1000 if lags else 0.0,
+        "lag_max": lags[-1] * 1000 if lags else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Crawl N synthetic feeds from a local server with the RssSpider and the pipelines."
+    )
+    _ = parser.add_argument("feeds", nargs="*", type=int, default=[100, 1000, 5000])
+    _ = parser.add_argument("--latency", type=float, default=80, help="median, in ms")
+    _ = parser.add_argument("--error-rate", type=float, default=0.03)
+    _ = parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    _ = parser.add_argument("--measure", metavar="CONFIG", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.latency / 1000, args.error_rate)
+        return
+    if args.measure:
+        print(json.dumps(asyncio.run(measure(args.measure))))
+        return
+
+    # The server runs in its own process, it doesn't take the CPU of the crawler
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            __file__,
+            "--serve",
+            f"--latency={args.latency}",
+            f"--error-rate={args.error_rate}",
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    assert server.stdout
+    port = int(server.stdout.readline())
+    print(
+        f"Feeds with a {args.latency:.0f} ms median latency and {args.error_rate:.0%} errors"
+        + (
+            f", the items are stored in the {DATABASE} database"
+            if os.getenv("MONGODB_URL")
+            else ", MONGODB_URL isn't set so nothing is stored"
+        )
+    )
+    print(
+        f"{'feeds':>6} {'failed':>6} {'seconds':>8} {'feeds/s':>8} {'items':>7} "
+        + f"{'items/s':>8} {'stored/s':>8} {'MiB':>6} {'+MiB':>6} {'peak':>6} "
+        + f"{'lag p50':>8} {'p99':>6} {'max':>6}"
+    )
+    try:
+        for count in args.feeds:
+            with tempfile.TemporaryDirectory() as directory:
+                config = os.path.join(directory, "feeds.toml")
+                with open(config, "w") as f:
+                    for index in range(count):
+                        _ = f.write(
+                            f'[[rss]]\nurl = "http://{HOST.format(index)}:{port}/feed.xml"\n\n'
+                        )
+                env = os.environ | {
+                    "TULSA_DATA_DIR": directory,
+                    "MONGODB_DATABASE": DATABASE,
+                    # Measure the spider and the pipelines, not the cache or the politeness delays
+                    "HTTP_CACHE": "0",
+                    "HOST_REQUESTS_PER_MINUTE": "0",
+                }
+                output = subprocess.run(
+                    [sys.executable, __file__, "--measure", config],
+                    env=env,
+                    check=True,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                ).stdout
+            r = json.loads(output.splitlines()[-1])
+            stored = (
+                f"{r['stored'] / r['seconds']:>8.0f}"
+                if r["stored"] is not None
+                else f"{'-':>8}"
+            )
+            print(
+                f"{r['feeds']:>6} {r['failed']:>6} {r['seconds']:>8.2f} "
+                + f"{r['feeds'] / r['seconds']:>8.1f} {r['items']:>7} "
+                + f"{r['items'] / r['seconds']:>8.0f} {stored} "
+                + f"{r['memory_before']:>6.0f} {r['memory_after'] - r['memory_before']:>6.0f} "
+                + f"{r['memory_peak']:>6.0f} {r['lag_p50']:>8.1f} {r['lag_p99']:>6.1f} "
+                + f"{r['lag_max']:>6.1f}"
+            )
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    _ = load_dotenv()
+    main()
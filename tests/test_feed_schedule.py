@@ -0,0 +1,73 @@
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime
+from unittest import mock
+
+# The state of the tests doesn't touch the state of the crawls
+os.environ["TULSA_DATA_DIR"] = tempfile.mkdtemp(prefix="tulsa-test-state-")
+
+from tulsa.feed_schedule import (
+    DEFAULT_INTERVAL,
+    JOB_PERIOD,
+    MAX_INTERVAL,
+    FeedSchedule,
+)
+from tulsa.pipelines.filter import MAX_AGE
+
+FEED = "https://example.com/feed"
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+def make_schedule(gaps: list[float]) -> FeedSchedule:
+    """
+    A schedule of a feed which published its entries `gaps` seconds apart, the last one now.
+    """
+    schedule = FeedSchedule()
+    published = time.time()
+    for gap in [0.0, *gaps]:
+        published -= gap
+        schedule.published(FEED, datetime.fromtimestamp(published))
+    return schedule
+
+
+class FeedScheduleTest(unittest.TestCase):
+    def test_new_feed(self):
+        schedule = FeedSchedule()
+        self.assertEqual(schedule.interval(FEED), DEFAULT_INTERVAL)
+        self.assertTrue(schedule.is_due(FEED))
+
+    def test_interval_is_half_the_gaps(self):
+        schedule = make_schedule([4 * HOUR] * 5)
+        self.assertAlmostEqual(schedule.interval(FEED), 2 * HOUR, delta=1)
+
+    def test_interval_is_clamped(self):
+        self.assertEqual(
+            make_schedule([60] * 5).interval(FEED), make_schedule([]).min_interval
+        )
+        schedule = make_schedule([60 * DAY] * 5)
+        self.assertEqual(schedule.interval(FEED), schedule.max_interval)
+
+    def test_max_interval_keeps_the_entries_fresh(self):
+        with mock.patch.dict(os.environ, {"FEED_MAX_INTERVAL": str(30 * DAY)}):
+            schedule = make_schedule([60 * DAY] * 5)
+        self.assertEqual(schedule.max_interval, MAX_INTERVAL)
+        # The next fetch is at most a job period after the feed is due
+        self.assertLess(schedule.interval(FEED) + JOB_PERIOD, MAX_AGE)
+
+    def test_is_due(self):
+        schedule = make_schedule([4 * HOUR] * 5)
+        schedule.fetched(FEED)
+        self.assertFalse(schedule.is_due(FEED))
+        fetched = time.time()
+        # The hourly job doesn't wait one more hour for a few seconds
+        with mock.patch("time.time", return_value=fetched + 2 * HOUR - 60):
+            self.assertTrue(schedule.is_due(FEED))
+        with mock.patch("time.time", return_value=fetched + HOUR):
+            self.assertFalse(schedule.is_due(FEED))
+
+
+if __name__ == "__main__":
+    _ = unittest.main()
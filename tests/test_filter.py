@@ -0,0 +1,80 @@
+import asyncio
+import re
+import unittest
+
+from tulsa.models import Blog
+from tulsa.pipelines.filter import DescriptionFilter, load_description_rules
+
+# The patterns of DescriptionFilter before its rules moved to `filters.toml`
+OLD_PATTERNS = [
+    (r"^The post .+ (first|appeared) on .+$", ""),
+    (r"… .+Read More »$", "… "),
+    (r"^Read More ».+", ""),
+    (r"Continue reading on .+$", ""),
+]
+DESCRIPTIONS = [
+    "Attackers abused a flaw in the login form.",
+    "A flaw in the parser.\n\nThe post Patch now appeared first on Example Security Blog.",
+    "A flaw in the parser.\n\nthe POST Patch now first appeared on Example.",
+    "The post office was hit.\nThe post Patch now appeared first on Example.\nMore text",
+    "Our researchers found more … Read the rest Read More »",
+    "Our researchers found more … read more »",
+    "Intro\n\nRead More » Post 1",
+    "Intro\n\nREAD MORE » Post 1\n\n\n\nOutro",
+    "Medium post\n\nContinue reading on Example Publication »",
+    "Medium post\n\ncontinue Reading On Example »\nThe post X appeared first on Y.",
+    "Keep reading on the blog, read more later, the post is long.",
+    "\n\n\nA description\n\n\n\n\nwith blank lines\n\n\n",
+    "",
+]
+
+
+def old_clean(description: str) -> str:
+    for pattern, replace in OLD_PATTERNS:
+        description = re.sub(
+            pattern, replace, description, flags=re.MULTILINE | re.IGNORECASE
+        )
+    for _ in range(5):
+        description = description.replace("\n\n\n", "\n\n")
+    return description.strip()
+
+
+class DescriptionFilterTest(unittest.TestCase):
+    def test_load_description_rules(self):
+        rules = load_description_rules()
+        self.assertEqual(
+            [(rule.pattern.pattern, rule.replace) for rule in rules], OLD_PATTERNS
+        )
+        for rule in rules:
+            self.assertEqual(rule.contains, rule.contains.lower())
+            self.assertTrue(rule.pattern.flags & re.MULTILINE)
+            self.assertTrue(rule.pattern.flags & re.IGNORECASE)
+
+    def test_matches_have_the_contains_text(self):
+        for rule in load_description_rules():
+            for description in DESCRIPTIONS:
+                for match in rule.pattern.finditer(description):
+                    with self.subTest(pattern=rule.pattern.pattern, match=match):
+                        self.assertIn(rule.contains, match.group().lower())
+
+    def test_clean_like_the_old_patterns(self):
+        clean = DescriptionFilter().clean
+        for description in DESCRIPTIONS:
+            with self.subTest(description=description):
+                self.assertEqual(clean(description), old_clean(description))
+
+    def test_batch_like_one_by_one(self):
+        pipeline = DescriptionFilter()
+        blogs = [
+            Blog(url=f"https://example.com/{i}", title="Post", description=description)
+            for i, description in enumerate(DESCRIPTIONS)
+        ]
+        _ = asyncio.run(pipeline.handle_items(list(blogs)))
+        self.assertEqual(
+            [blog.description for blog in blogs],
+            [pipeline.clean(description) for description in DESCRIPTIONS],
+        )
+
+
+if __name__ == "__main__":
+    _ = unittest.main()
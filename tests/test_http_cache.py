@@ -0,0 +1,160 @@
+import os
+import tempfile
+import threading
+import unittest
+from collections.abc import AsyncIterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, ClassVar, override
+
+# The cache of the tests doesn't touch the cache of the crawls
+os.environ["HTTP_CACHE"] = "1"
+os.environ["HTTP_CACHE_DIR"] = tempfile.mkdtemp(prefix="tulsa-test-cache-")
+_ = os.environ.pop("HTTP_ARCHIVE_MODE", None)
+
+from crawlee import Request
+from pydantic import BaseModel
+
+from tulsa import SpiderRouter
+from tulsa.http import SpiderHttpClient
+
+BODY = b"<html><body>page</body></html>"
+
+
+def stored_bytes() -> bytes:
+    return b"".join(
+        path.read_bytes()
+        for path in Path(os.environ["HTTP_CACHE_DIR"]).rglob("*")
+        if path.is_file()
+    )
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    # The headers of every request the server received, by their lowercase name
+    requests: ClassVar[list[dict[str, str]]] = []
+
+    def do_GET(self):
+        PageHandler.requests.append(
+            {name.lower(): value for name, value in self.headers.items()}
+        )
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("ETag", '"v1"')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        # Fresh for an hour, it's still revalidated
+        self.send_header("Cache-Control", "max-age=3600")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        _ = self.wfile.write(BODY)
+
+    @override
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class SpiderHttpClientTest(unittest.IsolatedAsyncioTestCase):
+    server: ClassVar[ThreadingHTTPServer]
+    url: ClassVar[str]
+
+    @classmethod
+    @override
+    def setUpClass(cls) -> None:
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    @override
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    @override
+    def setUp(self) -> None:
+        PageHandler.requests = []
+
+    async def crawl(self, client: SpiderHttpClient, url: str) -> tuple[int, bytes]:
+        request = Request.from_url(url)
+        result = await client.crawl(request)
+        await client.commit(request)
+        return result.http_response.status_code, await result.http_response.read()
+
+    def make_client(self, spider: str) -> SpiderHttpClient:
+        client = SpiderHttpClient()
+        client.spider = spider
+        return client
+
+    async def test_fresh_entry_is_revalidated(self):
+        client = self.make_client("FreshSpider")
+        url = f"{self.url}/fresh"
+        self.assertEqual(await self.crawl(client, url), (200, BODY))
+        self.assertEqual(await self.crawl(client, url), (304, BODY))
+        self.assertEqual(len(PageHandler.requests), 2)
+        self.assertEqual(PageHandler.requests[1].get("if-none-match"), '"v1"')
+        self.assertEqual(client.bytes_saved, len(BODY))
+
+    async def test_uncommitted_response_isnt_stored(self):
+        client = self.make_client("FailingSpider")
+        url = f"{self.url}/failed"
+        request = Request.from_url(url)
+        _ = await client.crawl(request)
+        client.discard(request)
+        self.assertEqual(await self.crawl(client, url), (200, BODY))
+        self.assertNotIn("if-none-match", PageHandler.requests[1])
+
+    async def test_api_key_isnt_stored(self):
+        client = self.make_client("KeySpider")
+        url = f"{self.url}/feed?alt=rss&key=secret"
+        status_code, _ = await self.crawl(client, url)
+        self.assertEqual(status_code, 200)
+        stored = stored_bytes()
+        self.assertIn(b"alt=rss", stored)
+        self.assertNotIn(b"secret", stored)
+
+    async def test_entries_are_kept_by_spider(self):
+        url = f"{self.url}/shared"
+        status_code, _ = await self.crawl(self.make_client("FirstSpider"), url)
+        self.assertEqual(status_code, 200)
+        second = self.make_client("SecondSpider")
+        self.assertEqual(await self.crawl(second, url), (200, BODY))
+        self.assertEqual(await self.crawl(second, url), (304, BODY))
+
+
+class SpiderRouterTest(unittest.IsolatedAsyncioTestCase):
+    async def handled(self, status_code: int, label: str | None) -> list[str]:
+        handled: list[str] = []
+        router = SpiderRouter[Any]()
+        router.pipelines = []
+
+        async def listing(_context: Any) -> None:
+            handled.append("listing")
+
+        async def page(_context: Any) -> AsyncIterator[BaseModel]:
+            handled.append("page")
+            items: list[BaseModel] = []
+            for item in items:
+                yield item
+
+        router._handlers_by_label["listing"] = listing  # pyright: ignore [reportPrivateUsage]
+        _ = router.default_handler(page)
+        context: Any = SimpleNamespace(
+            http_response=SimpleNamespace(status_code=status_code),
+            request=Request.from_url("https://example.com/", label=label),
+        )
+        await router(context)
+        return handled
+
+    async def test_unchanged_page_is_skipped(self):
+        self.assertEqual(await self.handled(304, None), [])
+        self.assertEqual(await self.handled(200, None), ["page"])
+
+    async def test_unchanged_listing_page_is_handled(self):
+        self.assertEqual(await self.handled(304, "listing"), ["listing"])
+
+
+if __name__ == "__main__":
+    _ = unittest.main()
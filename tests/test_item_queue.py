@@ -0,0 +1,85 @@
+import unittest
+from typing import final, override
+
+from pydantic import BaseModel
+
+from tulsa.item_queue import ItemQueue
+from tulsa.pipelines import Pipeline
+
+
+class Item(BaseModel):
+    url: str
+
+
+@final
+class RecordingPipeline(Pipeline):
+    """
+    Keep the urls of the items it gets, or fail like a database which is down.
+    """
+
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.urls: list[str] = []
+
+    @property
+    @override
+    def enabled(self) -> bool:
+        return True
+
+    @property
+    @override
+    def priority(self) -> int:
+        return 0
+
+    @override
+    async def handle_item(self, item: BaseModel) -> BaseModel | None:
+        if self.fail:
+            raise ConnectionError("The database is down")
+        assert isinstance(item, Item)
+        self.urls.append(item.url)
+        return item
+
+
+class ItemQueueTest(unittest.IsolatedAsyncioTestCase):
+    async def commits(self, pipeline: RecordingPipeline) -> tuple[list[str], int]:
+        queue = ItemQueue([pipeline])
+        queue.workers = 2
+        committed: list[str] = []
+
+        async def commit(url: str) -> None:
+            # The items are stored before the response is
+            self.assertIn(url, pipeline.urls)
+            committed.append(url)
+
+        for url in ("https://example.com/a", "https://example.com/b"):
+            await queue.put([Item(url=url)], url)
+            await queue.when_processed(url, lambda url=url: commit(url))
+        await queue.join()
+        return committed, queue.failed
+
+    async def test_response_is_committed_after_its_items(self):
+        committed, failed = await self.commits(RecordingPipeline())
+        self.assertEqual(
+            sorted(committed), ["https://example.com/a", "https://example.com/b"]
+        )
+        self.assertEqual(failed, 0)
+
+    async def test_response_isnt_committed_when_the_pipelines_fail(self):
+        with self.assertLogs("tulsa.item_queue", "ERROR"):
+            committed, failed = await self.commits(RecordingPipeline(fail=True))
+        self.assertEqual(committed, [])
+        self.assertEqual(failed, 2)
+
+    async def test_response_without_queued_items_is_committed_now(self):
+        queue = ItemQueue([])
+        committed: list[str] = []
+
+        async def commit() -> None:
+            committed.append("https://example.com/")
+
+        await queue.when_processed("https://example.com/", commit)
+        self.assertEqual(committed, ["https://example.com/"])
+
+
+if __name__ == "__main__":
+    _ = unittest.main()
@@ -0,0 +1,61 @@
+import json
+import random
+import unittest
+from typing import Any, cast
+
+from tulsa.json_stream import JsonStream
+
+DOCUMENTS = [
+    b'{"a": 1.5}',
+    b'{"totalResults": 12, "vulnerabilities": [{"id": "CVE-1"}, {"id": "CVE-2"}], "format": "NVD"}',
+    b'{"vulnerabilities": [1.25e-3, -0.5, 10E+2, 7, true, null], "startIndex": 2000}',
+    b'{"vulnerabilities": [], "total": -12.75e1}',
+    '{"vulnerabilities": ["café", "日本", {"score": 9.8}], "x": "é"}'.encode(),
+    b'[{"ghsa_id": "GHSA-1", "cvss": {"score": 7.5}}, 3.14159, "text", false]',
+    b" [ 1 , 22 , 333.5 ] ",
+]
+
+
+def decode(chunks: list[bytes]) -> tuple[list[Any], dict[str, Any]]:
+    """
+    The items of `vulnerabilities`, or of the top-level array, and the other fields.
+    """
+    stream = JsonStream(chunks)
+    key = None if b"".join(chunks).lstrip().startswith(b"[") else "vulnerabilities"
+    return list(stream.items(key)), stream.fields
+
+
+def expected(data: bytes) -> tuple[list[Any], dict[str, Any]]:
+    document: Any = json.loads(data)
+    if isinstance(document, list):
+        return cast(list[Any], document), {}
+    return document.pop("vulnerabilities", []), document
+
+
+class JsonStreamTest(unittest.TestCase):
+    def test_number_split_after_the_dot(self):
+        self.assertEqual(decode([b'{"a": 1.', b"5}"]), ([], {"a": 1.5}))
+        self.assertEqual(decode([b'{"a": 1e', b"3}"]), ([], {"a": 1e3}))
+        self.assertEqual(decode([b"[1.", b"5, 2]"])[0], [1.5, 2])
+
+    def test_every_split_position(self):
+        for data in DOCUMENTS:
+            for i in range(len(data) + 1):
+                with self.subTest(data=data, split=i):
+                    self.assertEqual(decode([data[:i], data[i:]]), expected(data))
+
+    def test_random_chunks(self):
+        rng = random.Random(0)
+        for data in DOCUMENTS:
+            for _ in range(200):
+                cuts = sorted(rng.sample(range(len(data) + 1), 3))
+                chunks = [
+                    data[start:end]
+                    for start, end in zip([0, *cuts], [*cuts, len(data)], strict=True)
+                ]
+                with self.subTest(data=data, chunks=chunks):
+                    self.assertEqual(decode(chunks), expected(data))
+
+
+if __name__ == "__main__":
+    _ = unittest.main()
@@ -0,0 +1,73 @@
+import time
+import unittest
+from email.utils import formatdate
+
+from tulsa.models import Category
+from tulsa.spiders.rss import EmptyFeedError, RssProperties, parse_feed
+
+USER_DATA: RssProperties = {
+    "only_tags": [],
+    "exclude_tags": [],
+    "in_urls": [],
+    "fix_link": [],
+    "category": Category.Generic,
+    "allow_empty": False,
+}
+DAY = 24 * 3600
+
+
+def make_feed(ages: list[int]) -> bytes:
+    """
+    An RSS feed with an entry published `age` days ago for every age of `ages`.
+    """
+    items = "".join(
+        f"<item><title>Post {i}</title><link>https://example.com/post-{i}</link>"
+        + f"<pubDate>{formatdate(time.time() - age * DAY)}</pubDate></item>"
+        for i, age in enumerate(ages)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel>{items}</channel></rss>'.encode()
+
+
+class ParseFeedTest(unittest.TestCase):
+    def test_newest_first(self):
+        blogs, skipped, history = parse_feed(
+            "https://example.com/feed", make_feed([0, 1, 2] + [30] * 12), USER_DATA
+        )
+        self.assertEqual(len(blogs), 3)
+        self.assertEqual(skipped, 12)
+        self.assertEqual(len(history), 12)
+
+    def test_oldest_first(self):
+        blogs, skipped, _ = parse_feed(
+            "https://example.com/feed", make_feed([30] * 12 + [2, 1, 0]), USER_DATA
+        )
+        self.assertEqual(
+            [blog["url"] for blog in blogs],
+            [f"https://example.com/post-{i}" for i in (12, 13, 14)],
+        )
+        self.assertEqual(skipped, 12)
+
+    def test_unsorted(self):
+        blogs, skipped, _ = parse_feed(
+            "https://example.com/feed", make_feed([30, 0, 30, 1, 30]), USER_DATA
+        )
+        self.assertEqual(len(blogs), 2)
+        self.assertEqual(skipped, 3)
+
+    def test_only_stale_entries(self):
+        blogs, skipped, _ = parse_feed(
+            "https://example.com/feed", make_feed([30] * 5), USER_DATA
+        )
+        self.assertEqual(blogs, [])
+        self.assertEqual(skipped, 5)
+
+    def test_empty_feed(self):
+        with self.assertRaises(EmptyFeedError):
+            _ = parse_feed("https://example.com/feed", make_feed([]), USER_DATA)
+        user_data: RssProperties = {**USER_DATA, "allow_empty": True}
+        blogs, _, _ = parse_feed("https://example.com/feed", make_feed([]), user_data)
+        self.assertEqual(blogs, [])
+
+
+if __name__ == "__main__":
+    _ = unittest.main()
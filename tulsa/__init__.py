@@ -1,44 +1,79 @@
-from collections.abc import AsyncIterator, Callable
+import time
+from collections.abc import AsyncIterator, Callable, Hashable, Sequence
 from typing import TypeVar, Unpack, final, override
 
+from crawlee import Request
+from crawlee.configuration import Configuration
 from crawlee.crawlers import (
+    BasicCrawler,
     BasicCrawlerOptions,
     BasicCrawlingContext,
+    HttpCrawler,
     HttpCrawlingContext,
+    ParsedHttpCrawlingContext,
     ParselCrawler,
     ParselCrawlingContext,
 )
 from crawlee.errors import UserDefinedErrorHandlerError
-from crawlee.http_clients import CurlImpersonateHttpClient
-from crawlee.http_clients._curl_impersonate import (
-    _AsyncSession,  # pyright: ignore [reportPrivateUsage]
-)
 from crawlee.router import RequestHandler, Router
+from crawlee.statistics import FinalStatistics, StatisticsState
 from crawlee.storage_clients import MemoryStorageClient
 from pydantic import BaseModel
 
-from tulsa.pipelines import Pipeline, load_all_pipelines
+from tulsa.http import SpiderHttpClient
+from tulsa.item_queue import ItemQueue
+from tulsa.known_urls import known_urls
+from tulsa.metrics import (
+    spider_requests,
+    spider_retries,
+    spider_run_duration,
+    spider_runs,
+)
+from tulsa.pipelines import Pipeline, get_pipelines
+from tulsa.urls import canonicalize_url
 
 type HtmlCrawlingContext = ParselCrawlingContext
+# The response body as it is, without a DOM
+type RawCrawlingContext = ParsedHttpCrawlingContext[bytes]
 
 TCrawlingContext = TypeVar("TCrawlingContext", HttpCrawlingContext, HtmlCrawlingContext)
 
 
 @final
-class SpiderRouter(Router[ParselCrawlingContext]):
+class SpiderStorageClient(MemoryStorageClient):
+    """
+    Crawlee caches the storages by the storage client's class, so every spider would share
+    the same default request queue. Each spider gets its own storages instead,
+    which allows them to run at the same time.
+    """
+
+    @override
+    def get_storage_client_cache_key(self, configuration: Configuration) -> Hashable:
+        return (super().get_storage_client_cache_key(configuration), id(self))
+
+
+@final
+class SpiderRouter[TContext: HttpCrawlingContext](Router[TContext]):
     pipelines: list[Pipeline]
+    queue: ItemQueue
 
     def __init__(self) -> None:
         super().__init__()
-        self.pipelines = sorted(
-            filter(lambda p: p.enabled, load_all_pipelines()),
-            key=lambda p: p.priority,
-        )
+        self.pipelines = get_pipelines()
+        self.queue = ItemQueue(self.pipelines)
+
+    @override
+    async def __call__(self, context: TContext) -> None:
+        # The page hasn't changed since its items were stored, see `SpiderHttpClient`.
+        # A listing page is handled again, its pages may have failed the last time.
+        if context.http_response.status_code == 304 and context.request.label is None:
+            return
+        await super().__call__(context)
 
     @override
     def default_handler(  # pyright: ignore [reportIncompatibleMethodOverride]
-        self, handler: Callable[[ParselCrawlingContext], AsyncIterator[BaseModel]]
-    ) -> RequestHandler[ParselCrawlingContext]:
+        self, handler: Callable[[TContext], AsyncIterator[BaseModel]]
+    ) -> RequestHandler[TContext]:
         """Register a default request handler.
 
         The default request handler is invoked for requests that have either no label or a label for which we have
@@ -47,54 +82,173 @@ class SpiderRouter(Router[ParselCrawlingContext]):
         if self._default_handler is not None:
             raise RuntimeError("A default handler is already configured")
 
-        async def wrapper(context: ParselCrawlingContext):
-            async for item in handler(context):
-                for pipeline in self.pipelines:
-                    item = await pipeline.handle_item(item)
-                    if not item:
-                        break
+        async def wrapper(context: TContext):
+            # The pipelines get the items of a response together, see `Pipeline.handle_items`
+            items = [item async for item in handler(context)]
+            if not items:
+                return
+
+            # Debug only
+            # for item in items:
+            #     await context.push_data(item.model_dump())
 
-                # Debug only
-                # await context.push_data(item.model_dump())
+            await self.queue.put(items, context.request.url)
 
         self._default_handler = wrapper
 
         return wrapper
 
 
-class Spider(ParselCrawler):
+class BaseSpider[TContext: HttpCrawlingContext](
+    BasicCrawler[TContext, StatisticsState]
+):
+    """
+    What every spider has, whatever it does with the responses.
+    A spider extends `Spider` for HTML pages, or `HttpSpider` for the other responses.
+    """
+
+    skip_known_urls: bool
+    skipped_known_urls: int
+    http_client: SpiderHttpClient
+    item_queue: ItemQueue
+
     def __init__(
         self,
         *,
-        default_request_handler: Callable[
-            [ParselCrawlingContext], AsyncIterator[BaseModel]
-        ],
+        default_request_handler: Callable[[TContext], AsyncIterator[BaseModel]],
         allow_redirects: bool = True,
-        **kwargs: Unpack[BasicCrawlerOptions[ParselCrawlingContext]],
+        skip_known_urls: bool = False,
+        http_cache: bool = True,
+        **kwargs: Unpack[BasicCrawlerOptions[TContext]],
     ) -> None:
-        http_client = CurlImpersonateHttpClient()
-        # We modify the default configuration to be able to disable TLS verification
-        http_client._client_by_proxy_url[None] = _AsyncSession(  # pyright: ignore [reportPrivateUsage]
-            **{
-                "impersonate": "chrome",
-                "verify": False,
-                "allow_redirects": allow_redirects,
-            }
-        )
+        """
+        Set `skip_known_urls` to not fetch the pages, which the handlers add without a label,
+        when we have already stored them.
+
+        Set `http_cache` to `False` for the APIs which the cache shouldn't revalidate,
+        e.g. the responses depend on the authentication.
+        """
         # Workaround solution to disable the storage
-        kwargs["storage_client"] = MemoryStorageClient()
+        kwargs["storage_client"] = SpiderStorageClient()
+        http_client = SpiderHttpClient(
+            allow_redirects=allow_redirects, http_cache=http_cache
+        )
         kwargs["http_client"] = http_client
-        super().__init__(**kwargs)
-        self.router = SpiderRouter()  # pyright: ignore [reportUnannotatedClassAttribute]
+        # The next class is the crawler of the spider, e.g. `ParselCrawler`
+        super().__init__(**kwargs)  # pyright: ignore [reportUnknownMemberType]
+        self.http_client = http_client
+        self.router = SpiderRouter[TContext]()  # pyright: ignore [reportUnannotatedClassAttribute]
+        self.item_queue = self.router.queue
+        self.http_client.spider = self.item_queue.spider = self.__class__.__name__
         _ = self.router.default_handler(default_request_handler)
         self.log.info(
             f"Loaded pipelines: {list(map(lambda x: f'{x.__class__.__module__}.{x.__class__.__name__}', self.router.pipelines))}"
         )
+        self.skip_known_urls = skip_known_urls
+        self.skipped_known_urls = 0
+
+    @override
+    async def run(
+        self,
+        requests: Sequence[str | Request] | None = None,
+        *,
+        purge_request_queue: bool = True,
+    ) -> FinalStatistics:
+        if self.skip_known_urls:
+            await known_urls.load()
+        queue = self.item_queue
+        name = self.__class__.__name__
+        start = time.perf_counter()
+        try:
+            statistics = await super().run(
+                [self.__canonical(r) for r in requests]
+                if requests is not None
+                else None,
+                purge_request_queue=purge_request_queue,
+            )
+        finally:
+            # The items of the last responses may still be in the queue
+            await queue.join()
+            spider_runs.inc(spider=name)
+            spider_run_duration.observe(time.perf_counter() - start, spider=name)
+        spider_requests.inc(
+            statistics.requests_finished, spider=name, result="finished"
+        )
+        spider_requests.inc(statistics.requests_failed, spider=name, result="failed")
+        spider_retries.inc(
+            sum(
+                retries * count
+                for retries, count in enumerate(statistics.retry_histogram)
+            ),
+            spider=name,
+        )
+        self.log.info(
+            f"Pipeline queue: {queue.items} items of {queue.batches} responses, "
+            + f"max depth {queue.max_depth}, "
+            + f"wait {queue.total_wait / max(queue.batches, 1) * 1000:.1f} ms avg, "
+            + f"{queue.max_wait * 1000:.1f} ms max, {queue.failed} failed"
+        )
+        if self.skip_known_urls:
+            self.log.info(f"Skipped {self.skipped_known_urls} known urls")
+        self.log.info(f"HTTP cache saved {self.http_client.bytes_saved} bytes")
+        return statistics
+
+    @staticmethod
+    def __canonical(request: str | Request) -> str | Request:
+        """
+        Give the request the canonical url as its unique key,
+        so the variants of a url are fetched once.
+        """
+        if isinstance(request, str):
+            return Request.from_url(request, unique_key=canonicalize_url(request))
+        # Keep the keys of POST requests and the keys set by the spiders
+        if (
+            request.method == "GET"
+            and request.unique_key == Request.from_url(request.url).unique_key
+        ):
+            request.unique_key = canonicalize_url(request.url)
+        return request
+
+    @staticmethod
+    def __is_known(request: str | Request) -> bool:
+        # Only the pages of the default handler are stored, listing pages are always fetched
+        if isinstance(request, Request):
+            return request.label is None and request.url in known_urls
+        return request in known_urls
+
+    def request_handled(self, request: Request) -> None:  # pyright: ignore [reportUnusedParameter]
+        """
+        Called once the handler of `request` succeeded and its items went through
+        the pipelines, or the page was unchanged.
+        A request which failed, or whose items failed, doesn't get there.
+        """
+
+    @override
+    async def _commit_request_handler_result(
+        self, context: BasicCrawlingContext
+    ) -> None:
+        result = self._context_result_map[context]
+        for call in result.add_requests_calls:
+            requests = [self.__canonical(r) for r in call["requests"]]
+            if self.skip_known_urls:
+                requests = [r for r in requests if not self.__is_known(r)]
+                self.skipped_known_urls += len(call["requests"]) - len(requests)
+            call["requests"] = requests
+        await super()._commit_request_handler_result(context)
+        # The response is stored once its items are, a pipeline failure fetches it again
+        request = context.request
+
+        async def processed() -> None:
+            self.request_handled(request)
+            await self.http_client.commit(request)
+
+        await self.item_queue.when_processed(request.url, processed)
 
     @override
     async def _handle_failed_request(
         self, context: TCrawlingContext | BasicCrawlingContext, error: Exception
     ) -> None:
+        self.http_client.discard(context.request)
         await self._statistics.error_tracker.add(error=error, context=context)
 
         if self._failed_request_handler:
@@ -108,3 +262,16 @@ class Spider(ParselCrawler):
             self._logger.error(
                 f"Request to {context.request.url} failed and reached maximum retries\n {self._get_message_from_error(error)}"
             )
+
+
+class Spider(BaseSpider[ParselCrawlingContext], ParselCrawler):  # pyright: ignore [reportUnsafeMultipleInheritance]
+    """
+    A spider which reads HTML pages, every response is parsed into a `Selector`.
+    """
+
+
+class HttpSpider(BaseSpider[RawCrawlingContext], HttpCrawler):  # pyright: ignore [reportUnsafeMultipleInheritance]
+    """
+    A spider which reads JSON, feeds or other responses by itself,
+    the responses aren't parsed into a DOM.
+    """
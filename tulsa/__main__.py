@@ -1,15 +1,12 @@
 import asyncio
 import platform
+import sys
 
-from .main import main
+from .cli import cli
 
 if __name__ == "__main__":
     if platform.system() == "Windows":
         # This mitigates a warning raised by curl-cffi.
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
-    try:
-        asyncio.run(main())
-    except (KeyboardInterrupt, SystemExit):
-        for task in asyncio.all_tasks():
-            _ = task.cancel()
+    sys.exit(cli())
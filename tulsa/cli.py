@@ -0,0 +1,193 @@
+import argparse
+import asyncio
+import cProfile
+import logging
+import os
+import pstats
+import sys
+import time
+from datetime import datetime
+from typing import Any, Literal
+
+from crawlee import service_locator
+from dotenv import load_dotenv
+
+from tulsa import BaseSpider
+from tulsa.executor import shutdown_parse_executor
+from tulsa.feed_schedule import feed_schedule
+from tulsa.helpers import data_path
+from tulsa.http import set_request_budget
+from tulsa.main import error_handler, main
+from tulsa.pipelines import close_pipelines, flush_pipelines
+from tulsa.spiders import SpiderEntry, get_spiders
+
+logger = logging.getLogger(__name__)
+
+GROUPS: tuple[Literal["blog", "cve", "feed"], ...] = ("blog", "cve", "feed")
+
+
+def parse_args(args: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m tulsa",
+        description="Without a command, run the spiders on their schedule.",
+    )
+    commands = parser.add_subparsers(dest="command")
+    run = commands.add_parser(
+        "run",
+        help="run spiders now and print their statistics",
+        description="Run a spider, or every spider of a group, now and print its statistics.",
+    )
+    _ = run.add_argument(
+        "spider",
+        help=f"the class name of a spider, or a group: {', '.join(GROUPS)}",
+    )
+    _ = run.add_argument(
+        "--once",
+        action="store_true",
+        help="fetch every page once: every feed is due and the HTTP cache isn't used",
+    )
+    _ = run.add_argument(
+        "--profile",
+        nargs="?",
+        const="",
+        metavar="FILE",
+        help="write a cProfile file, .tulsa/profiles/<spider>-<time>.prof by default",
+    )
+    _ = run.add_argument(
+        "--concurrency",
+        type=int,
+        metavar="N",
+        help="the requests in flight across the spiders, MAX_CONCURRENT_REQUESTS by default",
+    )
+    return parser.parse_args(args)
+
+
+def resolve_spiders(name: str) -> list[SpiderEntry]:
+    """
+    The spiders of the group `name`, or the spider named `name`, case-insensitively.
+    """
+    if name in GROUPS:
+        return get_spiders([name])
+    entries = get_spiders(list(GROUPS))
+    found = [entry for entry in entries if entry.name.lower() == name.lower()]
+    if not found:
+        raise ValueError(
+            f"Unknown spider '{name}', the spiders are: "
+            + ", ".join(sorted(entry.name for entry in entries))
+        )
+    return found
+
+
+async def __run_spider(
+    entry: SpiderEntry, semaphore: asyncio.Semaphore, time_limit: float
+) -> str:
+    async with semaphore:
+        missing = entry.missing_env()
+        if missing:
+            return f"{entry.name}: {', '.join(missing)} isn't set"
+        spider: BaseSpider[Any] = entry.create()
+        _ = spider.failed_request_handler(error_handler)
+        _ = spider.error_handler(error_handler)
+        start = time.perf_counter()
+        async with asyncio.timeout(time_limit):
+            statistics = await spider.run()
+        elapsed = time.perf_counter() - start
+    queue = spider.item_queue
+    stages = " -> ".join(
+        f"{name} {queue.stages.get(name, 0)}"
+        for name in (p.__class__.__name__ for p in queue.pipelines)
+    )
+    return "\n".join(
+        [
+            f"{entry.name}: {elapsed:.2f}s wall time, "
+            + f"{spider.http_client.bytes_received} bytes received, "
+            + f"{spider.http_client.bytes_saved} bytes saved by the HTTP cache",
+            f"Items: {queue.items} handled" + (f" -> {stages}" if stages else ""),
+            statistics.to_table(),
+        ]
+    )
+
+
+async def run(entries: list[SpiderEntry]) -> list[str]:
+    """
+    Run the spiders `entries` now, return the report of every spider.
+    A spider which fails or stalls is reported, it doesn't stop the others.
+    """
+    semaphore = asyncio.Semaphore(int(os.getenv("MAX_CONCURRENT_SPIDERS", "8")))
+    timeout = float(os.getenv("SPIDER_TIMEOUT", "3600"))
+    try:
+        # The event manager is shared by all crawlers, it must outlive every spider.
+        async with service_locator.get_event_manager():
+            results = await asyncio.gather(
+                *[__run_spider(entry, semaphore, timeout) for entry in entries],
+                return_exceptions=True,
+            )
+        await flush_pipelines()
+    finally:
+        await close_pipelines()
+        shutdown_parse_executor()
+
+    reports: list[str] = []
+    for entry, result in zip(entries, results, strict=True):
+        if isinstance(result, TimeoutError):
+            reports.append(f"{entry.name}: didn't finish in {timeout} seconds")
+        elif isinstance(result, BaseException):
+            logger.error(f"{entry.name} failed", exc_info=result)
+            reports.append(f"{entry.name}: failed, {result!r}")
+        else:
+            reports.append(result)
+    return reports
+
+
+def run_command(args: argparse.Namespace) -> int:
+    try:
+        entries = resolve_spiders(args.spider)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    if args.once:
+        os.environ["HTTP_CACHE"] = "0"
+        feed_schedule.max_interval = 0
+    if args.concurrency:
+        set_request_budget(args.concurrency)
+
+    profiler = cProfile.Profile() if args.profile is not None else None
+    start = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        reports = asyncio.run(run(entries))
+    finally:
+        if profiler:
+            profiler.disable()
+    elapsed = time.perf_counter() - start
+
+    print("\n\n".join(reports))
+    print(f"\nRan {len(entries)} spiders in {elapsed:.2f}s")
+    if profiler:
+        path = args.profile or data_path(
+            "profiles", f"{args.spider}-{datetime.now():%Y%m%d-%H%M%S}.prof"
+        )
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        profiler.dump_stats(path)
+        # Open the file with `snakeviz` or `flameprof` for a flame graph
+        print(f"Profile written to {path}, the top functions by cumulative time:")
+        _ = pstats.Stats(profiler).sort_stats("cumulative").print_stats(20)
+    return 0
+
+
+def cli(args: list[str] | None = None) -> int:
+    parsed = parse_args(args)
+    _ = load_dotenv()
+    if parsed.command == "run":
+        logging.basicConfig(level=logging.INFO)
+        return run_command(parsed)
+    try:
+        asyncio.run(main())
+    except (KeyboardInterrupt, SystemExit):
+        for task in asyncio.all_tasks():
+            _ = task.cancel()
+    return 0
+
+
+__all__ = ["cli", "parse_args", "resolve_spiders", "run"]
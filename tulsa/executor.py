@@ -0,0 +1,68 @@
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+__executor: Executor | None = None
+__loaded = False
+
+
+def get_parse_executor() -> Executor | None:
+    """
+    Return the executor which parses the responses, `None` to parse them on the event loop.
+
+    Set `PARSE_EXECUTOR` to `process` for a process pool, or `thread` for a thread pool
+    which only runs in parallel on a free-threaded Python. `PARSE_WORKERS` sets its size.
+    """
+    global __executor, __loaded
+    if __loaded:
+        return __executor
+    __loaded = True
+    kind = os.getenv("PARSE_EXECUTOR", "")
+    workers = int(os.getenv("PARSE_WORKERS", "0")) or os.cpu_count() or 1
+    match kind:
+        case "process":
+            # Forking the crawler's threads isn't safe, the workers start from scratch
+            __executor = ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        case "thread":
+            __executor = ThreadPoolExecutor(workers, thread_name_prefix="parser")
+        case "":
+            pass
+        case _:
+            logger.error(f"Unknown parse executor: {kind}")
+    return __executor
+
+
+async def run_parser[**P, T](
+    parser: Callable[P, T], *args: P.args, **kwargs: P.kwargs
+) -> T:
+    """
+    Run `parser` in the parse executor, if there is one.
+
+    With a process pool, `parser` must be a module-level function
+    and its arguments and result must be picklable.
+    """
+    executor = get_parse_executor()
+    if executor is None:
+        return parser(*args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(
+        executor, functools.partial(parser, *args, **kwargs)
+    )
+
+
+def shutdown_parse_executor() -> None:
+    global __executor, __loaded
+    if __executor is not None:
+        __executor.shutdown(cancel_futures=True)
+    __executor = None
+    __loaded = False
+
+
+__all__ = ["get_parse_executor", "run_parser", "shutdown_parse_executor"]
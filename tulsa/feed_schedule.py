@@ -0,0 +1,81 @@
+import os
+import statistics
+import time
+from datetime import datetime
+from itertools import pairwise
+from typing import Any
+
+from tulsa.pipelines.filter import MAX_AGE
+from tulsa.state import load_state, save_state
+
+# The feeds were fetched twice a day before they had their own interval
+DEFAULT_INTERVAL = 12 * 3600
+# The feeds job runs every hour, see `tulsa.main`
+JOB_PERIOD = 3600
+# An entry published right after a fetch must still be fresh at the next fetch,
+# which can start a job period late and take a while, or `OutOfDateItem` drops it
+MAX_INTERVAL = MAX_AGE - JOB_PERIOD - 3600
+# How many publishing times are kept per feed
+HISTORY_SIZE = 20
+
+
+class FeedSchedule:
+    """
+    When to fetch every feed, learned from the publishing times of its entries.
+
+    A feed is fetched again after half of the median time between its entries,
+    or half of the time since its newest entry if it has gone quiet.
+    The interval is clamped to `FEED_MIN_INTERVAL` and `FEED_MAX_INTERVAL` seconds,
+    `FEED_MAX_INTERVAL` can't be longer than `MAX_INTERVAL`.
+    """
+
+    def __init__(self) -> None:
+        self.__feeds: dict[str, dict[str, Any]] | None = None
+        self.min_interval: float = float(os.getenv("FEED_MIN_INTERVAL", "3600"))
+        self.max_interval: float = min(
+            float(os.getenv("FEED_MAX_INTERVAL", str(3 * 24 * 3600))), MAX_INTERVAL
+        )
+
+    @property
+    def feeds(self) -> dict[str, dict[str, Any]]:
+        if self.__feeds is None:
+            self.__feeds = load_state("feeds")
+        return self.__feeds
+
+    def interval(self, feed: str) -> float:
+        published: list[float] = self.feeds.get(feed, {}).get("published", [])
+        if len(published) < 2:
+            interval = DEFAULT_INTERVAL
+        else:
+            gaps = [b - a for a, b in pairwise(published)]
+            interval = max(statistics.median(gaps), time.time() - published[-1]) / 2
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def is_due(self, feed: str) -> bool:
+        fetched = self.feeds.get(feed, {}).get("fetched")
+        if fetched is None:
+            return True
+        # The feeds job runs every hour, a feed shouldn't wait one more hour for a few seconds
+        return time.time() - fetched >= self.interval(feed) - 300
+
+    def fetched(self, feed: str) -> None:
+        self.feeds.setdefault(feed, {})["fetched"] = time.time()
+
+    def published(self, feed: str, date: datetime) -> None:
+        history: list[float] = self.feeds.setdefault(feed, {}).setdefault(
+            "published", []
+        )
+        timestamp = date.timestamp()
+        if timestamp not in history:
+            history.append(timestamp)
+            history.sort()
+            del history[:-HISTORY_SIZE]
+
+    def save(self) -> None:
+        if self.__feeds is not None:
+            save_state("feeds", self.__feeds)
+
+
+feed_schedule = FeedSchedule()
+
+__all__ = ["FeedSchedule", "feed_schedule"]
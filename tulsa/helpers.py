@@ -1,48 +1,81 @@
+import os
 import re
 import time
-from urllib.parse import parse_qs, urlencode, urlparse
+from html.parser import HTMLParser
+from typing import override
 
 import feedparser
 from feedparser.datetimes import (
     _parse_date as parse_date,  # pyright: ignore [reportPrivateUsage]
 )
 
+# A scheme and a non-empty netloc, like `urlparse` reads them
+_URL = re.compile(r"[\x00-\x20]*[a-zA-Z][a-zA-Z0-9+.-]*://[^/?#]")
+
 
 def is_valid_url(url: str) -> bool:
-    try:
-        parsed = urlparse(url)
-        return all([parsed.scheme, parsed.netloc])
-    except Exception:
-        return False
+    # Every Blog validates its URLs, `urlparse` was most of the construction time
+    return _URL.match(url) is not None
+
+
+class _HtmlText(HTMLParser):
+    # Like BeautifulSoup's `.text`, the content of these tags isn't text
+    skipped_tags: tuple[str, ...] = ("script", "style", "template")
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self.length: int = 0
+        self.__skipping = 0
+
+    @override
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in self.skipped_tags:
+            self.__skipping += 1
+
+    @override
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self.skipped_tags and self.__skipping > 0:
+            self.__skipping -= 1
+
+    @override
+    def handle_data(self, data: str) -> None:
+        if self.__skipping == 0:
+            self.parts.append(data)
+            self.length += len(data)
 
 
-def remove_url_query(url: str) -> str:
+_NEWLINES = re.compile(r"(?:\r?\n){3,}|\r\n")
+
+
+def _collapse_newlines(text: str) -> str:
+    return _NEWLINES.sub(lambda m: "\n\n" if len(m.group()) > 2 else "\n", text).strip()
+
+
+def html_to_text(markup: str, limit: int | None = None) -> str:
     """
-    Remove some "source" parameters from the URL.
+    Return the text of the HTML `markup`, without more than two newlines in a row.
 
-    Such as some blogs are from medium.com
+    With a `limit`, the markup is only parsed until the text has `limit` characters.
+    """
+    parser = _HtmlText()
+    step = 4096
+    for start in range(0, len(markup), step):
+        parser.feed(markup[start : start + step])
+        if limit is not None and parser.length >= limit:
+            text = _collapse_newlines("".join(parser.parts))
+            if len(text) >= limit:
+                return text[:limit]
+    parser.close()
+    text = _collapse_newlines("".join(parser.parts))
+    return text[:limit] if limit is not None else text
+
+
+def data_path(*parts: str) -> str:
+    """
+    Return a path in the local data directory, set by `TULSA_DATA_DIR`.
     """
-    url_parsed = urlparse(url)
-    queries = parse_qs(url_parsed.query)
-    sources = queries.get("utm_source", [])
-    for source in sources:
-        if source.startswith("rss"):
-            del queries["utm_source"]
-            break
-    sources = queries.get("utm_medium", [])
-    for source in sources:
-        if source.startswith("rss"):
-            del queries["utm_medium"]
-            break
-    sources = queries.get("source", [])
-    for source in sources:
-        if source.startswith("rss"):
-            del queries["source"]
-            break
-    if queries.get("utm_campaign"):
-        del queries["utm_campaign"]
-    url = url_parsed._replace(query=urlencode(queries, doseq=True)).geturl()
-    return url
+    return os.path.join(os.getenv("TULSA_DATA_DIR", ".tulsa"), *parts)
 
 
 def parse_date_MDY(date_str: str) -> time.struct_time | None:
@@ -103,4 +136,9 @@ feedparser.registerDateHandler(parse_date_MDY)
 feedparser.registerDateHandler(parse_date_mDY)
 
 
-__all__ = ["is_valid_url", "parse_date", "remove_url_query"]
+__all__ = [
+    "data_path",
+    "html_to_text",
+    "is_valid_url",
+    "parse_date",
+]
@@ -0,0 +1,214 @@
+import asyncio
+import os
+import time
+from typing import override
+from urllib.parse import urlsplit
+
+from crawlee import Request
+from crawlee._types import HttpHeaders
+from crawlee.http_clients import CurlImpersonateHttpClient, HttpCrawlingResult
+from crawlee.proxy_configuration import ProxyInfo
+from crawlee.sessions import Session
+from crawlee.statistics import Statistics
+
+from tulsa.http.archive import (
+    SKIPPED_HEADERS,
+    ArchiveMissError,
+    HttpArchive,
+    get_http_archive,
+    redact_url,
+)
+from tulsa.http.cache import CachedResponse, CacheEntry, HttpCache, get_http_cache
+from tulsa.http.politeness import get_host_limiter, parse_retry_after
+from tulsa.metrics import (
+    http_cache_bytes_saved,
+    http_request_duration,
+    http_requests,
+    http_response_bytes,
+)
+
+__request_budget: asyncio.Semaphore | None = None
+
+
+def set_request_budget(limit: int) -> None:
+    """
+    Limit the number of HTTP requests in flight across every spider of the process.
+    """
+    global __request_budget
+    __request_budget = asyncio.Semaphore(limit)
+
+
+def get_request_budget() -> asyncio.Semaphore:
+    global __request_budget
+    if __request_budget is None:
+        __request_budget = asyncio.Semaphore(
+            int(os.getenv("MAX_CONCURRENT_REQUESTS", "64"))
+        )
+    return __request_budget
+
+
+class SpiderHttpClient(CurlImpersonateHttpClient):
+    """
+    The HTTP client used by every spider.
+
+    All spiders share the same request budget, so running many spiders at the same time
+    doesn't open more connections than `MAX_CONCURRENT_REQUESTS`.
+    Requests to the same host also share a host limiter, see `tulsa.http.politeness`.
+
+    GET responses are kept in the HTTP cache and revalidated with conditional requests,
+    every request reaches the server. An unchanged page is returned as a `304 Not Modified`
+    response with the stored body, the `SpiderRouter` skips it unless it's a listing page.
+
+    With an HTTP archive, see `tulsa.http.archive`, the responses are recorded
+    or served from the archive without the network, the HTTP cache isn't used then.
+    """
+
+    bytes_saved: int
+    bytes_received: int
+    # The name of the spider in the metrics
+    spider: str
+
+    def __init__(
+        self, *, allow_redirects: bool = True, http_cache: bool = True
+    ) -> None:
+        # We modify the default configuration to be able to disable TLS verification.
+        # The options are kept by the client, so they survive the session cleanup between runs.
+        super().__init__(
+            impersonate="chrome",
+            verify=False,
+            allow_redirects=allow_redirects,
+        )
+        self.__archive: HttpArchive | None = get_http_archive()
+        self.__cache: HttpCache | None = (
+            get_http_cache() if http_cache and self.__archive is None else None
+        )
+        # Responses are only stored after their request has been handled,
+        # otherwise a failed handler would never see the page again.
+        self.__pending: dict[str, tuple[str, CacheEntry]] = {}
+        self.bytes_saved = 0
+        self.bytes_received = 0
+        self.spider = ""
+
+    async def commit(self, request: Request) -> None:
+        """
+        Store the response of a request which has been handled successfully.
+        """
+        pending = self.__pending.pop(request.unique_key, None)
+        if pending and self.__cache:
+            await self.__cache.put(*pending)
+
+    def discard(self, request: Request) -> None:
+        _ = self.__pending.pop(request.unique_key, None)
+
+    async def __fetch(
+        self,
+        request: Request,
+        session: Session | None,
+        proxy_info: ProxyInfo | None,
+        statistics: Statistics | None,
+    ) -> HttpCrawlingResult:
+        # Wait for the host first, a busy host shouldn't hold the slots of the others
+        limiter = get_host_limiter(request.url)
+        host = (urlsplit(request.url).hostname or "").lower()
+        start = time.perf_counter()
+        async with limiter.slot(), get_request_budget():
+            result = await super().crawl(
+                request, session=session, proxy_info=proxy_info, statistics=statistics
+            )
+        http_request_duration.observe(
+            time.perf_counter() - start, spider=self.spider, host=host
+        )
+        http_requests.inc(
+            spider=self.spider,
+            host=host,
+            status=str(result.http_response.status_code),
+        )
+        body = await result.http_response.read()
+        self.bytes_received += len(body)
+        http_response_bytes.inc(len(body), spider=self.spider, host=host)
+        if self.__archive:
+            await self.__archive.put(
+                self.__archive.key(request.method, request.url, request.payload),
+                CacheEntry(
+                    url=redact_url(request.url),
+                    status_code=result.http_response.status_code,
+                    headers={
+                        name: value
+                        for name, value in result.http_response.headers.items()
+                        if name not in SKIPPED_HEADERS
+                    },
+                    stored_at=time.time(),
+                    body=body,
+                ),
+            )
+        if result.http_response.status_code in (429, 503):
+            retry_after = parse_retry_after(
+                result.http_response.headers.get("retry-after")
+            )
+            if retry_after is not None:
+                limiter.block(retry_after)
+        return result
+
+    @override
+    async def crawl(
+        self,
+        request: Request,
+        *,
+        session: Session | None = None,
+        proxy_info: ProxyInfo | None = None,
+        statistics: Statistics | None = None,
+    ) -> HttpCrawlingResult:
+        archive = self.__archive
+        if archive and archive.mode == "replay":
+            entry = await archive.get(
+                archive.key(request.method, request.url, request.payload)
+            )
+            if entry is None:
+                raise ArchiveMissError(f"{request.url} isn't in the HTTP archive")
+            return HttpCrawlingResult(http_response=CachedResponse(entry))
+
+        cache = self.__cache
+        if cache is None or request.method != "GET":
+            return await self.__fetch(request, session, proxy_info, statistics)
+
+        # The entries are kept by spider, a page handled by one spider is new to the others
+        key = cache.key(request.method, request.url, self.spider.encode())
+        entry = await cache.get(key)
+        # Even a fresh entry is revalidated, only the server knows the page hasn't changed
+        if entry:
+            request.headers = request.headers | HttpHeaders(entry.validators())
+
+        result = await self.__fetch(request, session, proxy_info, statistics)
+        response = result.http_response
+        if response.status_code == 304 and entry:
+            # The 304 response updates the stored headers (RFC 9111 section 4.3.4)
+            entry.headers.update(self.__stored_headers(response.headers))
+            entry.stored_at = time.time()
+            self.__pending[request.unique_key] = (key, entry)
+            self.bytes_saved += len(entry.body)
+            http_cache_bytes_saved.inc(len(entry.body), spider=self.spider)
+            # The crawler parses the body before the router skips the response
+            return HttpCrawlingResult(http_response=CachedResponse(entry, 304))
+        elif response.status_code == 200:
+            entry = CacheEntry(
+                url=redact_url(request.url),
+                status_code=response.status_code,
+                headers=self.__stored_headers(response.headers),
+                stored_at=time.time(),
+                body=await response.read(),
+            )
+            if entry.is_storable():
+                self.__pending[request.unique_key] = (key, entry)
+        return result
+
+    @staticmethod
+    def __stored_headers(headers: HttpHeaders) -> dict[str, str]:
+        # The body is stored decoded
+        return {
+            name: value
+            for name, value in headers.items()
+            if name not in ("content-encoding", "content-length", "transfer-encoding")
+        }
+
+
+__all__ = ["SpiderHttpClient", "get_request_budget", "set_request_budget"]
@@ -0,0 +1,129 @@
+import logging
+import os
+import re
+import sys
+from typing import Literal, override
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from tulsa.helpers import data_path
+from tulsa.http.cache import HttpCache
+
+# The query and form parameters which carry credentials,
+# they're neither stored nor part of the key, a replay can run with other credentials
+SECRET_PARAMETERS = frozenset(
+    {
+        "key",
+        "api_key",
+        "apikey",
+        "token",
+        "access_token",
+        "client_id",
+        "client_secret",
+        "username",
+        "password",
+        "otp_code",
+        "backup_otp_code",
+    }
+)
+# The response headers which aren't stored, the body is stored decoded
+SKIPPED_HEADERS = frozenset(
+    {"set-cookie", "content-encoding", "content-length", "transfer-encoding"}
+)
+# The time windows of the APIs, e.g. `pubStartDate` of NVD, change with every run.
+# They're left out of the keys, so a replay on another day finds its responses.
+_DATE = re.compile(
+    r"\d{4}-\d{2}-\d{2}(?:T\d{2}(?::|%3A)\d{2}(?::|%3A)\d{2}(?:\.\d+)?(?:Z|%2B\d{2}(?::|%3A)\d{2})?)?"
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ArchiveMissError(Exception):
+    """
+    The request of a replay hasn't been recorded.
+    """
+
+
+def __redact_query(query: str) -> str:
+    return urlencode(
+        [
+            (name, value)
+            for name, value in parse_qsl(query, keep_blank_values=True)
+            if name.lower() not in SECRET_PARAMETERS
+        ]
+    )
+
+
+def redact_url(url: str) -> str:
+    parts = urlsplit(url)
+    if not parts.query:
+        return url
+    return urlunsplit(parts._replace(query=__redact_query(parts.query)))
+
+
+def redact_payload(payload: bytes | None) -> bytes | None:
+    # Only the forms are redacted, a JSON payload is a query of the spider
+    if not payload or payload.lstrip()[:1] in (b"{", b"["):
+        return payload
+    return __redact_query(payload.decode(errors="replace")).encode()
+
+
+class HttpArchive(HttpCache):
+    """
+    The responses of a crawl, recorded to crawl again without the network.
+
+    Unlike the HTTP cache, every response is kept whatever its status and nothing is evicted.
+    The credentials in the urls and the forms are left out of the keys and the entries,
+    and the cookies aren't stored. The dates of the query strings aren't part of the keys.
+    The bodies are stored as they are, keep the archive of an authenticated spider private.
+    """
+
+    mode: Literal["record", "replay"]
+
+    def __init__(self, directory: str, mode: Literal["record", "replay"]) -> None:
+        super().__init__(directory, sys.maxsize)
+        self.mode = mode
+
+    @staticmethod
+    @override
+    def key(method: str, url: str, payload: bytes | None = None) -> str:
+        parts = urlsplit(redact_url(url))
+        url = urlunsplit(parts._replace(query=_DATE.sub("<date>", parts.query)))
+        return HttpCache.key(method, url, redact_payload(payload))
+
+
+__http_archive: HttpArchive | None = None
+__loaded = False
+
+
+def get_http_archive() -> HttpArchive | None:
+    """
+    Return the HTTP archive shared by all spiders, `None` when the spiders use the network.
+
+    Set `HTTP_ARCHIVE_MODE` to `record` to store every response in `HTTP_ARCHIVE_DIR`,
+    then to `replay` to serve the responses from there.
+    """
+    global __http_archive, __loaded
+    if __loaded:
+        return __http_archive
+    __loaded = True
+    mode = os.getenv("HTTP_ARCHIVE_MODE", "")
+    directory = os.getenv("HTTP_ARCHIVE_DIR") or data_path("http-archive")
+    match mode:
+        case "record" | "replay":
+            __http_archive = HttpArchive(directory, mode)
+            logger.info(f"HTTP archive: {mode} in {directory}")
+        case "":
+            pass
+        case _:
+            logger.error(f"Unknown HTTP archive mode: {mode}")
+    return __http_archive
+
+
+__all__ = [
+    "ArchiveMissError",
+    "HttpArchive",
+    "get_http_archive",
+    "redact_payload",
+    "redact_url",
+]
@@ -0,0 +1,194 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from collections.abc import AsyncIterator
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from crawlee._types import HttpHeaders
+
+from tulsa.helpers import data_path
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    status_code: int
+    headers: dict[str, str]
+    stored_at: float
+    body: bytes = b""
+
+    @property
+    def etag(self) -> str | None:
+        return self.headers.get("etag")
+
+    @property
+    def last_modified(self) -> str | None:
+        return self.headers.get("last-modified")
+
+    def __cache_control(self) -> dict[str, str]:
+        directives: dict[str, str] = {}
+        for directive in self.headers.get("cache-control", "").split(","):
+            name, _, value = directive.strip().partition("=")
+            if name:
+                directives[name.lower()] = value.strip('"')
+        return directives
+
+    def is_storable(self) -> bool:
+        """
+        Only successful responses which can be revalidated are worth storing,
+        every request is sent, see `SpiderHttpClient`.
+        """
+        if self.status_code != 200 or "no-store" in self.__cache_control():
+            return False
+        return bool(self.etag or self.last_modified)
+
+    def validators(self) -> dict[str, str]:
+        """
+        The conditional request headers to revalidate the entry.
+        """
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class CachedResponse:
+    """
+    A response served from the cache, it implements crawlee's `HttpResponse` protocol.
+    """
+
+    def __init__(self, entry: CacheEntry, status_code: int | None = None) -> None:
+        self.__entry = entry
+        self.__status_code = status_code or entry.status_code
+
+    @property
+    def http_version(self) -> str:
+        return "HTTP/1.1"
+
+    @property
+    def status_code(self) -> int:
+        return self.__status_code
+
+    @property
+    def headers(self) -> HttpHeaders:
+        return HttpHeaders(self.__entry.headers)
+
+    async def read(self) -> bytes:
+        return self.__entry.body
+
+    async def read_stream(self) -> AsyncIterator[bytes]:
+        yield self.__entry.body
+
+
+class HttpCache:
+    """
+    A private HTTP cache on the local disk.
+
+    Every entry is a single file, a JSON line with the response metadata followed by the body.
+    When the cache grows over `max_bytes`, the least recently used entries are removed.
+    """
+
+    directory: str
+    max_bytes: int
+    logger: logging.Logger
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.__size: int | None = None
+        self.__lock = asyncio.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def key(method: str, url: str, payload: bytes | None = None) -> str:
+        digest = hashlib.sha256(f"{method.upper()} {url}".encode())
+        if payload:
+            digest.update(payload)
+        return digest.hexdigest()
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    def __read(self, key: str) -> CacheEntry | None:
+        try:
+            with open(self.__path(key), "rb") as f:
+                metadata = json.loads(f.readline())
+                body = f.read()
+            # Used by the eviction
+            os.utime(self.__path(key))
+        except (OSError, ValueError):
+            return None
+        return CacheEntry(body=body, **metadata)
+
+    def __write(self, key: str, entry: CacheEntry) -> int:
+        path = self.__path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        metadata: dict[str, Any] = asdict(entry)
+        del metadata["body"]
+        previous = os.path.getsize(path) if os.path.exists(path) else 0
+        with open(f"{path}.tmp", "wb") as f:
+            _ = f.write(json.dumps(metadata).encode() + b"\n")
+            _ = f.write(entry.body)
+        os.replace(f"{path}.tmp", path)
+        return os.path.getsize(path) - previous
+
+    def __files(self) -> list[os.DirEntry[str]]:
+        files: list[os.DirEntry[str]] = []
+        if not os.path.isdir(self.directory):
+            return files
+        for folder in os.scandir(self.directory):
+            if folder.is_dir():
+                files += [f for f in os.scandir(folder.path) if f.is_file()]
+        return files
+
+    def __evict(self) -> int:
+        files = sorted(self.__files(), key=lambda f: f.stat().st_mtime)
+        size = sum(f.stat().st_size for f in files)
+        # Leave some room, so we don't evict on every write
+        while files and size > self.max_bytes * 0.9:
+            entry = files.pop(0)
+            size -= entry.stat().st_size
+            os.remove(entry.path)
+        return size
+
+    async def get(self, key: str) -> CacheEntry | None:
+        return await asyncio.to_thread(self.__read, key)
+
+    async def put(self, key: str, entry: CacheEntry) -> None:
+        async with self.__lock:
+            if self.__size is None:
+                self.__size = await asyncio.to_thread(
+                    lambda: sum(f.stat().st_size for f in self.__files())
+                )
+            self.__size += await asyncio.to_thread(self.__write, key, entry)
+            if self.__size > self.max_bytes:
+                self.__size = await asyncio.to_thread(self.__evict)
+                self.logger.info(
+                    f"Evicted HTTP cache entries, {self.__size} bytes left"
+                )
+
+
+__http_cache: HttpCache | None = None
+
+
+def get_http_cache() -> HttpCache | None:
+    """
+    Return the HTTP cache shared by all spiders, set `HTTP_CACHE=0` to disable it.
+    """
+    global __http_cache
+    if os.getenv("HTTP_CACHE", "1") == "0":
+        return None
+    if __http_cache is None:
+        __http_cache = HttpCache(
+            os.getenv("HTTP_CACHE_DIR") or data_path("http-cache"),
+            int(os.getenv("HTTP_CACHE_MAX_BYTES", str(512 * 1024 * 1024))),
+        )
+    return __http_cache
+
+
+__all__ = ["CacheEntry", "CachedResponse", "HttpCache", "get_http_cache"]
@@ -0,0 +1,94 @@
+import asyncio
+import os
+import time
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+# Don't wait longer than this, a spider can retry the request later
+MAX_RETRY_AFTER = 600
+
+
+class HostLimiter:
+    """
+    Limit the requests to a single host, with a maximum number of requests in flight
+    and a token bucket refilled with `requests_per_minute` tokens.
+    """
+
+    def __init__(self, max_in_flight: int, requests_per_minute: int) -> None:
+        self.__in_flight = asyncio.Semaphore(max_in_flight)
+        self.__rate = requests_per_minute / 60
+        # Allow a burst as large as the requests in flight
+        self.__capacity = float(max(max_in_flight, 1))
+        self.__tokens = self.__capacity
+        self.__updated = time.monotonic()
+        self.__blocked_until = 0.0
+
+    def block(self, seconds: float) -> None:
+        """
+        Don't send any request for `seconds`, e.g. the host answered with `Retry-After`.
+        """
+        self.__blocked_until = max(
+            self.__blocked_until, time.monotonic() + min(seconds, MAX_RETRY_AFTER)
+        )
+        self.__tokens = 0
+
+    async def __take_token(self) -> None:
+        while True:
+            now = time.monotonic()
+            if now < self.__blocked_until:
+                await asyncio.sleep(self.__blocked_until - now)
+                continue
+            if self.__rate <= 0:
+                return
+            self.__tokens = min(
+                self.__capacity, self.__tokens + (now - self.__updated) * self.__rate
+            )
+            self.__updated = now
+            if self.__tokens >= 1:
+                self.__tokens -= 1
+                return
+            await asyncio.sleep((1 - self.__tokens) / self.__rate)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncGenerator[None]:
+        async with self.__in_flight:
+            await self.__take_token()
+            yield
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Return the seconds to wait from a `Retry-After` header, either seconds or an HTTP date.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+__limiters: dict[str, HostLimiter] = {}
+
+
+def get_host_limiter(url: str) -> HostLimiter:
+    """
+    Return the limiter of the url's host, it's shared by every spider of the process.
+    """
+    host = (urlparse(url).hostname or "").lower()
+    limiter = __limiters.get(host)
+    if limiter is None:
+        limiter = HostLimiter(
+            int(os.getenv("HOST_MAX_IN_FLIGHT", "4")),
+            int(os.getenv("HOST_REQUESTS_PER_MINUTE", "120")),
+        )
+        __limiters[host] = limiter
+    return limiter
+
+
+__all__ = ["HostLimiter", "get_host_limiter", "parse_retry_after"]
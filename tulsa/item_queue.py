@@ -0,0 +1,171 @@
+import asyncio
+import logging
+import os
+import time
+from collections.abc import Awaitable, Callable
+
+from pydantic import BaseModel
+
+from tulsa.known_urls import known_urls
+from tulsa.metrics import (
+    items_yielded,
+    pipeline_duration,
+    pipeline_items_dropped,
+    pipeline_queue_depth,
+    pipeline_queue_wait,
+)
+from tulsa.pipelines import Pipeline
+
+
+class ItemQueue:
+    """
+    The items of the responses, waiting for the pipelines.
+
+    `PIPELINE_WORKERS` workers pass the items through the pipelines, so the request handlers
+    don't wait for the database. When `PIPELINE_QUEUE_SIZE` responses are waiting,
+    the handlers wait for a free slot instead of piling up items.
+    Set `PIPELINE_WORKERS` to `0` to run the pipelines in the request handlers.
+    """
+
+    logger: logging.Logger
+    pipelines: list[Pipeline]
+    # The name of the spider in the metrics
+    spider: str
+    workers: int
+    # Metrics, the waits are in seconds
+    batches: int
+    items: int
+    max_depth: int
+    total_wait: float
+    max_wait: float
+    # The responses whose items the pipelines failed to handle
+    failed: int
+    # The items which every pipeline passed on, by the name of the pipeline
+    stages: dict[str, int]
+
+    def __init__(self, pipelines: list[Pipeline]) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.pipelines = pipelines
+        self.spider = ""
+        self.workers = int(os.getenv("PIPELINE_WORKERS", "4"))
+        self.__max_size = int(os.getenv("PIPELINE_QUEUE_SIZE", "100"))
+        self.__queue: asyncio.Queue[tuple[list[BaseModel], str, float]] | None = None
+        self.__tasks: list[asyncio.Task[None]] = []
+        # The batches of every url which haven't gone through the pipelines yet,
+        # and what waits for them, see `when_processed`
+        self.__unprocessed: dict[str, int] = {}
+        self.__waiting: dict[str, list[Callable[[], Awaitable[None]]]] = {}
+        self.__failed: set[str] = set()
+        self.batches = 0
+        self.items = 0
+        self.max_depth = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.failed = 0
+        self.stages = {}
+
+    @property
+    def depth(self) -> int:
+        """
+        How many responses are waiting for a worker.
+        """
+        return self.__queue.qsize() if self.__queue else 0
+
+    async def put(self, items: list[BaseModel], url: str) -> None:
+        """
+        Queue the `items` of the response of `url`, wait while the queue is full.
+        """
+        items_yielded.inc(len(items), spider=self.spider)
+        if self.workers <= 0:
+            await self.__process(items, url)
+            return
+        if self.__queue is None:
+            # The queue belongs to the event loop of the running spider
+            self.__queue = asyncio.Queue(self.__max_size)
+            self.__tasks = [
+                asyncio.create_task(self.__work(self.__queue))
+                for _ in range(self.workers)
+            ]
+        self.__unprocessed[url] = self.__unprocessed.get(url, 0) + 1
+        await self.__queue.put((items, url, time.perf_counter()))
+        self.max_depth = max(self.max_depth, self.__queue.qsize())
+        pipeline_queue_depth.set(self.__queue.qsize(), spider=self.spider)
+
+    async def when_processed(
+        self, url: str, callback: Callable[[], Awaitable[None]]
+    ) -> None:
+        """
+        Run `callback` once the queued items of `url` went through the pipelines,
+        now when none are queued. It doesn't run when the pipelines fail.
+        """
+        if url in self.__unprocessed:
+            self.__waiting.setdefault(url, []).append(callback)
+        else:
+            await callback()
+
+    async def join(self) -> None:
+        """
+        Wait until every queued item went through the pipelines, then stop the workers.
+        """
+        if self.__queue is None:
+            return
+        await self.__queue.join()
+        for task in self.__tasks:
+            _ = task.cancel()
+        _ = await asyncio.gather(*self.__tasks, return_exceptions=True)
+        self.__queue = None
+        self.__tasks = []
+
+    async def __work(self, queue: asyncio.Queue[tuple[list[BaseModel], str, float]]):
+        while True:
+            items, url, queued = await queue.get()
+            pipeline_queue_depth.set(queue.qsize(), spider=self.spider)
+            wait = time.perf_counter() - queued
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            pipeline_queue_wait.observe(wait, spider=self.spider)
+            try:
+                await self.__process(items, url)
+            except Exception:
+                # The response has been handled, its items can't fail the request anymore.
+                # It isn't stored in the HTTP cache, the next run gets the items again.
+                self.logger.exception(f"Cannot process the items of {url}")
+                self.__failed.add(url)
+                self.failed += 1
+            try:
+                await self.__done(url)
+            except Exception:
+                self.logger.exception(f"Cannot finish the items of {url}")
+            finally:
+                queue.task_done()
+
+    async def __done(self, url: str) -> None:
+        self.__unprocessed[url] -= 1
+        if self.__unprocessed[url]:
+            return
+        del self.__unprocessed[url]
+        callbacks = self.__waiting.pop(url, [])
+        if url in self.__failed:
+            self.__failed.remove(url)
+            return
+        for callback in callbacks:
+            await callback()
+
+    async def __process(self, items: list[BaseModel], url: str) -> None:
+        self.batches += 1
+        self.items += len(items)
+        for pipeline in self.pipelines:
+            name = pipeline.__class__.__name__
+            count = len(items)
+            with pipeline_duration.time(pipeline=name):
+                items = await pipeline.handle_items(items)
+            self.stages[name] = self.stages.get(name, 0) + len(items)
+            if len(items) < count:
+                pipeline_items_dropped.inc(
+                    count - len(items), spider=self.spider, pipeline=name
+                )
+            if not items:
+                break
+
+        # The page url can differ from the item url, e.g. medium.com/p/<id>
+        known_urls.add(url)
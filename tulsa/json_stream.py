@@ -0,0 +1,130 @@
+import codecs
+import json
+import re
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# What can follow the part of a number which has been decoded, e.g. `1.` then `5`
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+# How much of a body is decoded at once
+CHUNK_SIZE = 64 * 1024
+
+
+def _chunks(data: bytes) -> Iterator[bytes]:
+    view = memoryview(data)
+    for start in range(0, len(view), CHUNK_SIZE):
+        yield bytes(view[start : start + CHUNK_SIZE])
+
+
+class JsonStream:
+    """
+    Decode the items of a large JSON array one by one.
+
+    Only the text of the current item and the item itself are in memory at the same time,
+    instead of the whole document, and the first items are available before the rest is decoded.
+
+    ```
+    stream = JsonStream(body)
+    for vuln in stream.items("vulnerabilities"):
+        ...
+    total = stream.fields["totalResults"]
+    ```
+    """
+
+    fields: dict[str, Any]
+
+    def __init__(self, data: bytes | Iterable[bytes]) -> None:
+        self.__chunks = iter(_chunks(data) if isinstance(data, bytes) else data)
+        self.__decoder = codecs.getincrementaldecoder("utf-8")()
+        self.__json = json.JSONDecoder()
+        self.__buffer = ""
+        self.__pos = 0
+        self.fields = {}
+
+    def __fill(self) -> bool:
+        """
+        Append the next chunk to the buffer and drop what has been decoded.
+        """
+        for chunk in self.__chunks:
+            text = self.__decoder.decode(chunk)
+            if text:
+                self.__buffer = self.__buffer[self.__pos :] + text
+                self.__pos = 0
+                return True
+        return False
+
+    def __peek(self) -> str:
+        """
+        Return the next non-whitespace character, or an empty string at the end.
+        """
+        while True:
+            match = _WHITESPACE.match(self.__buffer, self.__pos)
+            self.__pos = match.end() if match else self.__pos
+            if self.__pos < len(self.__buffer):
+                return self.__buffer[self.__pos]
+            if not self.__fill():
+                return ""
+
+    def __next(self, expected: str) -> str:
+        char = self.__peek()
+        if char not in expected:
+            raise json.JSONDecodeError(
+                f"Expecting one of {expected!r}", self.__buffer, self.__pos
+            )
+        self.__pos += 1
+        return char
+
+    def __value(self) -> Any:
+        _ = self.__peek()
+        while True:
+            try:
+                value, end = self.__json.raw_decode(self.__buffer, self.__pos)
+            except json.JSONDecodeError:
+                if not self.__fill():
+                    raise
+                continue
+            # A number at the end of the buffer could go on in the next chunk,
+            # even when the decoder stopped before a trailing `.` or `e`
+            if (
+                isinstance(value, int | float)
+                and _NUMBER_TAIL.fullmatch(self.__buffer, end)
+                and self.__fill()
+            ):
+                continue
+            self.__pos = end
+            return value
+
+    def __array(self) -> Iterator[Any]:
+        _ = self.__next("[")
+        if self.__peek() == "]":
+            self.__pos += 1
+            return
+        while True:
+            yield self.__value()
+            if self.__next(",]") == "]":
+                return
+
+    def items(self, key: str | None = None) -> Iterator[Any]:
+        """
+        Yield the items of the top-level array, or of the array `key` of the top-level object.
+        The other fields of the object are kept in `fields`, they are complete once all items are read.
+        """
+        if key is None:
+            yield from self.__array()
+            return
+        _ = self.__next("{")
+        if self.__peek() == "}":
+            return
+        while True:
+            name = self.__value()
+            _ = self.__next(":")
+            if name == key and self.__peek() == "[":
+                yield from self.__array()
+            else:
+                self.fields[name] = self.__value()
+            if self.__next(",}") == "}":
+                return
+
+
+__all__ = ["JsonStream"]
@@ -0,0 +1,58 @@
+import asyncio
+import hashlib
+from collections.abc import AsyncIterator, Callable
+
+from tulsa.urls import canonicalize_url
+
+
+class KnownUrls:
+    """
+    The urls we have already stored.
+
+    Only an 8-byte digest of each normalized url is kept, so the whole `blog` collection fits
+    in a few megabytes. A digest collision only makes us skip one page.
+    """
+
+    def __init__(self) -> None:
+        self.__digests: set[int] = set()
+        self.__loader: Callable[[], AsyncIterator[str]] | None = None
+        self.__loaded = False
+        self.__lock = asyncio.Lock()
+
+    @staticmethod
+    def __digest(url: str) -> int:
+        return int.from_bytes(
+            hashlib.blake2b(canonicalize_url(url).encode(), digest_size=8).digest()
+        )
+
+    def set_loader(self, loader: Callable[[], AsyncIterator[str]]) -> None:
+        """
+        Set where the stored urls are loaded from, the storage pipeline does it.
+        """
+        self.__loader = loader
+        self.__loaded = False
+
+    async def load(self) -> None:
+        """
+        Load the stored urls once.
+        """
+        async with self.__lock:
+            if self.__loaded or self.__loader is None:
+                return
+            async for url in self.__loader():
+                self.add(url)
+            self.__loaded = True
+
+    def add(self, url: str) -> None:
+        self.__digests.add(self.__digest(url))
+
+    def __contains__(self, url: str) -> bool:
+        return self.__digest(url) in self.__digests
+
+    def __len__(self) -> int:
+        return len(self.__digests)
+
+
+known_urls = KnownUrls()
+
+__all__ = ["KnownUrls", "known_urls"]
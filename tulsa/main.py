@@ -1,6 +1,9 @@
 import asyncio
 import logging
 import os
+import time
+from collections.abc import Sequence
+from typing import Any
 
 import sentry_sdk
 from apscheduler.events import (  # pyright: ignore [reportMissingTypeStubs]
@@ -10,12 +13,17 @@ from apscheduler.events import (  # pyright: ignore [reportMissingTypeStubs]
 from apscheduler.schedulers.asyncio import (  # pyright: ignore [reportMissingTypeStubs]
     AsyncIOScheduler,
 )
+from crawlee import service_locator
 from crawlee.crawlers import BasicCrawlingContext
 from dotenv import load_dotenv
 from sentry_sdk.integrations.asyncio import AsyncioIntegration
 from sentry_sdk.utils import event_from_exception
 
-from tulsa.spiders import get_spiders
+from tulsa import BaseSpider
+from tulsa.executor import shutdown_parse_executor
+from tulsa.metrics import start_metrics_server
+from tulsa.pipelines import close_pipelines, flush_pipelines
+from tulsa.spiders import SpiderEntry, get_spiders
 
 logger = logging.getLogger(__name__)
 
@@ -28,18 +36,91 @@ async def error_handler(context: BasicCrawlingContext, error: BaseException):
     _ = sentry_sdk.capture_event(event, hint)
 
 
+async def run_spider(
+    entry: SpiderEntry | BaseSpider[Any], semaphore: asyncio.Semaphore, timeout: float
+) -> tuple[float, str]:
+    """
+    Create and run a single spider in isolation, it's released when it has finished.
+
+    A failure or a stall of the spider is logged and doesn't affect the other spiders.
+    Return the wall-clock time of the spider and its line of the report.
+    """
+    name = entry.name if isinstance(entry, SpiderEntry) else entry.__class__.__name__
+    async with semaphore:
+        start = time.perf_counter()
+        report = "didn't finish"
+        try:
+            if isinstance(entry, SpiderEntry):
+                missing = entry.missing_env()
+                if missing:
+                    logger.error(f"Cannot run {name}, {', '.join(missing)} isn't set")
+                    return 0.0, f"{', '.join(missing)} isn't set"
+                spider = entry.create()
+            else:
+                spider = entry
+            _ = spider.failed_request_handler(error_handler)
+            _ = spider.error_handler(error_handler)
+            async with asyncio.timeout(timeout):
+                statistics = await spider.run()
+                report = (
+                    f"{statistics.requests_finished} finished, {statistics.requests_failed} failed"
+                    + (
+                        f", {spider.skipped_known_urls} known urls skipped"
+                        if spider.skip_known_urls
+                        else ""
+                    )
+                    + f", {spider.http_client.bytes_saved} bytes saved by the HTTP cache"
+                )
+        except TimeoutError:
+            logger.error(f"{name} didn't finish in {timeout} seconds")
+        except Exception as e:
+            logger.exception(f"{name} failed")
+            _ = sentry_sdk.capture_exception(e)
+        return time.perf_counter() - start, report
+
+
+async def run_spiders(spiders: Sequence[SpiderEntry | BaseSpider[Any]]):
+    """
+    Run all spiders concurrently.
+
+    `MAX_CONCURRENT_SPIDERS` limits how many spiders run at the same time,
+    `MAX_CONCURRENT_REQUESTS` limits how many requests are in flight across all spiders
+    and `SPIDER_TIMEOUT` (in seconds) stops a spider which takes too long.
+    """
+    semaphore = asyncio.Semaphore(int(os.getenv("MAX_CONCURRENT_SPIDERS", "8")))
+    timeout = float(os.getenv("SPIDER_TIMEOUT", "3600"))
+
+    start = time.perf_counter()
+    # The event manager is shared by all crawlers, it must outlive every spider.
+    async with service_locator.get_event_manager():
+        results = await asyncio.gather(
+            *[run_spider(spider, semaphore, timeout) for spider in spiders]
+        )
+    await flush_pipelines()
+
+    report = [f"Ran {len(spiders)} spiders in {time.perf_counter() - start:.2f}s"]
+    for spider, (elapsed, line) in sorted(
+        zip(spiders, results, strict=True), key=lambda x: x[1][0], reverse=True
+    ):
+        name = (
+            spider.name
+            if isinstance(spider, SpiderEntry)
+            else spider.__class__.__name__
+        )
+        report.append(f"{name}: {elapsed:.2f}s, {line}")
+    logger.info("\n".join(report))
+
+
 async def run_blog_spiders():
-    for spider in get_spiders(["blog"]):
-        _ = spider.failed_request_handler(error_handler)
-        _ = spider.error_handler(error_handler)
-        _ = await spider.run()
+    await run_spiders(get_spiders(["blog"]))
+
+
+async def run_feed_spiders():
+    await run_spiders(get_spiders(["feed"]))
 
 
 async def run_cve_spiders():
-    for spider in get_spiders(["cve"]):
-        _ = spider.failed_request_handler(error_handler)
-        _ = spider.error_handler(error_handler)
-        _ = await spider.run()
+    await run_spiders(get_spiders(["cve"]))
 
 
 async def main() -> None:
@@ -62,10 +143,20 @@ async def main() -> None:
 
     scheduler = AsyncIOScheduler()
     _ = scheduler.add_job(run_blog_spiders, "cron", hour="7,19", minute=30)  # pyright: ignore [reportUnknownMemberType]
+    # Only the feeds which are due are fetched
+    _ = scheduler.add_job(run_feed_spiders, "cron", minute=40)  # pyright: ignore [reportUnknownMemberType]
     _ = scheduler.add_job(run_cve_spiders, "cron", minute=20)  # pyright: ignore [reportUnknownMemberType]
     _ = scheduler.add_listener(sentry_listener, EVENT_JOB_ERROR)  # pyright: ignore [reportUnknownMemberType]
 
     scheduler.start()
-
-    while True:
-        await asyncio.sleep(1)
+    metrics_server = await start_metrics_server()
+
+    try:
+        while True:
+            await asyncio.sleep(1)
+    finally:
+        scheduler.shutdown(wait=False)
+        if metrics_server:
+            metrics_server.close()
+        await close_pipelines()
+        shutdown_parse_executor()
@@ -0,0 +1,289 @@
+import asyncio
+import bisect
+import logging
+import math
+import os
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from types import TracebackType
+from typing import ClassVar, override
+
+logger = logging.getLogger(__name__)
+
+# In seconds, from a fast local response to a slow page of a distant host
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Metric(ABC):
+    """
+    A metric of the Prometheus text format, its samples are kept by the values of its labels.
+    """
+
+    type: ClassVar[str]
+    name: str
+    help: str
+    labels: tuple[str, ...]
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+        REGISTRY.append(self)
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(labels.get(name, "") for name in self.labels)
+
+    def _labels(self, key: tuple[str, ...], extra: str = "") -> str:
+        pairs = [
+            f'{name}="{_escape(value)}"'
+            for name, value in zip(self.labels, key, strict=True)
+        ]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    @abstractmethod
+    def samples(self) -> Iterator[str]:
+        pass
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        lines += self.samples()
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    type: ClassVar[str] = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help, labels)
+        self.__values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        self.__values[key] = self.__values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self.__values.get(self._key(labels), 0)
+
+    @override
+    def samples(self) -> Iterator[str]:
+        for key, value in self.__values.items():
+            yield f"{self.name}{self._labels(key)} {_format(value)}"
+
+
+class Gauge(Metric):
+    type: ClassVar[str] = "gauge"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help, labels)
+        self.__values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        self.__values[self._key(labels)] = value
+
+    @override
+    def samples(self) -> Iterator[str]:
+        for key, value in self.__values.items():
+            yield f"{self.name}{self._labels(key)} {_format(value)}"
+
+
+class Histogram(Metric):
+    type: ClassVar[str] = "histogram"
+    buckets: tuple[float, ...]
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labels)
+        self.buckets = buckets
+        # The count of every bucket, the `+Inf` bucket last, then the sum
+        self.__values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        counts, total = self.__values.setdefault(
+            key, ([0] * (len(self.buckets) + 1), [0.0])
+        )
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def time(self, **labels: str) -> "Timer":
+        """
+        Observe the seconds which a `with` block takes.
+        """
+        return Timer(self, labels)
+
+    @override
+    def samples(self) -> Iterator[str]:
+        for key, (counts, total) in self.__values.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts, strict=True):
+                cumulative += count
+                yield (
+                    f"{self.name}_bucket{self._labels(key, f'le="{_format(bound)}"')} "
+                    + str(cumulative)
+                )
+            yield f"{self.name}_sum{self._labels(key)} {_format(total[0])}"
+            yield f"{self.name}_count{self._labels(key)} {cumulative}"
+
+
+class Timer:
+    def __init__(self, histogram: Histogram, labels: dict[str, str]) -> None:
+        self.__histogram = histogram
+        self.__labels = labels
+        self.__start = 0.0
+
+    def __enter__(self) -> None:
+        self.__start = time.perf_counter()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.__histogram.observe(time.perf_counter() - self.__start, **self.__labels)
+
+
+REGISTRY: list[Metric] = []
+
+
+def render() -> str:
+    """
+    Every metric in the Prometheus text exposition format.
+    """
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
+
+
+# The metrics of the crawls, the spiders and the pipelines update them
+http_requests = Counter(
+    "tulsa_http_requests_total",
+    "HTTP requests sent to the hosts",
+    ("spider", "host", "status"),
+)
+http_request_duration = Histogram(
+    "tulsa_http_request_duration_seconds",
+    "Time from sending an HTTP request to its response, waits of the limiters included",
+    ("spider", "host"),
+)
+http_response_bytes = Counter(
+    "tulsa_http_response_bytes_total",
+    "Bytes of the response bodies received from the hosts",
+    ("spider", "host"),
+)
+http_cache_bytes_saved = Counter(
+    "tulsa_http_cache_bytes_saved_total",
+    "Bytes of the response bodies served by the HTTP cache",
+    ("spider",),
+)
+spider_runs = Counter("tulsa_spider_runs_total", "Runs of the spiders", ("spider",))
+spider_run_duration = Histogram(
+    "tulsa_spider_run_duration_seconds",
+    "Time of a spider run",
+    ("spider",),
+    (1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600),
+)
+spider_requests = Counter(
+    "tulsa_spider_requests_total",
+    "Requests handled by the spiders, by their result",
+    ("spider", "result"),
+)
+spider_retries = Counter(
+    "tulsa_spider_retries_total", "Retries of the spider requests", ("spider",)
+)
+items_yielded = Counter(
+    "tulsa_items_total", "Items yielded by the request handlers", ("spider",)
+)
+pipeline_queue_depth = Gauge(
+    "tulsa_pipeline_queue_depth",
+    "Responses waiting for the pipeline workers",
+    ("spider",),
+)
+pipeline_queue_wait = Histogram(
+    "tulsa_pipeline_queue_wait_seconds",
+    "Time a response waits in the queue for a pipeline worker",
+    ("spider",),
+)
+pipeline_duration = Histogram(
+    "tulsa_pipeline_duration_seconds",
+    "Time of a pipeline to handle the items of a response",
+    ("pipeline",),
+)
+pipeline_items_dropped = Counter(
+    "tulsa_pipeline_items_dropped_total",
+    "Items dropped by the pipelines",
+    ("spider", "pipeline"),
+)
+mongo_write_duration = Histogram(
+    "tulsa_mongo_write_duration_seconds",
+    "Time of the writes to MongoDB",
+    ("collection",),
+)
+mongo_documents = Counter(
+    "tulsa_mongo_documents_written_total",
+    "Documents upserted to MongoDB",
+    ("collection",),
+)
+
+
+async def __handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        request = await reader.readuntil(b"\r\n\r\n")
+        path = request.split(b" ", 2)[1] if request.count(b" ") >= 2 else b""
+        if path.split(b"?")[0] == b"/metrics":
+            status, body = "200 OK", render().encode()
+        else:
+            status, body = "404 Not Found", b"Not Found\n"
+        headers = (
+            f"HTTP/1.1 {status}\r\n"
+            + "Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+            + f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n"
+        )
+        writer.write(headers.encode() + body)
+        await writer.drain()
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, OSError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_metrics_server() -> asyncio.Server | None:
+    """
+    Serve the metrics at `/metrics` on `METRICS_PORT`, `None` when it isn't set.
+    `METRICS_HOST` is `127.0.0.1` by default, the metrics are only served locally.
+    """
+    port = int(os.getenv("METRICS_PORT") or "0")
+    if not port:
+        return None
+    host = os.getenv("METRICS_HOST", "127.0.0.1")
+    server = await asyncio.start_server(__handle, host, port)
+    logger.info(f"Serving the metrics at http://{host}:{port}/metrics")
+    return server
+
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "Timer",
+    "render",
+    "start_metrics_server",
+]
@@ -33,7 +33,9 @@ class Blog(BaseModel):
         raise ValueError("Not a URL")
 
     @staticmethod
-    def from_html_selector(selector: Selector) -> Blog | None:
+    def from_html_selector(
+        selector: Selector, category: Category = Category.Generic
+    ) -> Blog | None:
         title = (
             selector.xpath('//head/meta[@property="og:title"]/@content').get()
             or selector.xpath('//head/meta[@name="og:title"]/@content').get()
@@ -71,22 +73,23 @@ class Blog(BaseModel):
             ).get()
         )
         author = selector.xpath('//head/meta[@name="author"]/@content').get()
-        item = Blog(url=url, title=title)
-        if description:
-            item.description = description
-        if thumbnail:
-            item.thumbnail = thumbnail
-        if author:
-            item.author = author
         if published:
             published = parse_date(published)
-            if published:
-                item.published = datetime.fromtimestamp(mktime(published))
 
-        return item
+        return Blog(
+            url=url,
+            title=title,
+            category=category,
+            description=description or None,
+            thumbnail=thumbnail or None,
+            author=author or None,
+            published=datetime.fromtimestamp(mktime(published)) if published else None,
+        )
 
     @staticmethod
-    def from_json_schema(obj: dict[str, Any]) -> Blog | None:
+    def from_json_schema(
+        obj: dict[str, Any], category: Category = Category.Generic
+    ) -> Blog | None:
         """
         Current supports "SocialMediaPosting", "Article"
         """
@@ -126,14 +129,12 @@ class Blog(BaseModel):
         if not url or not title:
             return None
 
-        item = Blog(url=url, title=title)
-        if description:
-            item.description = description
-        if author:
-            item.author = author
-        if thumbnail:
-            item.thumbnail = thumbnail
-        if published:
-            item.published = datetime.fromtimestamp(mktime(published))
-
-        return item
+        return Blog(
+            url=url,
+            title=title,
+            category=category,
+            description=description or None,
+            author=author or None,
+            thumbnail=thumbnail or None,
+            published=datetime.fromtimestamp(mktime(published)) if published else None,
+        )
@@ -33,6 +33,30 @@ class Pipeline(ABC):
         """
         ...
 
+    async def handle_items(self, items: list[BaseModel]) -> list[BaseModel]:
+        """
+        Handle the items of a response, and return the items to keep.
+
+        Override it to share the work between the items, e.g. one database round trip.
+        By default, every item goes through `handle_item`.
+        """
+        result: list[BaseModel] = []
+        for item in items:
+            handled = await self.handle_item(item)
+            if handled:
+                result.append(handled)
+        return result
+
+    async def flush(self) -> None:
+        """
+        Write out the items the pipeline has buffered.
+        """
+
+    async def close(self) -> None:
+        """
+        Release the resources held by the pipeline, it's called once when the process shuts down.
+        """
+
 
 def load_all_pipelines() -> list[Pipeline]:
     """
@@ -54,3 +78,55 @@ def load_all_pipelines() -> list[Pipeline]:
                     )
 
     return ret
+
+
+__pipelines: list[Pipeline] | None = None
+
+
+def get_pipelines() -> list[Pipeline]:
+    """
+    Return the enabled pipelines sorted by priority.
+
+    The pipelines are created once and shared by all spiders of the process.
+    """
+    global __pipelines
+    if __pipelines is None:
+        # `filter` is shadowed by the `tulsa.pipelines.filter` module here
+        __pipelines = sorted(
+            [p for p in load_all_pipelines() if p.enabled],
+            key=lambda p: p.priority,
+        )
+    return __pipelines
+
+
+async def flush_pipelines() -> None:
+    """
+    Flush the shared pipelines.
+    """
+    if __pipelines is None:
+        return
+    for pipeline in __pipelines:
+        try:
+            await pipeline.flush()
+        except Exception:
+            logging.getLogger(__name__).exception(
+                f"Cannot flush '{pipeline.__class__.__module__}.{pipeline.__class__.__name__}' pipeline"
+            )
+
+
+async def close_pipelines() -> None:
+    """
+    Close the shared pipelines, the next `get_pipelines()` call creates them again.
+    """
+    global __pipelines
+    if __pipelines is None:
+        return
+    pipelines, __pipelines = __pipelines, None
+    for pipeline in pipelines:
+        try:
+            await pipeline.close()
+        # The process is shutting down, a pipeline which fails mustn't leave the others open
+        except Exception:
+            logging.getLogger(__name__).exception(
+                f"Cannot close '{pipeline.__class__.__module__}.{pipeline.__class__.__name__}' pipeline"
+            )
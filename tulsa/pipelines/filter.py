@@ -1,27 +1,64 @@
 import logging
+import os
 import re
+import tomllib
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import cast, override
 
 from pydantic import BaseModel
 
-from tulsa.helpers import remove_url_query
-from tulsa.models import Blog, HacktivityBounty
+from tulsa.models import Blog, Cve, HacktivityBounty
 from tulsa.pipelines import Pipeline
+from tulsa.urls import canonicalize_url
+
+# In seconds
+MAX_AGE = 60 * 60 * 24 * 7
+
+# The boilerplate rules of `DescriptionFilter`, next to `feeds.toml`
+FILTERS_FILE = os.path.join(os.path.dirname(__file__), "..", "..", "filters.toml")
+# Joins the descriptions of a batch, on its own line between the descriptions
+_SEPARATOR = "\n\x1e\n"
+
+
+@dataclass(frozen=True)
+class DescriptionRule:
+    pattern: re.Pattern[str]
+    replace: str
+    # Lowercase text which every match has
+    contains: str
+
+
+def load_description_rules(file_path: str = FILTERS_FILE) -> list[DescriptionRule]:
+    """
+    Load the `description` rules of `file_path`.
+    """
+    with open(file_path, "rb") as f:
+        rules = tomllib.load(f).get("description", [])
+    return [
+        DescriptionRule(
+            re.compile(rule["pattern"], flags=re.MULTILINE | re.IGNORECASE),
+            rule.get("replace", ""),
+            rule.get("contains", "").lower(),
+        )
+        for rule in rules
+    ]
 
 
 class DescriptionFilter(Pipeline):
+    """
+    Remove the boilerplate of the descriptions, the rules are in `filters.toml`.
+
+    Most descriptions don't have any boilerplate. The description is lowercased once,
+    and a rule only runs its pattern when the description has its `contains` text.
+    """
+
     logger: logging.Logger
+    rules: list[DescriptionRule]
 
     def __init__(self) -> None:
         self.logger = logging.getLogger(__name__)
-        # Optimize regex compilation, not sure it's necessary!
-        self.__re1 = re.compile(
-            r"^The post .+ (first|appeared) on .+$", flags=re.M | re.I
-        )
-        self.__re2 = re.compile(r"… .+Read More »$", flags=re.M | re.I)
-        self.__re3 = re.compile(r"^Read More ».+", flags=re.M | re.I)
-        self.__re4 = re.compile(r"Continue reading on .+$", flags=re.M | re.I)
+        self.rules = load_description_rules()
 
     @property
     @override
@@ -33,27 +70,59 @@ class DescriptionFilter(Pipeline):
     def priority(self) -> int:
         return 1
 
+    @staticmethod
+    def __squeeze(description: str) -> str:
+        while "\n\n\n" in description:
+            description = description.replace("\n\n\n", "\n\n")
+        return description.strip()
+
+    def __apply(self, description: str) -> str:
+        lower = description.lower()
+        for rule in self.rules:
+            if rule.contains in lower:
+                description = rule.pattern.sub(rule.replace, description)
+        return description
+
+    def clean(self, description: str) -> str:
+        return self.__squeeze(self.__apply(description))
+
+    @override
+    async def handle_items(self, items: list[BaseModel]) -> list[BaseModel]:
+        blogs = [
+            cast(Blog, item)
+            for item in items
+            if item.__class__ is Blog
+            and cast(Blog, item).description
+            and "\x1e" not in cast(str, cast(Blog, item).description)
+        ]
+        if blogs:
+            # Every rule runs once over the descriptions of the batch
+            descriptions = self.__apply(
+                _SEPARATOR.join(cast(str, blog.description) for blog in blogs)
+            ).split(_SEPARATOR)
+            if len(descriptions) == len(blogs):
+                for blog, description in zip(blogs, descriptions, strict=True):
+                    blog.description = self.__squeeze(description)
+            else:
+                # A rule matched across the separator, the descriptions are cleaned one by one
+                blogs = []
+        cleaned = {id(blog) for blog in blogs}
+        for item in items:
+            if id(item) not in cleaned:
+                _ = await self.handle_item(item)
+        return items
+
     @override
     async def handle_item(self, item: BaseModel) -> BaseModel | None:
         if item.__class__ is Blog:
-            item = cast(Blog, item)
-            if item.description and len(item.description) > 0:
-                item.description = self.__re1.sub("", item.description)
-                item.description = self.__re2.sub("… ", item.description)
-                item.description = self.__re3.sub("", item.description)
-                item.description = self.__re4.sub("", item.description)
-        try:
-            if item.__getattribute__("description"):
-                description = item.__getattribute__("description")
-                for _ in range(5):
-                    description = description.replace("\n\n\n", "\n\n")
-                description = description.strip()
-                item.__setattr__("description", description)
-        except Exception:
-            pass
-        # else:
-        #     self.logger.warning(f"Unsupport item type: {item.__class__}")
-        #     pass
+            blog = cast(Blog, item)
+            if blog.description:
+                # Every assignment to a Blog is validated, the description is set once
+                blog.description = self.clean(blog.description)
+        elif item.__class__ is Cve or item.__class__ is HacktivityBounty:
+            other = cast(Cve | HacktivityBounty, item)
+            if other.description:
+                other.description = self.__squeeze(other.description)
         return item
 
 
@@ -72,9 +141,7 @@ class UrlDeduplication(Pipeline):
     async def handle_item(self, item: BaseModel) -> BaseModel | None:
         if item.__class__ is Blog or item.__class__ is HacktivityBounty:
             url = cast(str, item.__getattribute__("url"))
-            url = url.rstrip("/")
-            url = remove_url_query(url)
-            item.__setattr__("url", url)
+            item.__setattr__("url", canonicalize_url(url))
 
         return item
 
@@ -99,9 +166,6 @@ class OutOfDateItem(Pipeline):
         if item.__class__ is Blog or item.__class__ is HacktivityBounty:
             published = cast(datetime | None, item.__getattribute__("published"))
             if published:
-                if (
-                    datetime.now(UTC).timestamp() - published.timestamp()
-                    > 60 * 60 * 24 * 7
-                ):
+                if datetime.now(UTC).timestamp() - published.timestamp() > MAX_AGE:
                     return None
         return item
@@ -1,16 +1,162 @@
+import asyncio
 import logging
 import os
+import time
+from collections.abc import AsyncIterator
 from typing import Any, cast, override
 
 from pydantic import BaseModel
-from pymongo import AsyncMongoClient
+from pymongo import AsyncMongoClient, UpdateOne
 from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.errors import OperationFailure, PyMongoError
 
+from tulsa.known_urls import known_urls
+from tulsa.metrics import mongo_documents, mongo_write_duration
 from tulsa.models import Blog, Category, Cve, HacktivityBounty
 from tulsa.pipelines import Pipeline
 
 
+def merge_blog(current: dict[str, Any], blog: dict[str, Any]) -> dict[str, Any]:
+    """
+    Return the fields of the `current` blog to update with a `blog` which has the same url.
+    """
+    changes: dict[str, Any] = {}
+    # Update missing fields from items have the same url
+    if len(current.get("description") or "") < len(blog.get("description") or ""):
+        changes["description"] = blog["description"]
+    # Override category
+    if (
+        current.get("category") == Category.Generic
+        and blog.get("category") != Category.Generic
+    ):
+        changes["category"] = blog["category"]
+    return changes
+
+
+def merge_cve(current: dict[str, Any], cve: dict[str, Any]) -> dict[str, Any]:
+    """
+    Return the fields of the `current` CVE to update with a `cve` which has the same id.
+    """
+    changes: dict[str, Any] = {}
+    # The cve is collected from different sources
+    # but some of sources don't have enough CVE information
+    # we do this to fullfill the missing fields
+    # The first source is always NIST
+    # then the 2nd, 3rd,... source will fill the remain fields
+    if (
+        current.get("score", 0) == 0
+        and not current.get("sent", False)
+        and cve.get("score", 0) > 0
+    ):
+        changes["score"] = cve["score"]
+    current_description = current.get("description") or ""
+    description = cve.get("description") or ""
+    # We would prefer the shorter description
+    # NIST is ofter better at this
+    if (
+        len(description) < len(current_description)
+        and len(description) > 0
+        and not current.get("sent", False)
+    ):
+        changes["description"] = description
+    return changes
+
+
+def blog_update(blog: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Return an update pipeline which inserts the `blog`, or merges it into the stored blog
+    with the same url following the `merge_blog` rules.
+    """
+    rules: dict[str, Any] = {}
+    description = blog.get("description") or ""
+    if len(description) > 0:
+        rules["description"] = {
+            "$cond": [
+                {
+                    "$lt": [
+                        {"$strLenCP": {"$ifNull": ["$description", ""]}},
+                        len(description),
+                    ]
+                },
+                {"$literal": description},
+                "$description",
+            ]
+        }
+    if blog.get("category") != Category.Generic:
+        rules["category"] = {
+            "$cond": [
+                {"$eq": ["$category", Category.Generic.value]},
+                {"$literal": blog["category"]},
+                "$category",
+            ]
+        }
+    return __insert_stages(blog, rules)
+
+
+def cve_update(cve: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Return an update pipeline which inserts the `cve`, or merges it into the stored CVE
+    with the same id following the `merge_cve` rules.
+    """
+    rules: dict[str, Any] = {}
+    if cve.get("score", 0) > 0:
+        rules["score"] = {
+            "$cond": [
+                {"$and": [{"$eq": ["$score", 0]}, {"$ne": ["$sent", True]}]},
+                {"$literal": cve["score"]},
+                "$score",
+            ]
+        }
+    description = cve.get("description") or ""
+    if len(description) > 0:
+        rules["description"] = {
+            "$cond": [
+                {
+                    "$and": [
+                        {
+                            "$lt": [
+                                len(description),
+                                {"$strLenCP": {"$ifNull": ["$description", ""]}},
+                            ]
+                        },
+                        {"$ne": ["$sent", True]},
+                    ]
+                },
+                {"$literal": description},
+                "$description",
+            ]
+        }
+    return __insert_stages(cve, rules)
+
+
+def __insert_stages(
+    document: dict[str, Any], rules: dict[str, Any]
+) -> list[dict[str, Any]]:
+    # A new document only has the fields of the query, the stored fields always win
+    # so the first stage only fills the fields of a new document.
+    # Values are wrapped in `$literal`, a title starting with `$` isn't a field path.
+    stages: list[dict[str, Any]] = [
+        {"$replaceWith": {"$mergeObjects": [{"$literal": document}, "$$ROOT"]}}
+    ]
+    if rules:
+        stages.append({"$set": rules})
+    return stages
+
+
 class Mongodb(Pipeline):
+    """
+    Store items in MongoDB.
+
+    Every item is written with a single atomic upsert, so it doesn't need
+    transactions and works with a standalone server.
+
+    The items of a response are written together with one bulk write per collection.
+    Set `MONGODB_BATCH_SIZE` to buffer the items of several responses and write them in batches.
+    A batch is written when it's full or `MONGODB_FLUSH_INTERVAL` seconds after its first item.
+    The items of a response are only handled once their batch is written, so a failed write
+    fails them too. Raise `PIPELINE_WORKERS` for more responses to fill a batch.
+    """
+
     logger: logging.Logger
 
     def __init__(self) -> None:
@@ -18,8 +164,20 @@ class Mongodb(Pipeline):
         url = os.getenv("MONGODB_URL")
         if not url:
             raise ValueError("MONGODB_URL environment variable is not set")
-        self.__client: AsyncMongoClient[Any] = AsyncMongoClient(url)
-        self.__db = self.__client.get_database("tulsa")
+        # The pipeline is shared by all spiders, so is the connection pool
+        self.__client: AsyncMongoClient[Any] = AsyncMongoClient(
+            url, maxPoolSize=int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+        )
+        self.__db = self.__client.get_database(os.getenv("MONGODB_DATABASE", "tulsa"))
+        self.__batch_size = int(os.getenv("MONGODB_BATCH_SIZE", "0"))
+        self.__flush_interval = float(os.getenv("MONGODB_FLUSH_INTERVAL", "5"))
+        self.__buffer: list[BaseModel] = []
+        # Resolved once the buffered items are written
+        self.__written: list[asyncio.Future[None]] = []
+        self.__flush_lock = asyncio.Lock()
+        self.__flush_task: asyncio.Task[None] | None = None
+        self.__indexed = False
+        known_urls.set_loader(self.stored_urls)
 
     @property
     @override
@@ -31,88 +189,196 @@ class Mongodb(Pipeline):
     def priority(self) -> int:
         return 9999
 
-    async def handle_blog(self, blog: Blog):
+    @override
+    async def close(self) -> None:
+        await self.flush()
+        await self.__client.close()
+
+    async def stored_urls(self) -> AsyncIterator[str]:
         collection: AsyncCollection[Any] = self.__db["blog"]
+        async for result in collection.find({}, {"url": 1, "_id": 0}):
+            yield result["url"]
 
-        async with self.__client.start_session() as session:
-            async with await session.start_transaction():
-                result = await collection.find_one({"url": blog.url})
-                if not result:
-                    _ = await collection.insert_one(blog.model_dump())
-                else:
-                    # Update missing fields from items have the same url
-                    current_blog = Blog.model_validate(result)
-                    current_des = current_blog.description or ""
-                    des = blog.description or ""
-                    if len(current_des) < len(des):
-                        _ = await collection.update_one(
-                            {"url": current_blog.url}, {"$set": {"description": des}}
-                        )
-                    # Override category
-                    if (
-                        current_blog.category == Category.Generic
-                        and blog.category != Category.Generic
-                    ):
-                        _ = await collection.update_one(
-                            {"url": current_blog.url},
-                            {"$set": {"category": blog.category}},
-                        )
+    async def ensure_indexes(self) -> None:
+        """
+        Upserts look items up by `url` and `id`, they shouldn't scan the collections.
+        The indexes are unique, so concurrent upserts of the same item can't insert it twice.
+        A collection which already has duplicates can't get its index, it's logged
+        and the items are still written. A failure to reach the server tries again
+        with the next items.
+        """
+        if self.__indexed:
+            return
+        for collection, key in (("blog", "url"), ("cve", "id")):
+            try:
+                _ = await self.__db[collection].create_index(key, unique=True)
+            except OperationFailure:
+                self.logger.exception(
+                    f"Cannot create the unique index of '{collection}' on '{key}', "
+                    + "remove its duplicates, or its index which isn't unique, to create it"
+                )
+        self.__indexed = True
 
-    async def handle_hacktivity_bounty(self, item: HacktivityBounty):
+    async def handle_blog(self, blog: Blog):
         collection: AsyncCollection[Any] = self.__db["blog"]
+        with mongo_write_duration.time(collection="blog"):
+            _ = await collection.update_one(
+                {"url": blog.url}, blog_update(blog.model_dump()), upsert=True
+            )
+        mongo_documents.inc(collection="blog")
+        known_urls.add(blog.url)
 
-        async with self.__client.start_session() as session:
-            async with await session.start_transaction():
-                if not await collection.find_one({"url": item.url}):
-                    _ = await collection.insert_one(item.model_dump())
+    async def handle_hacktivity_bounty(self, item: HacktivityBounty):
+        collection: AsyncCollection[Any] = self.__db["blog"]
+        with mongo_write_duration.time(collection="blog"):
+            _ = await collection.update_one(
+                {"url": item.url}, {"$setOnInsert": item.model_dump()}, upsert=True
+            )
+        mongo_documents.inc(collection="blog")
+        known_urls.add(item.url)
 
     async def handle_cve(self, cve: Cve):
         collection: AsyncCollection[Any] = self.__db["cve"]
+        with mongo_write_duration.time(collection="cve"):
+            _ = await collection.update_one(
+                {"id": cve.id}, cve_update(cve.model_dump()), upsert=True
+            )
+        mongo_documents.inc(collection="cve")
 
-        async with self.__client.start_session() as session:
-            async with await session.start_transaction():
-                result = await collection.find_one({"id": cve.id})
-
-                if not result:
-                    _ = await collection.insert_one(cve.model_dump())
-                else:
-                    current_cve = Cve.model_validate(result)
-                    # The cve is collected from different sources
-                    # but some of sources don't have enough CVE information
-                    # we do this to fullfill the missing fields
-                    # The first source is always NIST
-                    # then the 2nd, 3rd,... source will fill the remain fields
-                    if (
-                        current_cve.score == 0
-                        and not current_cve.sent
-                        and cve.score > 0
-                    ):
-                        _ = await collection.update_one(
-                            {"id": current_cve.id}, {"$set": {"score": cve.score}}
-                        )
-                    current_description = current_cve.description or ""
-                    description = cve.description or ""
-                    # We would prefer the shorter description
-                    # NIST is ofter better at this
-                    if (
-                        len(description) < len(current_description)
-                        and len(description) > 0
-                        and current_cve.sent is False
-                    ):
-                        _ = await collection.update_one(
-                            {"id": current_cve.id},
-                            {"$set": {"description": description}},
-                        )
+    async def write_batch(
+        self,
+        collection: AsyncCollection[Any],
+        key: str,
+        items: list[BaseModel],
+    ) -> None:
+        """
+        Write `items` of the same collection with one unordered bulk write.
+        Items with the same key are merged first, with the same rules as the stored items.
+        """
+        documents: dict[str, tuple[type[BaseModel], dict[str, Any]]] = {}
+        for item in items:
+            document = item.model_dump()
+            if document[key] not in documents:
+                documents[document[key]] = (item.__class__, document)
+                continue
+            current = documents[document[key]][1]
+            if item.__class__ is Blog:
+                current.update(merge_blog(current, document))
+            elif item.__class__ is Cve:
+                current.update(merge_cve(current, document))
+
+        operations: list[UpdateOne] = []
+        for value, (kind, document) in documents.items():
+            if kind is Blog:
+                update = blog_update(document)
+            elif kind is Cve:
+                update = cve_update(document)
+            else:
+                update = {"$setOnInsert": document}
+            operations.append(UpdateOne({key: value}, update, upsert=True))
+
+        with mongo_write_duration.time(collection=collection.name):
+            _ = await collection.bulk_write(operations, ordered=False)
+        mongo_documents.inc(len(operations), collection=collection.name)
+        if key == "url":
+            for url in documents:
+                known_urls.add(url)
+
+    async def write_items(self, items: list[BaseModel]) -> None:
+        """
+        Write `items` with one bulk write per collection.
+        """
+        blogs = [
+            item
+            for item in items
+            if item.__class__ is Blog or item.__class__ is HacktivityBounty
+        ]
+        cves = [item for item in items if item.__class__ is Cve]
+        if blogs:
+            await self.write_batch(self.__db["blog"], "url", blogs)
+        if cves:
+            await self.write_batch(self.__db["cve"], "id", cves)
+
+    @override
+    async def flush(self) -> None:
+        async with self.__flush_lock:
+            if not self.__buffer:
+                return
+            items, self.__buffer = self.__buffer, []
+            written, self.__written = self.__written, []
+            start = time.perf_counter()
+            try:
+                await self.write_items(items)
+            except Exception as e:
+                for future in written:
+                    future.set_exception(e)
+                raise
+            for future in written:
+                future.set_result(None)
+            self.logger.info(
+                f"Flushed {len(items)} items in {time.perf_counter() - start:.3f}s"
+            )
+
+    async def __buffer_items(self, items: list[BaseModel]) -> None:
+        written = asyncio.get_running_loop().create_future()
+        self.__buffer.extend(items)
+        self.__written.append(written)
+        if len(self.__buffer) >= self.__batch_size:
+            try:
+                await self.flush()
+            except Exception:
+                # Every response of the batch fails, this one when its items are awaited
+                if not written.done():
+                    raise
+        elif self.__flush_task is None:
+            self.__flush_task = asyncio.create_task(self.__flush_later())
+        await written
+
+    async def __flush_later(self) -> None:
+        await asyncio.sleep(self.__flush_interval)
+        self.__flush_task = None
+        try:
+            await self.flush()
+        except PyMongoError:
+            self.logger.exception("Cannot flush the buffered items")
+
+    def __is_supported(self, item: BaseModel) -> bool:
+        if (
+            item.__class__ is not Blog
+            and item.__class__ is not HacktivityBounty
+            and item.__class__ is not Cve
+        ):
+            self.logger.error(f"Doesn't support item type: {item.__class__}")
+            return False
+        return True
+
+    @override
+    async def handle_items(self, items: list[BaseModel]) -> list[BaseModel]:
+        supported = [item for item in items if self.__is_supported(item)]
+        if not supported:
+            return items
+
+        await self.ensure_indexes()
+        if self.__batch_size > 1:
+            await self.__buffer_items(supported)
+        else:
+            await self.write_items(supported)
+
+        return items
 
     @override
     async def handle_item(self, item: BaseModel) -> BaseModel | None:
-        if item.__class__ is Blog:
+        if not self.__is_supported(item):
+            return item
+
+        await self.ensure_indexes()
+        if self.__batch_size > 1:
+            await self.__buffer_items([item])
+        elif item.__class__ is Blog:
             await self.handle_blog(cast(Blog, item))
         elif item.__class__ is HacktivityBounty:
             await self.handle_hacktivity_bounty(cast(HacktivityBounty, item))
-        elif item.__class__ is Cve:
-            await self.handle_cve(cast(Cve, item))
         else:
-            self.logger.error(f"Doesn't support item type: {item.__class__}")
+            await self.handle_cve(cast(Cve, item))
 
         return item
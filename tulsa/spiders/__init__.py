@@ -1,52 +1,27 @@
-import importlib
-import inspect
+import functools
 import logging
-import os
-import pkgutil
 import tomllib
 from typing import Literal, TypedDict
 
 from crawlee import Request
 
-from tulsa import Spider
 from tulsa.models import Category
 
 from .blogspot import BlogspotSpider
+from .registry import SpiderEntry, spider_entries
 from .rss import RssProperties, RssSpider
 from .spotify import SpotifySpider
 from .youtube import YoutubeSpider
 
 
-def load_spiders(
-    folder: Literal["blog", "cve", "bounty_platform"],
-) -> list[Spider]:
+def load_spiders_from_feeds(
+    file_path: str = "feeds.toml",
+    names: tuple[str, ...] = ("rss", "blogspot", "youtube", "spotify"),
+) -> list[SpiderEntry]:
     """
-    Automatically dynamic load all spiders in `folder`.
+    Load the spiders `names` with the feeds of `file_path`, they're created when they run.
     """
 
-    ret: list[Spider] = []
-    for _, module_name, _ in pkgutil.iter_modules(
-        [os.path.join(__path__[0], folder)],
-        f"tulsa.spiders.{folder.replace('/', '.')}.",
-    ):
-        module = importlib.import_module(module_name)
-        for class_name, class_obj in inspect.getmembers(module, inspect.isclass):
-            if (
-                issubclass(class_obj, Spider)
-                and class_name != "Spider"
-                and class_name != "HtmlSpider"
-            ):
-                try:
-                    ret.append(class_obj())  # pyright: ignore [reportCallIssue]
-                except Exception as e:
-                    logging.getLogger(__name__).error(
-                        f"Cannot load '{class_obj.__module__}.{class_name}' pipeline: {e}"
-                    )
-
-    return ret
-
-
-def load_spiders_from_feeds(file_path: str = "feeds.toml") -> list[Spider]:
     class Feeds(TypedDict):
         rss: list[Request]
         blogspot: list[Request]
@@ -54,10 +29,12 @@ def load_spiders_from_feeds(file_path: str = "feeds.toml") -> list[Spider]:
         spotify: list[tuple[str, Category]]
 
     rss_feeds: Feeds = {"rss": [], "blogspot": [], "youtube": [], "spotify": []}
-    spiders: list[Spider] = []
+    spiders: list[SpiderEntry] = []
     with open(file_path, "rb") as f:
         feeds = tomllib.load(f)
         for spider_name in feeds.keys():
+            if spider_name not in names:
+                continue
             match spider_name:
                 case "rss" | "blogspot":
                     for entry in feeds[spider_name]:
@@ -86,35 +63,51 @@ def load_spiders_from_feeds(file_path: str = "feeds.toml") -> list[Spider]:
                     logging.getLogger(__name__).warning(
                         f"Unknown spider's name: {spider_name}"
                     )
-    if len(rss_feeds["blogspot"]) > 0:
-        spiders.append(BlogspotSpider(rss_feeds["blogspot"]))
-    if len(rss_feeds["rss"]) > 0:
-        spiders.append(RssSpider(rss_feeds["rss"]))
-    if len(rss_feeds["spotify"]) > 0:
-        spiders.append(SpotifySpider(rss_feeds["spotify"]))
-    if len(rss_feeds["youtube"]) > 0:
-        spiders.append(YoutubeSpider(rss_feeds["youtube"]))
+    for spider_class, feeds_of_spider, env in (
+        (BlogspotSpider, rss_feeds["blogspot"], ("BLOGSPOT_API_TOKEN",)),
+        (RssSpider, rss_feeds["rss"], ()),
+        (SpotifySpider, rss_feeds["spotify"], ("SPOTIFY_API_TOKEN",)),
+        (YoutubeSpider, rss_feeds["youtube"], ("YOUTUBE_API_TOKEN",)),
+    ):
+        if len(feeds_of_spider) > 0:
+            spiders.append(
+                SpiderEntry(
+                    spider_class.__name__,
+                    spider_class.__module__,
+                    env,
+                    functools.partial(spider_class, feeds_of_spider),
+                )
+            )
 
     return spiders
 
 
 def get_spiders(
-    types: list[Literal["blog", "cve"]],
-) -> list[Spider]:
-    result: list[Spider] = []
+    types: list[Literal["blog", "cve", "feed"]],
+) -> list[SpiderEntry]:
+    """
+    The "feed" spiders fetch every feed on its own schedule, see `tulsa.feed_schedule`,
+    so they run more often than the other "blog" spiders.
+
+    The spiders are only imported and created when they run, see `SpiderEntry`.
+    """
+    result: list[SpiderEntry] = []
     for kind in set(types):
         match kind:
+            case "feed":
+                result += load_spiders_from_feeds(names=("rss", "blogspot"))
             case "blog":
-                result += load_spiders_from_feeds()
-                result += load_spiders("blog")
-                result += load_spiders("bounty_platform")
+                result += load_spiders_from_feeds(names=("youtube", "spotify"))
+                result += spider_entries("blog")
+                result += spider_entries("bounty_platform")
             case "cve":
-                result += load_spiders("cve")
+                result += spider_entries("cve")
     return result
 
 
 __all__ = [
     "get_spiders",
+    "SpiderEntry",
     "BlogspotSpider",
     "RssSpider",
     "SpotifySpider",
@@ -23,17 +23,14 @@ async def default_request_handler(
         title = cast(str, entry.xpath(".//h2/a/text()").get()).strip()
         url = cast(str, entry.xpath(".//h2/a/@href").get()).strip()
         published = cast(str, entry.xpath(".//time/text()").get()).strip()
-        item = Blog(
+        published = parse_date(published)
+
+        yield Blog(
             url=urljoin(context.request.loaded_url or context.request.url, url),
             title=title,
             category=Category.Generic,
+            published=datetime.fromtimestamp(mktime(published)) if published else None,
         )
-        published = parse_date(published)
-        if published:
-            published = datetime.fromtimestamp(mktime(published))
-            item.published = published
-
-        yield item
 
 
 class Verses21Spider(Spider):
@@ -33,17 +33,18 @@ async def default_request_handler(context: ParselCrawlingContext):
         thumbnail = entry.xpath(".//img/@data-src").get()
         published = entry.xpath(".//time/@datetime").get()
 
-        item = Blog(url=url, title=title)
-        if description:
-            item.description = BeautifulSoup(description, "lxml").text.strip()
-        if thumbnail:
-            item.thumbnail = thumbnail
         if published:
             published = parse_date(published)
-            if published:
-                item.published = datetime.fromtimestamp(mktime(published))
 
-        yield item
+        yield Blog(
+            url=url,
+            title=title,
+            description=(
+                BeautifulSoup(description, "lxml").text.strip() if description else None
+            ),
+            thumbnail=thumbnail or None,
+            published=datetime.fromtimestamp(mktime(published)) if published else None,
+        )
 
 
 class AfineComSpider(Spider):
@@ -24,12 +24,12 @@ async def default_request_handler(context: ParselCrawlingContext):
         description = entry.get("description")
         published = datetime.fromtimestamp(int(entry["publishTime"]) / 1000)
 
-        item = Blog(url=url, title=title)
-        item.published = published
-        if description:
-            item.description = description
-
-        yield item
+        yield Blog(
+            url=url,
+            title=title,
+            published=published,
+            description=description or None,
+        )
 
 
 class AkamaiComSpider(Spider):
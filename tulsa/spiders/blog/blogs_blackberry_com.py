@@ -49,16 +49,19 @@ async def default_request_handler(context: ParselCrawlingContext):
         description = entry["excerpt"]
         thumbnail = entry["thumbnail"]
 
-        item = Blog(url=url, title=title)
-        item.description = description
-        item.published = datetime.fromtimestamp(
-            mktime(parse_date(f"{year}-{month}-{day}T{hour}:{minute}:{second}+00:00"))  # pyright: ignore [reportArgumentType]
+        yield Blog(
+            url=url,
+            title=title,
+            description=description,
+            published=datetime.fromtimestamp(
+                mktime(
+                    parse_date(f"{year}-{month}-{day}T{hour}:{minute}:{second}+00:00")  # pyright: ignore [reportArgumentType]
+                )
+            ),
+            thumbnail=urljoin(
+                context.request.loaded_url or context.request.url, thumbnail
+            ),
         )
-        item.thumbnail = urljoin(
-            context.request.loaded_url or context.request.url, thumbnail
-        )
-
-        yield item
 
 
 class BlogsBlackberryComSpider(Spider):
@@ -34,19 +34,20 @@ async def default_request_handler(context: ParselCrawlingContext):
         thumbnail = entry.xpath(".//img/@src").get()
         published = entry.xpath(".//time/@datetime").get()
 
-        item = Blog(url=url, title=title)
-        if description:
-            item.description = description.strip()
-        if thumbnail:
-            item.thumbnail = urljoin(
-                context.request.loaded_url or context.request.url, thumbnail
-            )
         if published:
             published = parse_date(published)
-            if published:
-                item.published = datetime.fromtimestamp(mktime(published))
 
-        yield item
+        yield Blog(
+            url=url,
+            title=title,
+            description=description.strip() if description else None,
+            thumbnail=(
+                urljoin(context.request.loaded_url or context.request.url, thumbnail)
+                if thumbnail
+                else None
+            ),
+            published=datetime.fromtimestamp(mktime(published)) if published else None,
+        )
 
 
 class BrownfinesecurityCom(Spider):
@@ -23,11 +23,12 @@ async def default_request_handler(context: ParselCrawlingContext):
         published = entry["publishDate"]
         description = entry["description"]
 
-        item = Blog(url=url, title=title)
-        item.description = description
-        item.published = datetime.fromtimestamp(mktime(parse_date(published)))  # pyright: ignore [reportArgumentType]
-
-        yield item
+        yield Blog(
+            url=url,
+            title=title,
+            description=description,
+            published=datetime.fromtimestamp(mktime(parse_date(published))),  # pyright: ignore [reportArgumentType]
+        )
 
 
 class BughuntersGoogleComSpider(Spider):
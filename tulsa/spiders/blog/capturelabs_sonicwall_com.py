@@ -21,12 +21,12 @@ async def default_request_handler(context: ParselCrawlingContext):
         description = BeautifulSoup(entry["paragraph"], "lxml").text[:1000]
         published = parse_date(entry["published_date"])
 
-        item = Blog(url=url, title=title)
-        item.description = description
-        if published:
-            item.published = datetime.fromtimestamp(mktime(published))
-
-        yield item
+        yield Blog(
+            url=url,
+            title=title,
+            description=description,
+            published=datetime.fromtimestamp(mktime(published)) if published else None,
+        )
 
 
 class CaturelabsSonicwallComSpider(Spider):
@@ -31,14 +31,16 @@ async def default_request_handler(context: ParselCrawlingContext):
         description = entry["summary"]
         thumbnail = entry["mainImageUrl"]
 
-        item = Blog(url=url, title=title, category=Category.Blockchain)
-        item.description = description
-        item.thumbnail = urljoin(
-            context.request.loaded_url or context.request.url, thumbnail
+        yield Blog(
+            url=url,
+            title=title,
+            category=Category.Blockchain,
+            description=description,
+            thumbnail=urljoin(
+                context.request.loaded_url or context.request.url, thumbnail
+            ),
+            published=datetime.fromtimestamp(mktime(parse_date(published))),  # pyright: ignore [reportArgumentType]
         )
-        item.published = datetime.fromtimestamp(mktime(parse_date(published)))  # pyright: ignore [reportArgumentType]
-
-        yield item
 
 
 class CertikComSpider(Spider):
@@ -13,7 +13,7 @@ from tulsa.models import Blog, Category
 
 
 async def default_request_handler(context: ParselCrawlingContext):
-    item = Blog.from_html_selector(context.selector)
+    item = Blog.from_html_selector(context.selector, Category.Blockchain)
     if not item:
         context.log.error(
             f"{context.request.url}| Cannot find url or title HTML element"
@@ -29,7 +29,6 @@ async def default_request_handler(context: ParselCrawlingContext):
         '//div[@class="blogp-headingdate"]/div[@class="text-size-large"]/text()'
     ).get()
     item.title = item.title.replace(" - ChainSecurity", "")
-    item.category = Category.Blockchain
     if published:
         published = parse_date(published)
         if published:
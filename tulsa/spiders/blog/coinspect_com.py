@@ -18,10 +18,9 @@ async def default_request_handler(context: ParselCrawlingContext):
         )
         return
     for entry in json.loads(data).get("hasPart", []):
-        item = Blog.from_json_schema(entry)
+        item = Blog.from_json_schema(entry, Category.Blockchain)
         if not item:
             continue
-        item.category = Category.Blockchain
 
         yield item
 
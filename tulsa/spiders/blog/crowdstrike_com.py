@@ -32,19 +32,22 @@ async def default_request_handler(context: ParselCrawlingContext):
         description = entry.xpath('.//div[@class="excerpt"]').get()
         thumbnail = entry.xpath(".//img/@src").get()
 
-        item = Blog(url=url, title=title.strip())
-        if description:
-            item.description = BeautifulSoup(description, "lxml").text.strip()
         if published:
             published = parse_date(published)
-            if published:
-                item.published = datetime.fromtimestamp(mktime(published))
-        if thumbnail:
-            item.thumbnail = urljoin(
-                context.request.loaded_url or context.request.url, thumbnail
-            )
-
-        yield item
+
+        yield Blog(
+            url=url,
+            title=title.strip(),
+            description=(
+                BeautifulSoup(description, "lxml").text.strip() if description else None
+            ),
+            published=datetime.fromtimestamp(mktime(published)) if published else None,
+            thumbnail=(
+                urljoin(context.request.loaded_url or context.request.url, thumbnail)
+                if thumbnail
+                else None
+            ),
+        )
 
 
 class CrowdstrikeComSpider(Spider):
@@ -41,7 +41,9 @@ async def fetch_articles(context: ParselCrawlingContext):
 
 class CsrcNistGovSpider(Spider):
     def __init__(self) -> None:
-        super().__init__(default_request_handler=default_request_handler)
+        super().__init__(
+            default_request_handler=default_request_handler, skip_known_urls=True
+        )
         self.router._handlers_by_label["fetch_articles"] = fetch_articles  # pyright: ignore [reportPrivateUsage]
 
     @override
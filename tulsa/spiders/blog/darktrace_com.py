@@ -29,17 +29,17 @@ async def default_request_handler(
         thumbnail = entry.get("image")
         published = entry.get("datePublished")
 
-        item = Blog(url=url, title=title, category=Category.Generic)
-        if description:
-            item.description = description
-        if thumbnail:
-            item.thumbnail = thumbnail
         if published:
             published = parse_date(published)
-            if published:
-                item.published = datetime.fromtimestamp(mktime(published))
 
-        yield item
+        yield Blog(
+            url=url,
+            title=title,
+            category=Category.Generic,
+            description=description or None,
+            thumbnail=thumbnail or None,
+            published=datetime.fromtimestamp(mktime(published)) if published else None,
+        )
 
 
 async def fetch_articles(context: ParselCrawlingContext):
@@ -57,7 +57,9 @@ async def fetch_articles(context: ParselCrawlingContext):
 
 class DarktraceSpider(Spider):
     def __init__(self):
-        super().__init__(default_request_handler=default_request_handler)
+        super().__init__(
+            default_request_handler=default_request_handler, skip_known_urls=True
+        )
         self.router._handlers_by_label["fetch_articles"] = fetch_articles  # pyright: ignore [reportPrivateUsage]
 
     @override
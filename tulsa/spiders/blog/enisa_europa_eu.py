@@ -3,12 +3,11 @@ from time import mktime
 from typing import override
 from urllib.parse import urljoin
 
-from bs4 import BeautifulSoup
 from crawlee.crawlers import ParselCrawlingContext
 from crawlee.statistics import FinalStatistics
 
 from tulsa import Spider
-from tulsa.helpers import parse_date
+from tulsa.helpers import html_to_text, parse_date
 from tulsa.models import Blog
 
 
@@ -31,15 +30,15 @@ async def default_request_handler(context: ParselCrawlingContext):
         description = entry.xpath('.//div[@class="content"]/p/text()').get()
         published = entry.xpath(".//time/@datetime").get()
 
-        item = Blog(url=url.strip(), title=title.strip())
-        if description:
-            item.description = description.strip()
         if published:
             published = parse_date(published)
-            if published:
-                item.published = datetime.fromtimestamp(mktime(published))
 
-        yield item
+        yield Blog(
+            url=url.strip(),
+            title=title.strip(),
+            description=description.strip() if description else None,
+            published=datetime.fromtimestamp(mktime(published)) if published else None,
+        )
 
     items = context.selector.xpath('//div[@class="publications-item"]')
     if len(items) == 0:
@@ -59,19 +58,20 @@ async def default_request_handler(context: ParselCrawlingContext):
         thumbnail = entry.xpath(".//img/@src").get()
         published = entry.xpath(".//time/@datetime").get()
 
-        item = Blog(url=url.strip(), title=title.strip())
-        if description:
-            item.description = BeautifulSoup(description, "lxml").text.strip()
-        if thumbnail:
-            item.thumbnail = urljoin(
-                context.request.loaded_url or context.request.url, thumbnail
-            )
         if published:
             published = parse_date(published)
-            if published:
-                item.published = datetime.fromtimestamp(mktime(published))
 
-        yield item
+        yield Blog(
+            url=url.strip(),
+            title=title.strip(),
+            description=html_to_text(description) if description else None,
+            thumbnail=(
+                urljoin(context.request.loaded_url or context.request.url, thumbnail)
+                if thumbnail
+                else None
+            ),
+            published=datetime.fromtimestamp(mktime(published)) if published else None,
+        )
 
 
 class EnisaEuropaEuSpider(Spider):
@@ -9,18 +9,18 @@ from crawlee import Request
 from crawlee.crawlers import ParselCrawlingContext
 from crawlee.statistics import FinalStatistics
 
-from tulsa import Spider
+from tulsa import HttpSpider, RawCrawlingContext, Spider
 from tulsa.helpers import parse_date
 from tulsa.models import Blog
 
 
-class IbmComSpider(Spider):
+class IbmComSpider(HttpSpider):
     def __init__(self):
         super().__init__(default_request_handler=self.default_request_handler)
 
     @staticmethod
     async def default_request_handler(
-        context: ParselCrawlingContext,
+        context: RawCrawlingContext,
     ) -> AsyncIterator[Blog]:
         res = json.loads(await context.http_response.read())
         for entry in res["body"]["articleList"]:
@@ -32,17 +32,18 @@ class IbmComSpider(Spider):
             ) or entry["imageCrops"].get("crop-thumbnail-2-by-1-retina")
             published = entry["publishDate"]
 
-            item = Blog(url=url, title=title)
-            if description:
-                item.description = description
-            if thumbnail:
-                item.thumbnail = thumbnail
             if published:
                 published = parse_date(published)
-                if published:
-                    item.published = datetime.fromtimestamp(mktime(published))
 
-            yield item
+            yield Blog(
+                url=url,
+                title=title,
+                description=description or None,
+                thumbnail=thumbnail or None,
+                published=(
+                    datetime.fromtimestamp(mktime(published)) if published else None
+                ),
+            )
 
     @override
     async def run(self) -> FinalStatistics:  # pyright: ignore [reportIncompatibleMethodOverride]
@@ -56,7 +57,10 @@ class IbmComSpider(Spider):
 
 class ResearchIbmComSpider(Spider):
     def __init__(self) -> None:
-        super().__init__(default_request_handler=self.default_request_handler)
+        super().__init__(
+            default_request_handler=self.default_request_handler,
+            skip_known_urls=True,
+        )
         self.router._handlers_by_label["fetch_articles"] = self.fetch_articles  # pyright: ignore [reportPrivateUsage]
 
     @staticmethod
@@ -19,14 +19,12 @@ async def default_request_handler(context: ParselCrawlingContext):
         )
         return
 
-    item = Blog.from_json_schema(json.loads(data))
+    item = Blog.from_json_schema(json.loads(data), Category.BugBounty)
     if not item:
         context.log.error(
             f"{context.request.url} | Cannot find url or title in the json data"
         )
         return
-    item.category = Category.BugBounty
-
     if item.description:
         item.description = item.description.lstrip(item.title)
 
@@ -44,7 +42,9 @@ async def fetch_articles(context: ParselCrawlingContext):
 
 class MediumComTagSpider(Spider):
     def __init__(self) -> None:
-        super().__init__(default_request_handler=default_request_handler)
+        super().__init__(
+            default_request_handler=default_request_handler, skip_known_urls=True
+        )
         self.router._handlers_by_label["fetch_articles"] = fetch_articles  # pyright: ignore [reportPrivateUsage]
 
     @override
@@ -35,17 +35,17 @@ async def default_request_handler(
             './/span[@class="brxe-dcuqts brxe-text-basic blog-card-meta"]/text()'
         ).get()
 
-        item = Blog(url=url, title=title, category=Category.Blockchain)
-        if description:
-            item.description = description.strip()
-        if thumbnail:
-            item.thumbnail = thumbnail
         if published:
             published = parse_date(published)
-            if published:
-                item.published = datetime.fromtimestamp(mktime(published))
 
-        yield item
+        yield Blog(
+            url=url,
+            title=title,
+            category=Category.Blockchain,
+            description=description.strip() if description else None,
+            thumbnail=thumbnail or None,
+            published=datetime.fromtimestamp(mktime(published)) if published else None,
+        )
 
 
 class RareskillIoSpider(Spider):
@@ -24,12 +24,13 @@ async def default_request_handler(context: ParselCrawlingContext):
         description = entry["first_200_words"]
         thumbnail = entry["thumbnail"]
 
-        item = Blog(url=url, title=title)
-        item.description = description
-        item.thumbnail = thumbnail
-        item.published = datetime.fromtimestamp(mktime(published))
-
-        yield item
+        yield Blog(
+            url=url,
+            title=title,
+            description=description,
+            thumbnail=thumbnail,
+            published=datetime.fromtimestamp(mktime(published)),
+        )
 
 
 class SecVpnptVnSpider(Spider):
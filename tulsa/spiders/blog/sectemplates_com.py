@@ -32,16 +32,17 @@ async def default_request_handler(context: ParselCrawlingContext):
         ).get()
         published = entry.xpath(".//time/@datetime").get()
 
-        item = Blog(url=url, title=title)
-
-        if description:
-            item.description = description.replace("\xa0", "").strip()
         if published:
             published = parse_date(published)
-            if published:
-                item.published = datetime.fromtimestamp(mktime(published))
 
-        yield item
+        yield Blog(
+            url=url,
+            title=title,
+            description=(
+                description.replace("\xa0", "").strip() if description else None
+            ),
+            published=datetime.fromtimestamp(mktime(published)) if published else None,
+        )
 
 
 class SectemplatesSpider(Spider):
@@ -38,18 +38,19 @@ async def default_request_handler(
     published = latest_entry.xpath(
         './/h1[@class="text-gray-500 font-normal"]/text()'
     ).get()
-    item = Blog(url=url, title=title)
-    if description:
-        item.description = description.strip()
-    if thumbnail:
-        item.thumbnail = urljoin(
-            context.request.loaded_url or context.request.url, thumbnail
-        )
     if published:
         published = parse_date(published)
-        if published:
-            item.published = datetime.fromtimestamp(mktime(published))
-    yield item
+    yield Blog(
+        url=url,
+        title=title,
+        description=description.strip() if description else None,
+        thumbnail=(
+            urljoin(context.request.loaded_url or context.request.url, thumbnail)
+            if thumbnail
+            else None
+        ),
+        published=datetime.fromtimestamp(mktime(published)) if published else None,
+    )
 
     for entry in context.selector.xpath(
         '//div[@class="flex flex-col md:flex-row gap-4 py-6 border-b border-gray-200"]'
@@ -74,19 +75,20 @@ async def default_request_handler(
             './/h1[@class="text-gray-500 font-normal"]/text()'
         ).get()
 
-        item = Blog(url=url, title=title)
-        if description:
-            item.description = description
-        if thumbnail:
-            item.thumbnail = urljoin(
-                context.request.loaded_url or context.request.url, thumbnail
-            )
         if published:
             published = parse_date(published)
-            if published:
-                item.published = datetime.fromtimestamp(mktime(published))
 
-        yield item
+        yield Blog(
+            url=url,
+            title=title,
+            description=description or None,
+            thumbnail=(
+                urljoin(context.request.loaded_url or context.request.url, thumbnail)
+                if thumbnail
+                else None
+            ),
+            published=datetime.fromtimestamp(mktime(published)) if published else None,
+        )
 
 
 class SecuritumComSpider(Spider):
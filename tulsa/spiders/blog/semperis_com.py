@@ -35,15 +35,13 @@ async def default_request_handler(
             if published:
                 break
 
-        item = Blog(url=url, title=title)
-        if description:
-            item.description = description.strip()
-        if thumbnail:
-            item.thumbnail = thumbnail
-        if published:
-            item.published = datetime.fromtimestamp(mktime(published))
-
-        yield item
+        yield Blog(
+            url=url,
+            title=title,
+            description=description.strip() if description else None,
+            thumbnail=thumbnail,
+            published=datetime.fromtimestamp(mktime(published)) if published else None,
+        )
 
 
 class SemperisComSpider(Spider):
@@ -23,13 +23,14 @@ async def default_request_handler(context: ParselCrawlingContext):
         description = entry.get("summary")
         published = entry.get("published_parsed")
 
-        item = Blog(url=url, title=title)
-        if description:
-            item.description = BeautifulSoup(description, "html.parser").text
-        if published:
-            item.published = datetime.fromtimestamp(mktime(published))
-
-        yield item
+        yield Blog(
+            url=url,
+            title=title,
+            description=(
+                BeautifulSoup(description, "html.parser").text if description else None
+            ),
+            published=datetime.fromtimestamp(mktime(published)) if published else None,
+        )
 
 
 class SsddisclosureComSpider(Spider):
@@ -3,49 +3,69 @@ import os
 from collections.abc import AsyncIterator
 from datetime import datetime
 from time import mktime
-from typing import TypedDict, cast, final, override
+from typing import Any, TypedDict, cast, final, override
 
-from bs4 import BeautifulSoup
 from crawlee import ConcurrencySettings, Request
-from crawlee.crawlers import ParselCrawlingContext
 from crawlee.statistics import FinalStatistics
 
-from tulsa import Spider
-from tulsa.helpers import is_valid_url, parse_date
+from tulsa import HttpSpider, RawCrawlingContext
+from tulsa.executor import run_parser
+from tulsa.feed_schedule import feed_schedule
+from tulsa.helpers import html_to_text, is_valid_url, parse_date
 from tulsa.models import Blog, Category
 
 
 class BlogspotProperties(TypedDict):
     category: Category
+    # The blog url, the requests are sent to the Blogger API
+    feed: str
 
 
-async def default_handler(context: ParselCrawlingContext) -> AsyncIterator[Blog]:
-    user_data = cast(BlogspotProperties, context.request.user_data)  # pyright: ignore [reportInvalidCast]
-    res = json.loads(await context.http_response.read())
-    for entry in res["items"]:
-        title = entry["title"]
-        url = entry["url"]
-        category = user_data.get("category", Category.Generic)
-        published = entry["published"]
-        images = entry.get("images", [])
-        summary = entry.get("content")
+def parse_posts(body: bytes, category: Category) -> list[dict[str, Any]]:
+    """
+    Parse the posts of the Blogger API into the fields of their blogs.
 
-        item = Blog(url=url, title=title, category=category)
-        published = parse_date(published)
+    It doesn't depend on the crawler, so it can run in the parse executor.
+    """
+    blogs: list[dict[str, Any]] = []
+    res = json.loads(body)
+    for entry in res["items"]:
+        data: dict[str, Any] = {
+            "url": entry["url"],
+            "title": entry["title"],
+            "category": category,
+        }
+        published = parse_date(entry["published"])
         if published:
-            item.published = datetime.fromtimestamp(mktime(published))
-        for image in images:
+            data["published"] = datetime.fromtimestamp(mktime(published))
+        for image in entry.get("images", []):
             if is_valid_url(image["url"]):
-                item.thumbnail = image["url"]
+                data["thumbnail"] = image["url"]
                 break
 
+        summary = entry.get("content")
         if summary:
-            item.description = BeautifulSoup(summary, "html.parser").text[:1000]
+            data["description"] = html_to_text(summary, 1000)
 
+        blogs.append(data)
+    return blogs
+
+
+async def default_handler(context: RawCrawlingContext) -> AsyncIterator[Blog]:
+    user_data = cast(BlogspotProperties, context.request.user_data)  # pyright: ignore [reportInvalidCast]
+    blogs = await run_parser(
+        parse_posts,
+        await context.http_response.read(),
+        user_data.get("category", Category.Generic),
+    )
+    for data in blogs:
+        item = Blog(**data)
+        if item.published:
+            feed_schedule.published(user_data["feed"], item.published)
         yield item
 
 
-async def prefetch_url(context: ParselCrawlingContext):
+async def prefetch_url(context: RawCrawlingContext):
     max_items = context.request.user_data.get("max_items", 20)  # pyright: ignore [reportUnknownMemberType, reportUnknownVariableType]
     if not context.request.user_data.get("token"):  # pyright: ignore [reportUnknownMemberType]
         raise ValueError("Missing `token` field.")
@@ -55,11 +75,21 @@ async def prefetch_url(context: ParselCrawlingContext):
     url = f"{res['posts']['selfLink']}?fetchBodies=true&fetchImages=true"
     url += f"&maxResults={max_items}&key={token}"
 
-    await context.add_requests([url])
+    await context.add_requests(
+        [
+            Request.from_url(
+                url,
+                user_data={
+                    "category": context.request.user_data.get("category"),  # pyright: ignore [reportUnknownMemberType]
+                    "feed": context.request.user_data.get("feed"),  # pyright: ignore [reportUnknownMemberType]
+                },
+            )
+        ]
+    )
 
 
 @final
-class BlogspotSpider(Spider):
+class BlogspotSpider(HttpSpider):
     def __init__(self, requests: list[Request]):
         concurrency_settings = ConcurrencySettings(max_tasks_per_minute=30)
         super().__init__(
@@ -71,12 +101,28 @@ class BlogspotSpider(Spider):
         if not token:
             raise ValueError("BLOGSPOT_API_TOKEN environment variable is not set")
         for r in requests:
+            r.user_data["feed"] = r.url  # pyright: ignore [reportUnknownMemberType]
             r.url = f"https://www.googleapis.com/blogger/v3/blogs/byurl?url={r.url}&key={token}"
             r.user_data["token"] = token  # pyright: ignore [reportUnknownMemberType]
             r.user_data["max_items"] = 20  # pyright: ignore [reportUnknownMemberType]
             r.user_data["label"] = "prefetch"  # pyright: ignore [reportUnknownMemberType]
         self.requests = requests
 
+    @override
+    def request_handled(self, request: Request) -> None:
+        # The blog is fetched once its posts are, not its prefetch request
+        if request.label is None:
+            feed_schedule.fetched(cast(str, request.user_data["feed"]))
+
     @override
     async def run(self) -> FinalStatistics:  # pyright: ignore [reportIncompatibleMethodOverride]
-        return await super().run(self.requests)
+        requests = [
+            r
+            for r in self.requests
+            if feed_schedule.is_due(cast(str, r.user_data["feed"]))
+        ]
+        self.log.info(f"{len(requests)} of {len(self.requests)} blogs are due")
+        try:
+            return await super().run(requests)
+        finally:
+            feed_schedule.save()
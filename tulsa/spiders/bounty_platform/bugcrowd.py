@@ -7,11 +7,10 @@ from typing import TypedDict, cast, final, override
 from urllib.parse import urlencode
 
 from crawlee import Request
-from crawlee.crawlers import ParselCrawlingContext
 from crawlee.statistics import FinalStatistics
 from pyotp import TOTP
 
-from tulsa import Spider
+from tulsa import HttpSpider, RawCrawlingContext
 from tulsa.helpers import parse_date
 from tulsa.models import HacktivityBounty, Severity
 
@@ -23,7 +22,7 @@ class BugcrowdAuth(TypedDict):
 
 
 async def default_request_handler(
-    context: ParselCrawlingContext,
+    context: RawCrawlingContext,
 ) -> AsyncIterator[HacktivityBounty]:
     res = json.loads(await context.http_response.read())
     for entry in res.get("results", []):
@@ -52,17 +51,18 @@ async def default_request_handler(
             case _:
                 severity = None
 
-        item = HacktivityBounty(url=url, title=title)
-        if published:
-            item.published = datetime.fromtimestamp(mktime(published))
-        item.reporter = reporter
-        item.program = program
-        item.awarded = awarded
-        item.severity = severity
-        yield item
+        yield HacktivityBounty(
+            url=url,
+            title=title,
+            reporter=reporter,
+            program=program,
+            awarded=awarded,
+            severity=severity,
+            published=datetime.fromtimestamp(mktime(published)) if published else None,
+        )
 
 
-async def login(context: ParselCrawlingContext):
+async def login(context: RawCrawlingContext):
     if context.session is None:
         context.log.error("The request session is None")
         return
@@ -97,7 +97,7 @@ async def login(context: ParselCrawlingContext):
     )
 
 
-async def otp_challenge(context: ParselCrawlingContext):
+async def otp_challenge(context: RawCrawlingContext):
     if context.session is None:
         context.log.error("The request session is None")
         return
@@ -131,7 +131,7 @@ async def otp_challenge(context: ParselCrawlingContext):
     )
 
 
-async def set_session(context: ParselCrawlingContext):
+async def set_session(context: RawCrawlingContext):
     if context.session is None:
         context.log.error("The request session is None")
         return
@@ -148,11 +148,13 @@ async def set_session(context: ParselCrawlingContext):
 
 
 @final
-class BugcrowdHacktivitySpider(Spider):
+class BugcrowdHacktivitySpider(HttpSpider):
     def __init__(self):
         super().__init__(
             default_request_handler=default_request_handler,
             ignore_http_error_status_codes=[422],
+            # The pages depend on the login session
+            http_cache=False,
         )
         self.router._handlers_by_label["login"] = login  # pyright: ignore [reportPrivateUsage]
         self.router._handlers_by_label["otp_challenge"] = otp_challenge  # pyright: ignore [reportPrivateUsage]
@@ -7,16 +7,15 @@ from time import mktime
 from typing import override
 
 from crawlee import ConcurrencySettings, Request
-from crawlee.crawlers import ParselCrawlingContext
 from crawlee.statistics import FinalStatistics
 
-from tulsa import Spider
+from tulsa import HttpSpider, RawCrawlingContext
 from tulsa.helpers import parse_date
 from tulsa.models import HacktivityBounty, Severity
 
 
 async def default_request_handler(
-    context: ParselCrawlingContext,
+    context: RawCrawlingContext,
 ) -> AsyncIterator[HacktivityBounty]:
     res = json.loads(await context.http_response.read())
 
@@ -27,32 +26,31 @@ async def default_request_handler(
         awarded = report["attributes"].get("total_awarded_amount")
         severity = report["attributes"].get("severity_rating")
 
-        item = HacktivityBounty(url=url, title=title)
-        item.awarded = awarded
-        item.severity = (
-            Severity(severity.lower()) if severity and severity != "None" else None
-        )
         if published:
             published = parse_date(published)
-            if published:
-                item.published = datetime.fromtimestamp(mktime(published))
         relationships = report["relationships"]
-        if relationships["program"]["data"]["attributes"].get("name"):
-            item.program = relationships["program"]["data"]["attributes"]["name"]
-        if relationships["reporter"]["data"]["attributes"].get("username"):
-            item.reporter = relationships["reporter"]["data"]["attributes"]["username"]
+        description = None
         if relationships.get("report_generated_content"):
-            if relationships["report_generated_content"]["data"]["attributes"].get(
-                "hacktivity_summary"
-            ):
-                item.description = relationships["report_generated_content"]["data"][
-                    "attributes"
-                ]["hacktivity_summary"]
+            description = relationships["report_generated_content"]["data"][
+                "attributes"
+            ].get("hacktivity_summary")
 
-        yield item
+        yield HacktivityBounty(
+            url=url,
+            title=title,
+            awarded=awarded,
+            severity=(
+                Severity(severity.lower()) if severity and severity != "None" else None
+            ),
+            published=datetime.fromtimestamp(mktime(published)) if published else None,
+            program=relationships["program"]["data"]["attributes"].get("name") or None,
+            reporter=relationships["reporter"]["data"]["attributes"].get("username")
+            or None,
+            description=description or None,
+        )
 
 
-class HackeroneHacktivitySpider(Spider):
+class HackeroneHacktivitySpider(HttpSpider):
     token: str
 
     def __init__(self):
@@ -1,29 +1,42 @@
-import json
 import os
 import re
+from calendar import timegm
 from collections.abc import AsyncIterator
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from time import mktime
 from typing import final, override
 
 from crawlee import Request
-from crawlee.crawlers import ParselCrawlingContext
 from crawlee.statistics import FinalStatistics
 
-from tulsa import Spider
+from tulsa import HttpSpider, RawCrawlingContext
 from tulsa.helpers import parse_date
+from tulsa.json_stream import JsonStream
 from tulsa.models import Cve
+from tulsa.sync_cursor import sync_cursor
 
 _GITHUB_NEXT_PAGE = re.compile(r'(?<=<)([\S]*)(?=>; rel="next")')
+# Only the advisories published in this window are collected
+WINDOW = timedelta(days=7)
 
 
-async def default_handler(context: ParselCrawlingContext) -> AsyncIterator[Cve]:
+async def default_handler(context: RawCrawlingContext) -> AsyncIterator[Cve]:
     next_page = context.http_response.headers.get("link")
+    published_after = context.request.user_data.get("published_after")  # pyright: ignore [reportUnknownMemberType, reportUnknownVariableType]
     if next_page:
-        await context.add_requests(_GITHUB_NEXT_PAGE.findall(next_page))
+        await context.add_requests(
+            [
+                Request.from_url(
+                    url,
+                    headers=context.request.headers,
+                    user_data={"published_after": published_after},
+                )
+                for url in _GITHUB_NEXT_PAGE.findall(next_page)
+            ]
+        )
 
-    res = json.loads(await context.http_response.read())
-    for cve in res:
+    res = JsonStream(await context.http_response.read())
+    for cve in res.items():
         cve_id = cve.get("cve_id") or cve.get("ghsa_id")
         url = cve.get("html_url")
         summary = cve.get("summary") or cve.get("description")
@@ -39,40 +52,60 @@ async def default_handler(context: ParselCrawlingContext) -> AsyncIterator[Cve]:
         if not date:
             context.log.error(f"Cannot parse '{published}' for CVE id: {cve_id}")
             continue
+        # An incremental sync also returns the old advisories which have been updated
+        if isinstance(published_after, float) and timegm(date) < published_after:
+            continue
         published = datetime.fromtimestamp(mktime(date))
 
-        item = Cve(id=cve_id, url=url, published=published)
-        if summary:
-            item.description = summary[:1000]
-        item.score = score
-        item.cna = cna
-
-        yield item
+        yield Cve(
+            id=cve_id,
+            url=url,
+            published=published,
+            description=summary[:1000] if summary else None,
+            score=score,
+            cna=cna,
+        )
 
 
 @final
-class GithubCveSpider(Spider):
-    from_published: str
+class GithubCveSpider(HttpSpider):
+    """
+    Collect the reviewed advisories published in the last 7 days.
+
+    After a successful run, the next one only asks for the advisories updated since then.
+    Set `CVE_FULL_SYNC=1` or reset the `github` sync cursor to fetch the whole window again.
+    """
+
+    from_published: datetime | None
     token: str
 
     def __init__(self, from_published: datetime | None = None):
         super().__init__(default_request_handler=default_handler)
-        if not from_published:
-            from_published = datetime.fromtimestamp(
-                datetime.now(UTC).timestamp() - 60 * 60 * 24 * 7
-            )
         token = os.getenv("GITHUB_ADVISORY_API_TOKEN")
         if not token:
             raise ValueError(
                 "GITHUB_ADVISORY_API_TOKEN environment variable is not set"
             )
         self.token = token
-        self.from_published = from_published.strftime("%Y-%m-%dT%H:%M:%SZ")
+        # A given start date always runs a full sync from it
+        self.from_published = from_published
 
     @override
     async def run(self) -> FinalStatistics:  # pyright: ignore [reportIncompatibleMethodOverride]
-        url = "https://api.github.com/advisories"
-        url += f"?type=reviewed&published=>{self.from_published}"
+        now = datetime.now(UTC)
+        from_published = self.from_published or now - WINDOW
+        since = None
+        if not self.from_published and os.getenv("CVE_FULL_SYNC") != "1":
+            since = sync_cursor.get("github")
+
+        url = "https://api.github.com/advisories?type=reviewed"
+        sync = "Full"
+        if since and since > from_published:
+            sync = "Incremental"
+            url += f"&updated=>{since.strftime('%Y-%m-%dT%H:%M:%SZ')}"
+        else:
+            url += f"&published=>{from_published.strftime('%Y-%m-%dT%H:%M:%SZ')}"
+        self.log.info(f"{sync} sync with {url}")
         request = Request.from_url(
             url,
             headers={
@@ -80,6 +113,15 @@ class GithubCveSpider(Spider):
                 "Authorization": f"Bearer {self.token}",
                 "X-GitHub-Api-Version": "2022-11-28",
             },
+            user_data={"published_after": from_published.timestamp()},
         )
 
-        return await super().run([request])
+        statistics = await super().run([request])
+        # The CVEs which the pipelines failed to store are fetched again in the next run
+        if (
+            statistics.requests_failed == 0
+            and self.item_queue.failed == 0
+            and not self.from_published
+        ):
+            sync_cursor.advance("github", now)
+        return statistics
@@ -1,21 +1,28 @@
-import json
+import os
+from calendar import timegm
 from collections.abc import AsyncIterator
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from time import mktime
 from typing import final, override
 
-from crawlee import ConcurrencySettings
-from crawlee.crawlers import ParselCrawlingContext
+from crawlee import ConcurrencySettings, Request
 from crawlee.statistics import FinalStatistics
 
-from tulsa import Spider
+from tulsa import HttpSpider, RawCrawlingContext
 from tulsa.helpers import parse_date
+from tulsa.json_stream import JsonStream
 from tulsa.models import Cve
+from tulsa.sync_cursor import sync_cursor
 
+# Only the CVEs published in this window are collected
+WINDOW = timedelta(days=7)
 
-async def default_handler(context: ParselCrawlingContext) -> AsyncIterator[Cve]:
-    res = json.loads(await context.http_response.read())
-    for vuln in res.get("vulnerabilities", []):
+
+async def default_handler(context: RawCrawlingContext) -> AsyncIterator[Cve]:
+    # A page can have 2,000 CVEs with their configurations, they're decoded one by one
+    res = JsonStream(await context.http_response.read())
+    published_after = context.request.user_data.get("published_after")  # pyright: ignore [reportUnknownMemberType, reportUnknownVariableType]
+    for vuln in res.items("vulnerabilities"):
         cve = vuln["cve"]
         score = 0.0
         # The CVE got rejected, we skip it
@@ -38,19 +45,23 @@ async def default_handler(context: ParselCrawlingContext) -> AsyncIterator[Cve]:
         if not date:
             context.log.error(f"Cannot parse '{published}' for CVE id: {cve_id}")
             continue
+        # An incremental sync also returns the old CVEs which have been modified
+        if isinstance(published_after, float) and timegm(date) < published_after:
+            continue
         published = datetime.fromtimestamp(mktime(date))
 
-        item = Cve(id=cve_id, url=url, published=published)
-        item.score = score
-        item.description = description
-        if cna:
-            item.cna = cna
-
-        yield item
+        yield Cve(
+            id=cve_id,
+            url=url,
+            published=published,
+            score=score,
+            description=description,
+            cna=cna or None,
+        )
 
-    total_results = res["totalResults"]
-    results_per_page = res["resultsPerPage"]
-    next_index = res["startIndex"] + results_per_page
+    total_results = res.fields["totalResults"]
+    results_per_page = res.fields["resultsPerPage"]
+    next_index = res.fields["startIndex"] + results_per_page
 
     # We'll continue to crawl the next page
     if next_index < total_results and context.request.loaded_url:
@@ -60,11 +71,23 @@ async def default_handler(context: ParselCrawlingContext) -> AsyncIterator[Cve]:
             if pos == -1
             else f"{context.request.loaded_url[:pos]}&startIndex={next_index}"
         )
-        await context.add_requests([url])
+        await context.add_requests(
+            [Request.from_url(url, user_data={"published_after": published_after})]
+        )
 
 
 @final
-class NistCveSpider(Spider):
+class NistCveSpider(HttpSpider):
+    """
+    Collect the CVEs published in the last 7 days.
+
+    After a successful run, the next one only asks for the CVEs modified since then,
+    NVD also sets the `lastModified` date of a new CVE. Set `CVE_FULL_SYNC=1`
+    or reset the `nist` sync cursor to fetch the whole window again.
+    """
+
+    from_published: datetime | None
+
     def __init__(self, from_published: datetime | None = None):
         concurreny_settings = ConcurrencySettings(
             min_concurrency=1,
@@ -76,16 +99,40 @@ class NistCveSpider(Spider):
             default_request_handler=default_handler,
             concurrency_settings=concurreny_settings,
         )
-        if not from_published:
-            from_published = datetime.fromtimestamp(
-                datetime.now(UTC).timestamp() - 60 * 60 * 24 * 7
-            )
-        self.from_published = from_published.strftime("%Y-%m-%dT%H:%M:%SZ")
+        # A given start date always runs a full sync from it
+        self.from_published = from_published
 
     @override
     async def run(self) -> FinalStatistics:  # pyright: ignore [reportIncompatibleMethodOverride]
-        now = datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%S")
-        url = "https://services.nvd.nist.gov/rest/json/cves/2.0"
-        url += f"/?noRejected&pubStartDate={self.from_published}&pubEndDate={now}"
+        now = datetime.now(UTC)
+        from_published = self.from_published or now - WINDOW
+        since = None
+        if not self.from_published and os.getenv("CVE_FULL_SYNC") != "1":
+            since = sync_cursor.get("nist")
 
-        return await super().run([url])
+        url = "https://services.nvd.nist.gov/rest/json/cves/2.0/?noRejected"
+        sync = "Full"
+        if since and since > from_published:
+            sync = "Incremental"
+            url += f"&lastModStartDate={since.strftime('%Y-%m-%dT%H:%M:%SZ')}"
+            url += f"&lastModEndDate={now.strftime('%Y-%m-%dT%H:%M:%S')}"
+        else:
+            url += f"&pubStartDate={from_published.strftime('%Y-%m-%dT%H:%M:%SZ')}"
+            url += f"&pubEndDate={now.strftime('%Y-%m-%dT%H:%M:%S')}"
+        self.log.info(f"{sync} sync with {url}")
+
+        statistics = await super().run(
+            [
+                Request.from_url(
+                    url, user_data={"published_after": from_published.timestamp()}
+                )
+            ]
+        )
+        # The CVEs which the pipelines failed to store are fetched again in the next run
+        if (
+            statistics.requests_failed == 0
+            and self.item_queue.failed == 0
+            and not self.from_published
+        ):
+            sync_cursor.advance("nist", now)
+        return statistics
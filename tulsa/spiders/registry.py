@@ -0,0 +1,156 @@
+import ast
+import importlib
+import logging
+import os
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from tulsa import BaseSpider
+from tulsa.state import load_state, save_state
+
+logger = logging.getLogger(__name__)
+
+# The base classes of the spiders, see `tulsa.BaseSpider`
+SPIDER_BASES = ("Spider", "HttpSpider")
+# The manifest changes its format with its version
+MANIFEST_VERSION = 1
+
+
+@dataclass(frozen=True)
+class SpiderEntry:
+    """
+    A spider which hasn't been imported nor created yet.
+    """
+
+    name: str
+    module: str
+    # The environment variables which the spider can't run without
+    env: tuple[str, ...] = ()
+    # Creates the spiders which aren't a class of `module` alone, e.g. the feed spiders
+    factory: Callable[[], BaseSpider[Any]] | None = None
+
+    def missing_env(self) -> list[str]:
+        return [name for name in self.env if not os.getenv(name)]
+
+    def create(self) -> BaseSpider[Any]:
+        """
+        Import the module of the spider and create it.
+        """
+        if self.factory is not None:
+            return self.factory()
+        spider_class: Callable[[], BaseSpider[Any]] = getattr(
+            importlib.import_module(self.module), self.name
+        )
+        return spider_class()
+
+
+def __required_env(tree: ast.Module) -> list[str]:
+    # A spider reads its token with `os.getenv("NAME")`
+    # and raises "NAME environment variable is not set" without it
+    names: set[str] = set()
+    messages: list[str] = []
+    for node in ast.walk(tree):
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and node.func.attr == "getenv"
+            and len(node.args) == 1
+            and isinstance(node.args[0], ast.Constant)
+            and isinstance(node.args[0].value, str)
+        ):
+            names.add(node.args[0].value)
+        elif isinstance(node, ast.Raise) and node.exc is not None:
+            messages += [
+                n.value
+                for n in ast.walk(node.exc)
+                if isinstance(n, ast.Constant) and isinstance(n.value, str)
+            ]
+    return sorted(
+        name
+        for name in names
+        if any(f"{name} environment variable" in message for message in messages)
+    )
+
+
+def __scan_module(path: str) -> list[dict[str, Any]]:
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read(), path)
+    env = __required_env(tree)
+    return [
+        {"name": node.name, "env": env}
+        for node in tree.body
+        if isinstance(node, ast.ClassDef)
+        and any(
+            isinstance(base, ast.Name) and base.id in SPIDER_BASES
+            for base in node.bases
+        )
+    ]
+
+
+def spider_entries(
+    folder: Literal["blog", "cve", "bounty_platform"],
+) -> list[SpiderEntry]:
+    """
+    List the spiders of `folder` without importing them.
+
+    The spiders are found in the source of the modules. What is found is kept
+    in the "spiders" state, a module is only read again when it changes.
+    """
+    manifest: dict[str, Any] = load_state("spiders")
+    if manifest.get("version") != MANIFEST_VERSION:
+        manifest = {"version": MANIFEST_VERSION, "modules": {}}
+    modules: dict[str, dict[str, Any]] = manifest["modules"]
+    changed = False
+
+    entries: list[SpiderEntry] = []
+    seen: set[str] = set()
+    directory = os.path.join(os.path.dirname(__file__), folder)
+    for file_name in sorted(os.listdir(directory)):
+        if not file_name.endswith(".py") or file_name.startswith("_"):
+            continue
+        path = os.path.join(directory, file_name)
+        module_name = f"tulsa.spiders.{folder}.{file_name[:-3]}"
+        seen.add(module_name)
+        stat = os.stat(path)
+        cached: dict[str, Any] | None = modules.get(module_name)
+        if (
+            cached is None
+            or cached["mtime"] != stat.st_mtime_ns
+            or cached["size"] != stat.st_size
+        ):
+            try:
+                spiders = __scan_module(path)
+            except SyntaxError as e:
+                logger.error(f"Cannot read '{module_name}': {e}")
+                continue
+            cached = {
+                "mtime": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "spiders": spiders,
+            }
+            modules[module_name] = cached
+            changed = True
+        entries += [
+            SpiderEntry(spider["name"], module_name, tuple(spider["env"]))
+            for spider in cached["spiders"]
+        ]
+
+    # The removed modules
+    for module_name in list(modules):
+        if (
+            module_name.startswith(f"tulsa.spiders.{folder}.")
+            and module_name not in seen
+        ):
+            del modules[module_name]
+            changed = True
+
+    if changed:
+        try:
+            save_state("spiders", manifest)
+        except OSError as e:
+            logger.warning(f"Cannot save the spider manifest: {e}")
+    return entries
+
+
+__all__ = ["SpiderEntry", "spider_entries"]
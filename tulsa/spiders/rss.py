@@ -1,3 +1,5 @@
+import re
+import time
 from collections.abc import AsyncIterator
 from datetime import datetime
 from time import mktime
@@ -6,9 +8,7 @@ from urllib.parse import ParseResult as UrlParseResult
 from urllib.parse import urljoin, urlparse
 
 import feedparser
-from bs4 import BeautifulSoup
 from crawlee import Request
-from crawlee.crawlers import ParselCrawlingContext
 from crawlee.statistics import FinalStatistics
 
 if TYPE_CHECKING:
@@ -16,9 +16,27 @@ if TYPE_CHECKING:
 else:
     type Item = Any
 
-from tulsa import Spider
-from tulsa.helpers import is_valid_url
+from tulsa import HttpSpider, RawCrawlingContext
+from tulsa.executor import run_parser
+from tulsa.feed_schedule import feed_schedule
+from tulsa.helpers import html_to_text, is_valid_url, parse_date
 from tulsa.models import Blog, Category
+from tulsa.pipelines.filter import MAX_AGE
+
+_ENTRY = re.compile(rb"<(item|entry)[\s>].*?</\1\s*>", flags=re.DOTALL)
+# Feedparser prefers the published date over the updated one
+_ENTRY_DATES = [
+    re.compile(
+        rb"<(%s)[^>]*>\s*(?:<!\[CDATA\[)?\s*([^<\]]+)" % tag, flags=re.IGNORECASE
+    )
+    for tag in (rb"pubDate|published|dc:date|issued", rb"updated|modified")
+]
+
+
+class EmptyFeedError(Exception):
+    """
+    The feed doesn't have any entries, and it isn't allowed to be empty.
+    """
 
 
 class RssProperties(TypedDict):
@@ -116,23 +134,15 @@ def __process_entry_summary(entry: Item) -> str | None:
     if not summary:
         return None
 
-    summary = cast(str, BeautifulSoup(summary, "lxml").text).strip()
+    summary = html_to_text(summary, 1000)
     # Sometimes, the summary is very short, it isn't enough text
     # So we will use `entry.content` instead
-    if entry.get("content"):
-        new_summary = cast(
-            str, BeautifulSoup(entry["content"][0].value, "lxml").text
-        ).strip()
-        if len(summary) < len(new_summary) and len(summary) < 20:
+    if entry.get("content") and len(summary) < 20:
+        new_summary = html_to_text(entry["content"][0].value, 1000)
+        if len(summary) < len(new_summary):
             summary = new_summary
 
-    # Clean up multiple newlines
-    summary = summary.strip()
-    for _ in range(10):
-        summary = summary.replace("\r\n", "\n")
-        summary = summary.replace("\n\n\n", "\n\n")
-
-    return summary[:1000]
+    return summary
 
 
 def __extract_thumbnail(entry: Item) -> str | None:
@@ -175,14 +185,62 @@ def __extract_category(rss_url: str, entry: Item) -> Category | None:
     return None
 
 
-async def default_handler(context: ParselCrawlingContext) -> AsyncIterator[Blog]:
-    entries = feedparser.parse(await context.http_response.read()).entries
-    user_data = cast(RssProperties, context.request.user_data)  # pyright: ignore [reportInvalidCast]
+def __entry_date(entry: bytes) -> float | None:
+    for pattern in _ENTRY_DATES:
+        match = pattern.search(entry)
+        if match:
+            date = parse_date(match.group(2).decode(errors="replace").strip())
+            return mktime(date) if date else None
+    return None
+
 
-    if len(entries) == 0 and not user_data.get("allow_empty"):
-        context.log.error(f"'{context.request.url}' doesn't have any entries to read")
-        return
+def __select_fresh_entries(body: bytes) -> tuple[bytes, int, list[float]]:
+    """
+    Remove the entries which `OutOfDateItem` would drop from the feed `body`,
+    before feedparser and the handler do any work for them.
+    The feeds aren't always sorted, the date of every entry is checked.
 
+    Return the feed with the remaining entries, how many entries were skipped
+    and the publishing times of the skipped entries.
+    """
+    entries = list(_ENTRY.finditer(body))
+    if not entries:
+        return body, 0, []
+    cutoff = time.time() - MAX_AGE
+    kept: list[bytes] = []
+    history: list[float] = []
+    for entry in entries:
+        published = __entry_date(entry.group())
+        if published is None or published >= cutoff:
+            kept.append(entry.group())
+        else:
+            history.append(published)
+    skipped = len(history)
+    if not skipped:
+        return body, 0, []
+    return (
+        body[: entries[0].start()] + b"".join(kept) + body[entries[-1].end() :],
+        skipped,
+        history,
+    )
+
+
+def parse_feed(
+    url: str, body: bytes, user_data: RssProperties
+) -> tuple[list[dict[str, Any]], int, list[float]]:
+    """
+    Parse the feed `body` fetched from `url` into the fields of its blogs.
+
+    It doesn't depend on the crawler, so it can run in the parse executor.
+    Return the fields, how many out of date entries were skipped
+    and the publishing times of the skipped entries.
+    """
+    body, skipped, history = __select_fresh_entries(body)
+    entries = feedparser.parse(body).entries
+    if len(entries) == 0 and not skipped and not user_data.get("allow_empty"):
+        raise EmptyFeedError(f"'{url}' doesn't have any entries to read")
+
+    blogs: list[dict[str, Any]] = []
     for entry in entries:
         if not entry.get("link") or not entry.get("title"):
             continue
@@ -198,40 +256,83 @@ async def default_handler(context: ParselCrawlingContext) -> AsyncIterator[Blog]
             entry, user_data.get("only_tags"), user_data.get("exclude_tags")
         ):
             continue
-        url = __fix_entry_link(link, user_data.get("fix_link"))
-        category = __extract_category(url, entry) or user_data.get(
+        link = __fix_entry_link(link, user_data.get("fix_link"))
+        category = __extract_category(link, entry) or user_data.get(
             "category", Category.Generic
         )
 
-        data = Blog(
-            url=urljoin(context.request.loaded_url or context.request.url, url),
-            title=title,
-            category=category,
-        )
+        data: dict[str, Any] = {
+            "url": urljoin(url, link),
+            "title": title,
+            "category": category,
+        }
         if entry.get("author"):
-            data.author = entry["author"]
+            data["author"] = entry["author"]
         summary = __process_entry_summary(entry)
         if summary:
-            data.description = summary
+            data["description"] = summary
         published_parsed = entry.get("published_parsed") or entry.get("updated_parsed")
         if published_parsed:
             # It's weird when we collect an item what is published before 1975
             if published_parsed.tm_year <= 1975:
                 continue
-            data.published = datetime.fromtimestamp(mktime(published_parsed))
+            data["published"] = datetime.fromtimestamp(mktime(published_parsed))
         thumbnail = __extract_thumbnail(entry)
         if thumbnail:
-            data.thumbnail = thumbnail
+            data["thumbnail"] = thumbnail
 
-        yield data
+        blogs.append(data)
+    return blogs, skipped, history
 
 
 @final
-class RssSpider(Spider):
+class RssSpider(HttpSpider):
+    skipped_entries: int
+
     def __init__(self, requests: list[Request]):
-        super().__init__(default_request_handler=default_handler)
+        super().__init__(default_request_handler=self.__default_handler)
         self.requests = requests
+        self.skipped_entries = 0
+
+    async def __default_handler(
+        self, context: RawCrawlingContext
+    ) -> AsyncIterator[Blog]:
+        user_data = cast(RssProperties, context.request.user_data)  # pyright: ignore [reportInvalidCast]
+        try:
+            blogs, skipped, history = await run_parser(
+                parse_feed,
+                context.request.loaded_url or context.request.url,
+                await context.http_response.read(),
+                # A plain dict can be sent to another process
+                cast(RssProperties, dict(user_data)),  # pyright: ignore [reportInvalidCast]
+            )
+        except EmptyFeedError as e:
+            context.log.error(str(e))
+            return
+        self.skipped_entries += skipped
+        # They're still part of the publishing history of the feed
+        for published in history:
+            feed_schedule.published(
+                context.request.url, datetime.fromtimestamp(published)
+            )
+
+        for data in blogs:
+            blog = Blog(**data)
+            if blog.published:
+                feed_schedule.published(context.request.url, blog.published)
+            yield blog
+
+    @override
+    def request_handled(self, request: Request) -> None:
+        # A feed which failed is due again in the next run
+        feed_schedule.fetched(request.url)
 
     @override
     async def run(self) -> FinalStatistics:  # pyright: ignore [reportIncompatibleMethodOverride]
-        return await super().run(self.requests)
+        requests = [r for r in self.requests if feed_schedule.is_due(r.url)]
+        self.log.info(f"{len(requests)} of {len(self.requests)} feeds are due")
+        try:
+            return await super().run(requests)
+        finally:
+            feed_schedule.save()
+            self.log.info(f"Skipped {self.skipped_entries} out of date entries")
@@ -7,10 +7,9 @@ from typing import TypedDict, cast, final, override
 from urllib.parse import urlencode
 
 from crawlee import Request
-from crawlee.crawlers import ParselCrawlingContext
 from crawlee.statistics import FinalStatistics
 
-from tulsa import Spider
+from tulsa import HttpSpider, RawCrawlingContext
 from tulsa.helpers import parse_date
 from tulsa.models import Blog, Category
 
@@ -19,7 +18,7 @@ class SpotifyProperties(TypedDict):
     category: Category
 
 
-async def default_handler(context: ParselCrawlingContext) -> AsyncIterator[Blog]:
+async def default_handler(context: RawCrawlingContext) -> AsyncIterator[Blog]:
     res = json.loads(await context.http_response.read())
     user_data = cast(SpotifyProperties, context.request.user_data)  # pyright: ignore [reportInvalidCast]
 
@@ -34,29 +33,30 @@ async def default_handler(context: ParselCrawlingContext) -> AsyncIterator[Blog]
         images = entry.get("images", [])
         description = entry["description"]
 
-        item = Blog(url=url, title=title, category=category)
-        item.author = res["name"]
         published = parse_date(published)
-        if published:
-            item.published = datetime.fromtimestamp(mktime(published))
-        item.description = description
-        for image in images:
-            item.thumbnail = image["url"]
-            break
 
-        yield item
+        yield Blog(
+            url=url,
+            title=title,
+            category=category,
+            author=res["name"],
+            published=datetime.fromtimestamp(mktime(published)) if published else None,
+            description=description,
+            thumbnail=images[0]["url"] if images else None,
+        )
 
 
-async def fetch_access_token(context: ParselCrawlingContext):
+async def fetch_access_token(context: RawCrawlingContext):
     res = json.loads(await context.http_response.read())
     access_token = f"{res['token_type']} {res['access_token']}"
     context.request.user_data["access_token"] = access_token  # pyright: ignore [reportUnknownMemberType]
 
 
 @final
-class SpotifySpider(Spider):
+class SpotifySpider(HttpSpider):
     def __init__(self, shows: list[tuple[str, Category]]) -> None:
-        super().__init__(default_request_handler=default_handler)
+        # The responses depend on the access token
+        super().__init__(default_request_handler=default_handler, http_cache=False)
         self.router._handlers_by_label["fetch_access_token"] = fetch_access_token  # pyright: ignore [reportPrivateUsage]
         token = os.getenv("SPOTIFY_API_TOKEN")
         if not token:
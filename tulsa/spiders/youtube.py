@@ -6,10 +6,9 @@ from time import mktime
 from typing import TypedDict, cast, final, override
 
 from crawlee import Request
-from crawlee.crawlers import ParselCrawlingContext
 from crawlee.statistics import FinalStatistics
 
-from tulsa import Spider
+from tulsa import HttpSpider, RawCrawlingContext
 from tulsa.helpers import parse_date
 from tulsa.models import Blog, Category
 
@@ -18,7 +17,7 @@ class YoutubeProperties(TypedDict):
     category: Category
 
 
-async def default_handler(context: ParselCrawlingContext) -> AsyncIterator[Blog]:
+async def default_handler(context: RawCrawlingContext) -> AsyncIterator[Blog]:
     res = json.loads(await context.http_response.read())
     user_data = cast(YoutubeProperties, context.request.user_data)  # pyright: ignore [reportInvalidCast]
     for entry in res.get("items", []):
@@ -30,19 +29,21 @@ async def default_handler(context: ParselCrawlingContext) -> AsyncIterator[Blog]
         title = snippet["title"]
         url = f"https://www.youtube.com/watch?v={entry['id']['videoId']}"
         category = user_data.get("category", Category.Generic)
-        item = Blog(url=url, title=title, category=category)
-        item.author = snippet["channelTitle"]
-        item.description = snippet["description"]
         published = parse_date(snippet["publishedAt"])
-        if published:
-            item.published = datetime.fromtimestamp(mktime(published))
-        item.thumbnail = snippet["thumbnails"]["high"]["url"]
 
-        yield item
+        yield Blog(
+            url=url,
+            title=title,
+            category=category,
+            author=snippet["channelTitle"],
+            description=snippet["description"],
+            published=datetime.fromtimestamp(mktime(published)) if published else None,
+            thumbnail=snippet["thumbnails"]["high"]["url"],
+        )
 
 
 @final
-class YoutubeSpider(Spider):
+class YoutubeSpider(HttpSpider):
     def __init__(self, channels: list[tuple[str, Category]]):
         super().__init__(default_request_handler=default_handler)
         token = os.getenv("YOUTUBE_API_TOKEN")
@@ -0,0 +1,34 @@
+import json
+import logging
+import os
+from typing import Any
+
+from tulsa.helpers import data_path
+
+logger = logging.getLogger(__name__)
+
+
+def load_state(name: str) -> dict[str, Any]:
+    """
+    Load the state `name` which is kept between runs, an empty state if there isn't any.
+    """
+    try:
+        with open(data_path("state", f"{name}.json"), "rb") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError as e:
+        logger.error(f"Cannot read the '{name}' state, starting over: {e}")
+        return {}
+
+
+def save_state(name: str, state: dict[str, Any]) -> None:
+    path = data_path("state", f"{name}.json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write a new file first, a crash can't leave a truncated state behind
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(state, f)
+    os.replace(f"{path}.tmp", path)
+
+
+__all__ = ["load_state", "save_state"]
@@ -0,0 +1,49 @@
+from datetime import UTC, datetime, timedelta
+
+from tulsa.state import load_state, save_state
+
+# The sources aren't always consistent in time, the next sync starts a bit earlier
+OVERLAP = timedelta(minutes=10)
+
+
+class SyncCursor:
+    """
+    The end of the last successful sync of every source, so the next sync only fetches the changes.
+    """
+
+    def __init__(self) -> None:
+        self.__cursors: dict[str, str] | None = None
+
+    @property
+    def cursors(self) -> dict[str, str]:
+        if self.__cursors is None:
+            self.__cursors = load_state("sync")
+        return self.__cursors
+
+    def get(self, source: str) -> datetime | None:
+        """
+        Return where the next sync of `source` starts, `None` if it needs a full sync.
+        """
+        cursor = self.cursors.get(source)
+        if cursor is None:
+            return None
+        return datetime.fromisoformat(cursor) - OVERLAP
+
+    def advance(self, source: str, until: datetime) -> None:
+        self.cursors[source] = until.astimezone(UTC).isoformat()
+        save_state("sync", self.cursors)
+
+    def reset(self, source: str | None = None) -> None:
+        """
+        Start over with a full sync of `source`, or every source.
+        """
+        if source is None:
+            self.cursors.clear()
+        else:
+            _ = self.cursors.pop(source, None)
+        save_state("sync", self.cursors)
+
+
+sync_cursor = SyncCursor()
+
+__all__ = ["SyncCursor", "sync_cursor"]
@@ -0,0 +1,76 @@
+import functools
+import re
+from urllib.parse import unquote_plus, urlsplit, urlunsplit
+
+# The query parameters which only tell where the visitor comes from
+TRACKING_PARAMETERS = frozenset(
+    {
+        "fbclid",
+        "gclid",
+        "dclid",
+        "msclkid",
+        "yclid",
+        "igshid",
+        "ref",
+        "_hsenc",
+        "_hsmi",
+    }
+)
+TRACKING_PREFIXES = ("utm_", "mc_")
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# A lowercase scheme and host without a port, no query, params or fragment:
+# the url is canonical once its trailing slashes are removed
+_PLAIN_URL = re.compile(r"[a-z][a-z0-9+.-]*://[a-z0-9.-]+(?:/[^?#;\[\]\s]*)?")
+
+
+def __is_tracking(parameter: str) -> bool:
+    name, _, value = parameter.partition("=")
+    name = unquote_plus(name).lower()
+    value = unquote_plus(value)
+    if name in TRACKING_PARAMETERS or name.startswith(TRACKING_PREFIXES):
+        return True
+    # Medium adds `?source=rss----<id>---4` to the links of its feeds
+    return name == "source" and value.startswith("rss")
+
+
+@functools.lru_cache(maxsize=65536)
+def canonicalize_url(url: str) -> str:
+    """
+    Return the url which every variant of `url` shares, the same article has the same url
+    whatever feed or page links to it.
+
+    The tracking parameters, the fragment, the default port and the trailing slashes
+    are removed, the scheme and the host are lowercased.
+    The other query parameters are kept as they are, in their order, some sites rely on it.
+    A fragment which is a route of a single-page app, e.g. `#/advisories/1`, is kept.
+    """
+    url = url.strip()
+    if _PLAIN_URL.fullmatch(url):
+        return url.rstrip("/")
+    try:
+        parts = urlsplit(url)
+        host = parts.hostname or ""
+        port = parts.port
+    except ValueError:
+        # Not a url we can take apart, e.g. an invalid IPv6 host
+        return url.rstrip("/")
+    if ":" in host:
+        host = f"[{host}]"
+    netloc = host
+    if parts.username is not None:
+        userinfo = parts.username
+        if parts.password is not None:
+            userinfo += f":{parts.password}"
+        netloc = f"{userinfo}@{host}"
+    scheme = parts.scheme.lower()
+    if port is not None and DEFAULT_PORTS.get(scheme) != port:
+        netloc += f":{port}"
+    parameters = parts.query.split("&") if parts.query else []
+    kept = [parameter for parameter in parameters if not __is_tracking(parameter)]
+    query = parts.query if len(kept) == len(parameters) else "&".join(kept)
+    fragment = parts.fragment if parts.fragment.startswith(("/", "!/")) else ""
+    return urlunsplit((scheme, netloc, parts.path.rstrip("/"), query, fragment))
+
+
+__all__ = ["canonicalize_url"]